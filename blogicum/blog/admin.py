@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.utils.text import Truncator
 
 from blog.models import Category, Post, Location
-from core.constants import LEN_TEXT_FOR_ADMIN
+from core.constants import ADMIN_SEARCH_LIMIT, LEN_TEXT_FOR_ADMIN
+from search.backends import get_backend
 
 
 @admin.register(Post)
@@ -22,6 +23,14 @@ class PostAdmin(admin.ModelAdmin):
         return Truncator(obj.text).chars(LEN_TEXT_FOR_ADMIN)
     short_text.short_description = 'Текст (кратко)'
 
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет посты по поисковому индексу вместо LIKE по заголовку."""
+        if not search_term:
+            return super().get_search_results(
+                request, queryset, search_term)
+        hits = get_backend().search(search_term, None, ADMIN_SEARCH_LIMIT)
+        return queryset.filter(pk__in=[pk for _, pk in hits]), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -0,0 +1,147 @@
+"""Потоковая выгрузка постов с комментариями в JSON Lines и CSV.
+
+Посты читаются одним запросом через QuerySet.iterator пачками по
+chunk_size строк, комментарии - отдельным запросом на каждую пачку,
+поэтому память не растет с размером таблиц.
+
+Под ASGI Django 3.2 перебирает StreamingHttpResponse в цикле событий,
+где ORM запрещен, поэтому там выгрузка сначала пишется во временный
+файл (export_file) в потоке пула, а отдается FileResponse.
+"""
+import csv
+import json
+from itertools import groupby, islice
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterable, Iterator, List
+
+from django.db.models import QuerySet
+
+from blog.models import Post
+from comments.models import Comment
+from core.constants import EXPORT_CHUNK_SIZE
+
+FORMATS = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+CSV_COLUMNS = (
+    'post_id', 'title', 'text', 'pub_date', 'created_at', 'is_published',
+    'author', 'category', 'location', 'comment_id', 'comment_author',
+    'comment_text', 'comment_created_at',
+)
+SPOOL_SIZE = 1024 * 1024
+
+
+def get_queryset() -> QuerySet:
+    return (
+        Post.objects.select_related('author', 'category', 'location')
+        .order_by('pk')
+    )
+
+
+def serialize_comment(comment: Comment) -> Dict:
+    return {
+        'id': comment.pk,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created_at': comment.created_at.isoformat(),
+    }
+
+
+def serialize_post(post: Post, comments: List[Dict]) -> Dict:
+    return {
+        'id': post.pk,
+        'title': post.title,
+        'text': post.text,
+        'pub_date': post.pub_date.isoformat(),
+        'created_at': post.created_at.isoformat(),
+        'is_published': post.is_published,
+        'author': post.author.username,
+        'category': post.category.slug if post.category else None,
+        'location': post.location.name if post.location else None,
+        'comments': comments,
+    }
+
+
+def iter_posts(queryset: QuerySet = None,
+               chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict]:
+    """Отдает посты с комментариями в виде словарей.
+
+    Args:
+        queryset: Посты для выгрузки (по умолчанию все).
+        chunk_size: Размер пачки постов, читаемой из базы за раз.
+    """
+    if queryset is None:
+        queryset = get_queryset()
+    posts = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(posts, chunk_size))
+        if not chunk:
+            return
+        comments = (
+            Comment.objects.select_related('author')
+            .filter(post_id__in=[post.pk for post in chunk])
+            .order_by('post_id', 'created_at', 'pk')
+        )
+        by_post = {
+            post_id: [serialize_comment(comment) for comment in group]
+            for post_id, group in groupby(
+                comments, key=lambda comment: comment.post_id)
+        }
+        for post in chunk:
+            yield serialize_post(post, by_post.get(post.pk, []))
+
+
+def jsonl_lines(posts: Iterable[Dict]) -> Iterator[str]:
+    """Одна строка JSON на пост, комментарии вложены списком."""
+    for post in posts:
+        yield json.dumps(post, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Файлоподобный объект, возвращающий записанное вместо хранения."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_lines(posts: Iterable[Dict]) -> Iterator[str]:
+    """Одна строка CSV на комментарий; пост без комментариев - одна строка.
+
+    Поля поста повторяются в каждой строке его комментариев.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for post in posts:
+        base = [
+            post['id'], post['title'], post['text'], post['pub_date'],
+            post['created_at'], post['is_published'], post['author'],
+            post['category'] or '', post['location'] or '',
+        ]
+        if not post['comments']:
+            yield writer.writerow(base + [''] * 4)
+        for comment in post['comments']:
+            yield writer.writerow(base + [
+                comment['id'], comment['author'], comment['text'],
+                comment['created_at'],
+            ])
+
+
+def export_lines(fmt: str, queryset: QuerySet = None,
+                 chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Строки выгрузки в формате fmt ('jsonl' или 'csv')."""
+    writers = {'jsonl': jsonl_lines, 'csv': csv_lines}
+    return writers[fmt](iter_posts(queryset, chunk_size))
+
+
+def export_file(fmt: str, queryset: QuerySet = None,
+                chunk_size: int = EXPORT_CHUNK_SIZE) -> SpooledTemporaryFile:
+    """Выгрузка целиком во временном файле, перемотанном в начало.
+
+    Файл хранится в памяти до SPOOL_SIZE байт, дальше - на диске.
+    """
+    file = SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    for line in export_lines(fmt, queryset, chunk_size):
+        file.write(line.encode())
+    file.seek(0)
+    return file
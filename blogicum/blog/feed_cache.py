@@ -0,0 +1,78 @@
+"""Кеш отрендеренных страниц публичной ленты.
+
+Ключ страницы включает поколение ленты. Сигналы заменяют его при
+любом изменении постов, категорий, местоположений и комментариев,
+поэтому сброс не требует удаления ключей по шаблону и работает с любым
+бэкендом кеша Django (в том числе locmem и filebased). Поколение -
+случайная строка, как версия blog.registry: если ключ вытеснен из
+кеша, новое поколение не совпадет ни с одним прежним, и старые
+страницы не вернутся.
+
+Время жизни записи ограничено ближайшей отложенной публикацией: в момент
+наступления pub_date в ленте должен появиться новый пост.
+"""
+import hashlib
+import math
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from blog.models import Post
+
+GENERATION_KEY = 'blog:feed:generation'
+
+
+def get_cache():
+    """Возвращает кеш, заданный в settings.FEED_CACHE_ALIAS."""
+    return caches[getattr(settings, 'FEED_CACHE_ALIAS', 'default')]
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'FEED_CACHE_ENABLED', False)
+
+
+def get_generation() -> str:
+    """Текущее поколение ленты (создается при первом обращении)."""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY, '')
+    return generation
+
+
+def invalidate() -> None:
+    """Делает недействительными все закешированные страницы ленты."""
+    get_cache().set(GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def page_key(path: str) -> str:
+    """Ключ страницы для полного пути запроса и текущего поколения."""
+    digest = hashlib.md5(path.encode()).hexdigest()
+    return f'blog:feed:{get_generation()}:{digest}'
+
+
+def get_timeout() -> Optional[int]:
+    """Время жизни страницы до ближайшей отложенной публикации.
+
+    Returns:
+        Optional[int]: Количество секунд, не больше
+            settings.FEED_CACHE_TIMEOUT, или 0, если отложенная
+            публикация наступает прямо сейчас.
+    """
+    timeout = getattr(settings, 'FEED_CACHE_TIMEOUT', 300)
+    now = timezone.now()
+    next_pub_date = (
+        Post.objects
+        .filter(is_published=True, pub_date__gt=now)
+        .order_by('pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+    if next_pub_date is None:
+        return timeout
+    seconds = math.ceil((next_pub_date - now).total_seconds())
+    return seconds if timeout is None else min(timeout, seconds)
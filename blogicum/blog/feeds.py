@@ -0,0 +1,194 @@
+"""RSS- и Atom-ленты публикаций: весь сайт, категория, автор.
+
+Ленты строятся на Post.optimized.visible() с узкой выборкой: из поста
+берутся заголовок, даты и начало текста (Substr), из автора - имя.
+Готовый XML кешируется с номером поколения ленты (blog.feed_cache):
+сигналы сбрасывают его при публикации и изменении постов, а время
+жизни ограничено ближайшей отложенной публикацией. Ответ содержит
+ETag и Last-Modified; на условный запрос с неизмененной лентой
+отдается 304, при попадании в кеш - без запросов к базе.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.db.models.functions import Substr
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe
+from django.utils.text import Truncator
+
+from blog import feed_cache, profile_cache
+from blog.models import Category, Post
+from blog.views import get_published_category
+from core.constants import FEED_ITEMS, FEED_SUMMARY_LENGTH
+
+User = get_user_model()
+
+
+class CachedFeedMixin:
+    """Миксин для кеширования готовой ленты и условных GET-запросов.
+
+    Кеш включается settings.FEED_CACHE_ENABLED, как и кеш страниц
+    ленты. ETag - хеш XML, Last-Modified - дата последнего изменения
+    поста ленты (ставится django.contrib.syndication).
+    """
+
+    def __call__(self, request, *args, **kwargs):
+        enabled = feed_cache.is_enabled()
+        cache = feed_cache.get_cache()
+        key = feed_cache.page_key(f'syndication:{request.path}')
+        cached = cache.get(key) if enabled else None
+        if cached is None:
+            response = super().__call__(request, *args, **kwargs)
+            cached = (
+                response.content, response['Content-Type'],
+                response.get('Last-Modified'),
+            )
+            timeout = feed_cache.get_timeout() if enabled else 0
+            if timeout != 0:
+                cache.set(key, cached, timeout)
+        content, content_type, last_modified = cached
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        response = get_conditional_response(
+            request, etag=etag,
+            last_modified=parse_http_date_safe(last_modified or ''))
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = last_modified
+        return response
+
+
+class AtomFeedMixin:
+    """Миксин для Atom-варианта ленты: описание идет в subtitle."""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class PostFeed(CachedFeedMixin, Feed):
+    """RSS-лента последних публикаций сайта.
+
+    Attributes:
+        title (str): Заголовок ленты.
+        description (str): Описание ленты.
+    """
+
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума'
+
+    def link(self, obj) -> str:
+        return reverse('blog:index')
+
+    def get_queryset(self, obj):
+        """Видимые посты ленты (для потомков - с фильтром по obj)."""
+        return Post.optimized.visible()
+
+    def items(self, obj):
+        """Последние FEED_ITEMS постов без полного текста."""
+        return (
+            self.get_queryset(obj)
+            .only(
+                'title', 'pub_date', 'updated_at', 'category', 'location',
+                'author__username', 'author__first_name',
+                'author__last_name',
+            )
+            .annotate(summary=Substr('text', 1, FEED_SUMMARY_LENGTH))
+            [:FEED_ITEMS]
+        )
+
+    def item_title(self, item: Post) -> str:
+        return item.title
+
+    def item_description(self, item: Post) -> str:
+        return Truncator(item.summary).chars(FEED_SUMMARY_LENGTH - 1)
+
+    def item_link(self, item: Post) -> str:
+        return reverse('blog:post_detail', kwargs={'post_id': item.pk})
+
+    def item_pubdate(self, item: Post):
+        return item.pub_date
+
+    def item_updateddate(self, item: Post):
+        """Для отложенного поста - дата публикации, а не изменения."""
+        return max(item.updated_at, item.pub_date)
+
+    def item_author_name(self, item: Post) -> str:
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item: Post) -> str:
+        return reverse(
+            'blog:profile', kwargs={'username': item.author.username})
+
+    def item_categories(self, item: Post):
+        return [item.category.title] if item.category else []
+
+
+class PostAtomFeed(AtomFeedMixin, PostFeed):
+    """Atom-лента последних публикаций сайта."""
+
+
+class CategoryFeed(PostFeed):
+    """RSS-лента публикаций опубликованной категории."""
+
+    def get_object(self, request, category_slug: str) -> Category:
+        """Категория из справочника.
+
+        Raises:
+            Http404: Если категория не найдена или не опубликована.
+        """
+        return get_published_category(category_slug)
+
+    def title(self, obj: Category) -> str:
+        return f'Блогикум - {obj.title}'
+
+    def description(self, obj: Category) -> str:
+        return obj.description
+
+    def link(self, obj: Category) -> str:
+        return reverse(
+            'blog:category_posts', kwargs={'category_slug': obj.slug})
+
+    def get_queryset(self, obj: Category):
+        return super().get_queryset(obj).filter(category=obj)
+
+
+class CategoryAtomFeed(AtomFeedMixin, CategoryFeed):
+    """Atom-лента публикаций категории."""
+
+
+class AuthorFeed(PostFeed):
+    """RSS-лента опубликованных постов автора."""
+
+    def get_object(self, request, username: str) -> User:
+        """Автор из закешированной сводки профиля.
+
+        Raises:
+            Http404: Если пользователь не найден.
+        """
+        summary = profile_cache.get_summary(username)
+        if summary is None:
+            raise Http404('Пользователь не найден.')
+        return summary.user
+
+    def title(self, obj: User) -> str:
+        return f'Блогикум - {obj.get_full_name() or obj.username}'
+
+    def description(self, obj: User) -> str:
+        return f'Публикации пользователя {obj.username}'
+
+    def link(self, obj: User) -> str:
+        return reverse('blog:profile', kwargs={'username': obj.username})
+
+    def get_queryset(self, obj: User):
+        return super().get_queryset(obj).filter(author=obj)
+
+
+class AuthorAtomFeed(AtomFeedMixin, AuthorFeed):
+    """Atom-лента опубликованных постов автора."""
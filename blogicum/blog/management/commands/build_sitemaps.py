@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog import sitemaps
+
+
+class Command(BaseCommand):
+    """Строит карту сайта в каталоге SITEMAP_ROOT.
+
+    Перезаписываются только сегменты, строки которых изменились с
+    прошлого запуска, поэтому команду можно запускать по расписанию.
+    """
+
+    help = 'Строит индекс и сегменты карты сайта (посты, категории, профили).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            help='Схема и домен сайта (по умолчанию SITEMAP_BASE_URL).')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Перезаписать все сегменты.')
+
+    def handle(self, *args, **options):
+        result = sitemaps.build(
+            base_url=options['base_url'], force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Сегментов записано: {len(result.written)}, '
+            f'без изменений: {result.skipped}, '
+            f'удалено: {len(result.removed)}. '
+            f'Индекс: {sitemaps.index_url(base_url=options["base_url"])}'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from blog import export
+from core.constants import EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """Выгружает посты с авторами, категориями и комментариями.
+
+    Записи пишутся в файл по мере чтения из базы, поэтому потребление
+    памяти не зависит от размера таблиц.
+    """
+
+    help = 'Потоково выгружает посты и комментарии в JSON Lines или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=sorted(export.FORMATS), default='jsonl',
+            help='Формат выгрузки (по умолчанию jsonl).')
+        parser.add_argument(
+            '--output', default='-',
+            help='Путь к файлу; "-" - стандартный вывод.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help=f'Постов в одной пачке (по умолчанию {EXPORT_CHUNK_SIZE}).')
+
+    def handle(self, *args, **options):
+        lines = export.export_lines(
+            options['format'], chunk_size=options['chunk_size'])
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        newline = '' if options['format'] == 'csv' else None
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline=newline) as file:
+            file.writelines(lines)
+        self.stdout.write(self.style.SUCCESS(
+            f'Выгрузка записана в {options["output"]}.'))
@@ -0,0 +1,222 @@
+import random
+import secrets
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog import feed_cache, profile_cache, registry
+from blog.models import Category, Location, Post
+from comments.models import Comment
+
+User = get_user_model()
+
+WORDS = (
+    'путешествие город море горы утро вечер дорога поезд книга музыка '
+    'кофе дождь солнце лес река друзья работа отпуск фотография история '
+    'ужин рецепт прогулка парк выставка концерт зима лето осень весна'
+).split()
+PARETO_ALPHA = 1.5
+PASSWORD = 'benchmark'
+
+
+def sentence(rnd: random.Random, length: int) -> str:
+    return ' '.join(rnd.choice(WORDS) for _ in range(length)).capitalize()
+
+
+def batched(iterable, size: int):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+class Command(BaseCommand):
+    """Генерирует синтетические данные для нагрузочного тестирования.
+
+    Все объекты создаются через bulk_create пакетами, поэтому команда
+    справляется с миллионами постов без роста потребления памяти.
+    Количество комментариев у постов распределено по Парето: у
+    большинства постов их мало, у немногих - очень много. Часть постов
+    отложена в будущее, снята с публикации или лежит в скрытых
+    категориях.
+
+    bulk_create не вызывает сигналы, поэтому после вставки команда сама
+    сбрасывает кеш ленты, справочник категорий и сводки профилей, а
+    поисковый индекс нужно перестроить командой rebuild_search_index.
+    """
+
+    help = 'Генерирует пользователей, посты и комментарии для бенчмарков.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=1000,
+            help='Количество постов (по умолчанию 1000).')
+        parser.add_argument(
+            '--users', type=int, default=None,
+            help='Количество авторов (по умолчанию posts / 50).')
+        parser.add_argument(
+            '--categories', type=int, default=20,
+            help='Количество категорий (по умолчанию 20).')
+        parser.add_argument(
+            '--locations', type=int, default=50,
+            help='Количество местоположений (по умолчанию 50).')
+        parser.add_argument(
+            '--comments-per-post', type=float, default=5,
+            help='Среднее число комментариев на пост (по умолчанию 5).')
+        parser.add_argument(
+            '--future-share', type=float, default=0.05,
+            help='Доля отложенных постов (по умолчанию 0.05).')
+        parser.add_argument(
+            '--unpublished-share', type=float, default=0.05,
+            help='Доля снятых с публикации постов (по умолчанию 0.05).')
+        parser.add_argument(
+            '--hidden-categories', type=float, default=0.1,
+            help='Доля скрытых категорий (по умолчанию 0.1).')
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Размер пакета bulk_create (по умолчанию 5000).')
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Начальное значение генератора случайных чисел.')
+
+    def handle(self, *args, **options):
+        if options['posts'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--posts и --batch-size должны быть > 0.')
+        self.rnd = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.tag = secrets.token_hex(3)
+        started = time.perf_counter()
+
+        users = options['users'] or max(options['posts'] // 50, 1)
+        self.user_ids = self.create_users(users)
+        self.category_ids = self.create_categories(
+            options['categories'], options['hidden_categories'])
+        self.location_ids = self.create_locations(options['locations'])
+        posts, comments = self.create_posts(options)
+        feed_cache.invalidate()
+        registry.invalidate()
+        profile_cache.invalidate_all()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {users}, постов {posts}, '
+            f'комментариев {comments} за {elapsed:.1f} с '
+            f'({(posts + comments) / elapsed:.0f} строк/с). '
+            f'Пароль пользователей: {PASSWORD!r}.'
+        ))
+        self.stdout.write(
+            'Поисковый индекс не обновлялся: запустите rebuild_search_index.')
+
+    def created_ids(self, model, first_pk: int, count: int):
+        """Возвращает pk строк, вставленных bulk_create после first_pk.
+
+        Django 3.2 не возвращает pk из bulk_create для SQLite, поэтому
+        они читаются из базы в порядке вставки.
+        """
+        return list(
+            model.objects.filter(pk__gt=first_pk).order_by('pk')
+            .values_list('pk', flat=True)[:count]
+        )
+
+    def last_pk(self, model) -> int:
+        last = model.objects.order_by('-pk').values_list('pk', flat=True)
+        return last.first() or 0
+
+    def create_users(self, count: int):
+        first_pk = self.last_pk(User)
+        password = make_password(PASSWORD)
+        for batch in batched(range(count), self.batch_size):
+            User.objects.bulk_create(
+                User(username=f'bench_{self.tag}_{number}',
+                     email=f'bench_{self.tag}_{number}@example.com',
+                     password=password)
+                for number in batch
+            )
+        return self.created_ids(User, first_pk, count)
+
+    def create_categories(self, count: int, hidden_share: float):
+        first_pk = self.last_pk(Category)
+        Category.objects.bulk_create(
+            Category(
+                title=sentence(self.rnd, 2),
+                description=sentence(self.rnd, 12),
+                slug=f'bench-{self.tag}-{number}',
+                is_published=self.rnd.random() >= hidden_share,
+            )
+            for number in range(count)
+        )
+        return self.created_ids(Category, first_pk, count)
+
+    def create_locations(self, count: int):
+        first_pk = self.last_pk(Location)
+        Location.objects.bulk_create(
+            Location(name=sentence(self.rnd, 2)) for _ in range(count)
+        )
+        return self.created_ids(Location, first_pk, count)
+
+    def comment_count(self, mean: float) -> int:
+        """Случайное число комментариев с распределением Парето."""
+        if mean <= 0:
+            return 0
+        scale = mean * (PARETO_ALPHA - 1)
+        return int(scale * (self.rnd.paretovariate(PARETO_ALPHA) - 1))
+
+    def build_post(self, now, options) -> Post:
+        rnd = self.rnd
+        if rnd.random() < options['future_share']:
+            pub_date = now + timedelta(minutes=rnd.randint(1, 60 * 24 * 30))
+        else:
+            pub_date = now - timedelta(minutes=rnd.randint(0, 60 * 24 * 365))
+        return Post(
+            title=sentence(rnd, rnd.randint(2, 6)),
+            text='\n\n'.join(
+                sentence(rnd, rnd.randint(10, 40))
+                for _ in range(rnd.randint(1, 4))
+            ),
+            pub_date=pub_date,
+            author_id=rnd.choice(self.user_ids),
+            category_id=(
+                rnd.choice(self.category_ids) if self.category_ids else None),
+            location_id=(
+                rnd.choice(self.location_ids)
+                if self.location_ids and rnd.random() < 0.7 else None),
+            is_published=rnd.random() >= options['unpublished_share'],
+            comment_count=self.comment_count(options['comments_per_post']),
+        )
+
+    def build_comments(self, post_ids, counts):
+        for post_id, count in zip(post_ids, counts):
+            for _ in range(count):
+                yield Comment(
+                    text=sentence(self.rnd, self.rnd.randint(3, 20)),
+                    post_id=post_id,
+                    author_id=self.rnd.choice(self.user_ids),
+                )
+
+    def create_posts(self, options):
+        now = timezone.now()
+        total_posts = total_comments = 0
+        posts = (self.build_post(now, options)
+                 for _ in range(options['posts']))
+        for batch in batched(posts, self.batch_size):
+            with transaction.atomic():
+                first_pk = self.last_pk(Post)
+                Post.objects.bulk_create(batch)
+                post_ids = self.created_ids(Post, first_pk, len(batch))
+                counts = [post.comment_count for post in batch]
+                for comments in batched(
+                        self.build_comments(post_ids, counts),
+                        self.batch_size):
+                    Comment.objects.bulk_create(comments)
+            total_posts += len(batch)
+            total_comments += sum(counts)
+            self.stdout.write(
+                f'Постов: {total_posts}, комментариев: {total_comments}')
+        return total_posts, total_comments
@@ -0,0 +1,69 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+
+from blog import feed_cache, profile_cache, registry
+from core.fixtures import FixtureError, FixtureImporter, iter_fixture
+
+COMMENT_COUNT_MODELS = {'blog.post', 'comments.comment'}
+
+
+class Command(BaseCommand):
+    """Быстрая загрузка JSON-фикстуры в формате dumpdata.
+
+    Замена loaddata для больших выгрузок: файл читается потоково,
+    объекты вставляются пакетами без save() и сигналов. После загрузки
+    пересчитывается счетчик комментариев постов и сбрасывается кеш
+    ленты; поисковый индекс нужно перестроить командой
+    rebuild_search_index.
+    """
+
+    help = 'Потоково загружает JSON-фикстуру пакетными INSERT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к JSON-файлу фикстуры.')
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество объектов в одном INSERT (5000).')
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='Пропустить модель app_label.ModelName (можно повторять).')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать объекты, pk которых уже есть в базе.')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='База данных для загрузки.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть > 0.')
+        importer = FixtureImporter(
+            batch_size=options['batch_size'],
+            using=options['database'],
+            exclude=options['exclude'],
+            ignore_conflicts=options['ignore_conflicts'],
+        )
+        started = time.perf_counter()
+        try:
+            with open(options['fixture'], encoding='utf-8') as stream:
+                with transaction.atomic(using=options['database']):
+                    counts = importer.load(iter_fixture(stream))
+        except (OSError, FixtureError, IntegrityError) as error:
+            raise CommandError(error)
+        elapsed = time.perf_counter() - started
+
+        total = sum(counts.values())
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f'{label:<32}{count:>12}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-6):.0f} строк/с).'
+        ))
+        if COMMENT_COUNT_MODELS & set(counts):
+            call_command('rebuild_comment_count', stdout=self.stdout)
+        feed_cache.invalidate()
+        registry.invalidate()
+        profile_cache.invalidate_all()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Пересчитывает денормализованный счетчик Post.comment_count.
+
+    Обновление идет пакетами по диапазонам pk, чтобы не держать
+    блокировку всей таблицы постов в одной транзакции.
+    """
+
+    help = 'Пересчитывает Post.comment_count по таблице комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Количество pk в одном UPDATE (по умолчанию 10000).'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        bounds = Post.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('Постов нет, пересчитывать нечего.')
+            return
+        updated = 0
+        for pk_from in range(bounds['first'], bounds['last'] + 1, batch_size):
+            updated += Post.optimized.rebuild_comment_count(
+                pk_from, pk_from + batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Счетчик комментариев пересчитан для {updated} постов.'))
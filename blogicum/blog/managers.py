@@ -1,32 +1,103 @@
+from django.conf import settings
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 from django.utils import timezone
 
+from blog import registry
 
-class PostManager(models.Manager):
+
+class PostQuerySet(QuerySet):
+    """QuerySet постов с подстановкой связей из справочника."""
+
+    def with_lookups(self) -> 'PostQuerySet':
+        """Категория и местоположение берутся из blog.registry."""
+        clone = self._chain()
+        clone._iterable_class = registry.RegistryModelIterable
+        return clone
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
     """
     Кастомизированный менеджер для модели Post.
         - Получения оптимизированного запроса
         - Получение оптимизированого опубликованого запроса
+
+    Число комментариев отдается в аннотации comment_total. По умолчанию
+    она читается из денормализованного поля Post.comment_count; при
+    settings.POSTS_DENORMALIZED_COMMENT_COUNT = False считается через
+    Count('comments') (LEFT JOIN и GROUP BY).
+
+    При settings.POSTS_LOOKUP_REGISTRY категории и местоположения не
+    присоединяются к выборке, а берутся из blog.registry.
     """
 
+    def comment_total(self):
+        """Выражение для числа комментариев поста"""
+        if getattr(settings, 'POSTS_DENORMALIZED_COMMENT_COUNT', True):
+            return F('comment_count')
+        return Count('comments')
+
+    def rebuild_comment_count(self, pk_from=None, pk_to=None) -> int:
+        """Пересчитывает Post.comment_count одним UPDATE с подзапросом.
+
+        Args:
+            pk_from: Нижняя граница pk (включительно), None - без границы.
+            pk_to: Верхняя граница pk (не включительно), None - без границы.
+
+        Returns:
+            int: Количество обновленных постов.
+        """
+        comment_model = self.model.comments.rel.related_model
+        counts = (
+            comment_model.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        queryset = self.get_queryset()
+        if pk_from is not None:
+            queryset = queryset.filter(pk__gte=pk_from)
+        if pk_to is not None:
+            queryset = queryset.filter(pk__lt=pk_to)
+        return queryset.update(comment_count=Coalesce(Subquery(counts), 0))
+
     def with_optimization(self) -> QuerySet:
         """Базовый QuerySet с оптимизированными связями и аннотацией"""
+        queryset = self.get_queryset()
+        if registry.is_enabled():
+            queryset = queryset.select_related('author').with_lookups()
+        else:
+            queryset = queryset.select_related(
+                'author', 'category', 'location')
         return (
-            self.get_queryset()
-            .select_related('author', 'category', 'location')
-            .annotate(comment_count=Count('comments'))
+            queryset
+            .annotate(comment_total=self.comment_total())
             .order_by('-pub_date')
         )
 
+    def published_filter(self) -> Q:
+        """Условие видимости поста для всех пользователей"""
+        if registry.is_enabled():
+            category = Q(
+                category_id__in=registry.get_registry().published_category_ids)
+        else:
+            category = Q(category__is_published=True)
+        return category & Q(is_published=True, pub_date__lte=timezone.now())
+
     def visible(self) -> QuerySet:
         """Только опубликованные посты (с оптимизацией)"""
-        return (
-            self.with_optimization()
-            .filter(
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=timezone.now()
-            )
-        )
+        return self.with_optimization().filter(self.published_filter())
+
+    def visible_for(self, user) -> QuerySet:
+        """Опубликованные посты и все посты пользователя (с оптимизацией)
+
+        Позволяет проверить доступ к посту одним запросом и для автора,
+        и для остальных пользователей.
+        """
+        condition = self.published_filter()
+        if user.is_authenticated:
+            condition |= Q(author=user)
+        return self.with_optimization().filter(condition)
@@ -1,6 +1,15 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from django.utils import timezone
 
-from core.constants import POSTS_IN_PAGE
+from core import db_router
+from core.constants import CURSOR_QUERY_PARAM, POSTS_IN_PAGE
+from core.mixins import ConditionalGetMixin
+from core.paginators import (CursorPaginator, InvalidCursor,
+                             cursor_page_or_404)
+from jobs.registry import enqueue
+from blog import feed_cache, registry
 from blog.forms import PostForm
 from blog.models import Post
 
@@ -11,16 +20,171 @@ class PostMixin:
     Предоставляет общие настройки для отображения постов:
     - Указывает модель Post
     - Задает количество постов на странице
+    - Включает курсорную пагинацию, если она разрешена в настройках
+    - Передает в шаблон параметры кеша карточек постов
 
     Attributes:
         model (Post): Модель Post для работы представления.
         paginate_by (int): Количество постов на странице пагинации.
-        queryset: Опубликованные посты
+        cursor_pagination (Optional[bool]): Использовать keyset-пагинацию
+            по (pub_date, id) вместо номеров страниц. None - взять значение
+            из settings.POSTS_CURSOR_PAGINATION.
     """
 
     model = Post
     paginate_by = POSTS_IN_PAGE
-    queryset = Post.optimized.visible()
+    cursor_pagination = None
+
+    def get_queryset(self):
+        """Опубликованные посты.
+
+        Выборка строится на каждый запрос: условие видимости зависит
+        от текущего времени и справочника категорий.
+        """
+        return Post.optimized.visible()
+
+    def get_context_data(self, **kwargs):
+        """Добавляет параметры кеширования карточек постов.
+
+        Карточка кешируется по id и времени изменения поста, числу
+        комментариев, имени автора, наличию копии изображения, версии
+        справочника категорий и мест и авторству зрителя. Поколение
+        ленты в ключ не входит: его меняет каждый комментарий, и кеш
+        карточек бы не работал.
+
+        Returns:
+            Dict[str, Any]: Контекст данных для шаблона.
+        """
+        context = super().get_context_data(**kwargs)
+        timeout = getattr(settings, 'POST_CARD_CACHE_TIMEOUT', 0)
+        context['card_cache_timeout'] = timeout
+        if timeout:
+            context['card_cache_version'] = registry.get_version(
+                registry.get_cache())
+        return context
+
+    def use_cursor_pagination(self) -> bool:
+        if self.cursor_pagination is None:
+            return getattr(settings, 'POSTS_CURSOR_PAGINATION', False)
+        return self.cursor_pagination
+
+    def paginate_queryset(self, queryset, page_size):
+        """Разбивает выборку на страницы.
+
+        В курсорном режиме не выполняет COUNT(*) и OFFSET, а выбирает
+        страницу по курсору из GET-параметра CURSOR_QUERY_PARAM.
+
+        Returns:
+            Tuple: (paginator, page, object_list, is_paginated).
+
+        Raises:
+            Http404: Если курсор поврежден.
+        """
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        page = cursor_page_or_404(
+            paginator, self.request.GET.get(CURSOR_QUERY_PARAM))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class FeedCacheMixin:
+    """Миксин для отдачи страниц ленты анонимным читателям из кеша.
+
+    Работает только при settings.FEED_CACHE_ENABLED. Запись живет до
+    ближайшей отложенной публикации и сбрасывается сигналами при
+    изменении постов, категорий, местоположений и комментариев
+    (см. blog.feed_cache). Кешируемая страница строится по основной
+    базе: отстающая реплика не должна попасть в кеш.
+
+    Вместе со страницей хранится её ETag (если его выставил
+    FeedConditionalMixin), поэтому условный запрос к закешированной
+    странице получает 304 без обращения к базе.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Отдает страницу из кеша или рендерит и кеширует её.
+
+        Returns:
+            HttpResponse: Закешированный или свежий ответ либо 304.
+        """
+        if not feed_cache.is_enabled() or request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        cache = feed_cache.get_cache()
+        key = feed_cache.page_key(request.get_full_path())
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type, *rest = cached
+            etag = rest[0] if rest else None
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = HttpResponse(content, content_type=content_type)
+            if etag:
+                response['ETag'] = etag
+            return response
+        with db_router.primary():
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response.render()
+        timeout = feed_cache.get_timeout()
+        if timeout != 0:
+            cache.set(key, (
+                response.content, response['Content-Type'],
+                response.get('ETag'),
+            ), timeout)
+        return response
+
+
+class FeedConditionalMixin(ConditionalGetMixin):
+    """Миксин для условных GET-запросов к лентам постов.
+
+    Валидатор страницы - id и updated_at её постов, выбранные одним
+    легким запросом (без JOIN и аннотаций) по тому же условию и с той
+    же пагинацией, что и основная выборка, плюс поколение ленты:
+    сигналы меняют его при удалении постов и изменении категорий.
+
+    Last-Modified не отдается: удаление поста сдвигает страницу, не
+    увеличивая максимальный updated_at её постов.
+    """
+
+    def get_validators(self):
+        """Посты текущей страницы и поколение ленты.
+
+        Returns:
+            Tuple[Optional[list], None]: Части ETag или None, если номер
+                страницы или курсор некорректны (ошибку отдаст ListView).
+        """
+        queryset = self.get_queryset().select_related(None).only(
+            'pub_date', 'updated_at', 'category', 'location')
+        page_size = self.get_paginate_by(queryset)
+        if self.use_cursor_pagination():
+            try:
+                page = CursorPaginator(queryset, page_size).page(
+                    self.request.GET.get(CURSOR_QUERY_PARAM))
+            except InvalidCursor:
+                return None, None
+            posts = page.object_list
+        else:
+            try:
+                number = int(self.request.GET.get(self.page_kwarg) or 1)
+            except ValueError:
+                return None, None
+            if number < 1:
+                return None, None
+            posts = list(
+                queryset[(number - 1) * page_size:number * page_size])
+            if not posts and number > 1:
+                return None, None
+        return [
+            feed_cache.get_generation(),
+            *self.get_etag_parts(),
+            [(post.pk, post.updated_at.isoformat()) for post in posts],
+        ], None
+
+    def get_etag_parts(self) -> list:
+        """Дополнительные значения, от которых зависит страница."""
+        return []
 
 
 class PostDetailDeleteMixin(PostMixin):
@@ -41,6 +205,7 @@ class PostFormMixin(PostDetailDeleteMixin):
     Обеспечивает:
     - Автоматическое назначение автора поста
     - Установку текущей даты, если дата публикации не указана
+    - Постановку в очередь создания копий загруженного изображения
 
     Наследуется от PostDetailDeleteMixin
 
@@ -64,8 +229,13 @@ class PostFormMixin(PostDetailDeleteMixin):
         Notes:
             - Автоматически назначает текущего пользователя автором поста
             - Устанавливает текущее время как дату публикации, если не указано
+            - Ставит в очередь создание копий изображения для ленты
+              и страницы поста
         """
         form.instance.author = self.request.user
         if not form.instance.pub_date:
             form.instance.pub_date = timezone.now()
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if 'image' in form.changed_data:
+            enqueue('blog.generate_thumbnails', post_id=self.object.pk)
+        return response
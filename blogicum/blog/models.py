@@ -3,6 +3,7 @@ from django.db import models
 from django.urls import reverse
 
 from blog.managers import PostManager
+from blog.thumbnails import Thumbnail
 from core.constants import MAX_LEN_TITLE_NAME
 from core.models import IsPublishedAndCreatedAt, Title
 
@@ -73,6 +74,20 @@ class Post(Title, IsPublishedAndCreatedAt):
         author (ForeignKey): Ссылка на автора публикации.
         location (ForeignKey): Местоположение, опционально.
         category (ForeignKey): Категория, обязательно.
+        comment_count (PositiveIntegerField): Денормализованное число
+            комментариев, поддерживается представлениями комментариев.
+        updated_at (DateTimeField): Время последнего изменения поста или
+            числа его комментариев; валидатор условных GET-запросов.
+
+    Indexes:
+        - Частичный индекс (-pub_date, -id) по опубликованным постам
+          для ленты (на СУБД без частичных индексов не создается).
+        - (is_published, pub_date), (category, pub_date) и
+          (author, pub_date) для главной ленты, категорий и профилей.
+
+    Properties:
+        feed_image, detail_image (Thumbnail): Уменьшенные копии image
+            для ленты и страницы поста (JPEG и WebP без метаданных).
 
     Managers:
         objects (Manager): Стандартный менеджер Django.
@@ -126,6 +141,15 @@ class Post(Title, IsPublishedAndCreatedAt):
         blank=True,
         upload_to='post_images'
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
     objects = models.Manager()
     optimized = PostManager()
 
@@ -133,10 +157,39 @@ class Post(Title, IsPublishedAndCreatedAt):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_published_date_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('is_published', 'pub_date'),
+                name='post_state_date_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_date_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.pk} - {self.title}'
 
+    @property
+    def feed_image(self):
+        """Копия изображения для карточки в ленте."""
+        return Thumbnail(self.image, 'feed') if self.image else None
+
+    @property
+    def detail_image(self):
+        """Копия изображения для страницы поста."""
+        return Thumbnail(self.image, 'detail') if self.image else None
+
     def get_absolute_url(self) -> str:
         """Генерирует URL для просмотра профиля автора публикации.
 
@@ -0,0 +1,151 @@
+"""Кеш шапки профиля автора: пользователь и счетчики его публикаций.
+
+Сводка хранится по id пользователя, а имя из адреса профиля
+переводится в id отдельным ключом, поэтому популярный профиль
+отдается без запроса к таблице пользователей и без COUNT(*) постов.
+Сигналы удаляют сводку автора по id при изменении его постов,
+комментариев и данных пользователя; вытеснение ключа имени из кеша
+этому не мешает. Имя в сводке сверяется с адресом, поэтому после
+переименования старый адрес не отдает чужую сводку. Изменение
+категорий (их публикация влияет на видимость постов) сбрасывает
+сводки всех авторов через поколение - случайную строку, как версия
+blog.registry, чтобы вытесненное поколение не вернуло старые сводки.
+
+QuerySet.update() и bulk_create() сигналов не отправляют: после
+массового изменения постов, комментариев или пользователей вызовите
+invalidate() для затронутых авторов или invalidate_all().
+"""
+import hashlib
+import math
+import uuid
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from blog.models import Post
+from comments.models import Comment
+from core import db_router
+
+User = get_user_model()
+
+GENERATION_KEY = 'blog:profile:generation'
+
+
+class ProfileSummary(NamedTuple):
+    """Сводка профиля.
+
+    Attributes:
+        user (User): Владелец профиля.
+        post_count (int): Опубликованные и уже видимые посты.
+        total_post_count (int): Все посты автора, включая скрытые.
+        comment_count (int): Комментарии, оставленные пользователем.
+        last_post_date (Optional[datetime]): Дата последнего видимого поста.
+        generation (str): Поколение сводок на момент построения.
+    """
+
+    user: User
+    post_count: int
+    total_post_count: int
+    comment_count: int
+    last_post_date: Optional[datetime]
+    generation: str
+
+
+def get_cache():
+    """Возвращает кеш, заданный в settings.PROFILE_CACHE_ALIAS."""
+    return caches[getattr(settings, 'PROFILE_CACHE_ALIAS', 'default')]
+
+
+def summary_key(user_id: int) -> str:
+    return f'blog:profile:{user_id}'
+
+
+def username_key(username: str) -> str:
+    digest = hashlib.md5(username.encode()).hexdigest()
+    return f'blog:profile:name:{digest}'
+
+
+def build(user: User, generation: str = ''):
+    """Считает сводку профиля двумя запросами.
+
+    Returns:
+        Tuple[ProfileSummary, Optional[datetime]]: Сводка и дата
+            ближайшей отложенной публикации автора.
+    """
+    now = timezone.now()
+    visible = Q(is_published=True, category__is_published=True)
+    published = visible & Q(pub_date__lte=now)
+    scheduled = visible & Q(pub_date__gt=now)
+    stats = Post.objects.filter(author=user).aggregate(
+        total=Count('pk'),
+        published=Count('pk', filter=published),
+        last=Max('pub_date', filter=published),
+        next=Min('pub_date', filter=scheduled),
+    )
+    summary = ProfileSummary(
+        user=user,
+        post_count=stats['published'],
+        total_post_count=stats['total'],
+        comment_count=Comment.objects.filter(author=user).count(),
+        last_post_date=stats['last'],
+        generation=generation,
+    )
+    return summary, stats['next']
+
+
+def get_timeout(next_pub_date: Optional[datetime]) -> Optional[int]:
+    """Время жизни сводки до ближайшей отложенной публикации автора."""
+    timeout = getattr(settings, 'PROFILE_CACHE_TIMEOUT', 300)
+    if next_pub_date is None:
+        return timeout
+    seconds = math.ceil((next_pub_date - timezone.now()).total_seconds())
+    return seconds if timeout is None else min(timeout, seconds)
+
+
+def get_summary(username: str) -> Optional[ProfileSummary]:
+    """Сводка профиля из кеша или из базы, None - нет пользователя.
+
+    Поколение читается вместе с id пользователя, сводка - вторым
+    обращением к кешу. Сводка для кеша строится по основной базе, а
+    не по реплике.
+    """
+    if not getattr(settings, 'PROFILE_CACHE_TIMEOUT', 300):
+        user = User.objects.filter(username=username).first()
+        return build(user)[0] if user else None
+    cache = get_cache()
+    name_key = username_key(username)
+    cached = cache.get_many([name_key, GENERATION_KEY])
+    generation = cached.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY, '')
+    user_id = cached.get(name_key)
+    if user_id is not None:
+        summary = cache.get(summary_key(user_id))
+        if (summary is not None and summary.generation == generation
+                and summary.user.username == username):
+            return summary
+    with db_router.primary():
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            return None
+        summary, next_pub_date = build(user, generation)
+    timeout = get_timeout(next_pub_date)
+    cache.set_many({summary_key(user.pk): summary, name_key: user.pk},
+                   timeout)
+    return summary
+
+
+def invalidate(user_id: int) -> None:
+    """Удаляет сводку пользователя без запроса к базе."""
+    get_cache().delete(summary_key(user_id))
+
+
+def invalidate_all() -> None:
+    """Делает недействительными сводки всех пользователей."""
+    get_cache().set(GENERATION_KEY, uuid.uuid4().hex, None)
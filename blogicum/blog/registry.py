@@ -0,0 +1,138 @@
+"""Справочник категорий и местоположений в памяти процесса.
+
+Категорий и местоположений немного, поэтому ленты не присоединяют их
+таблицы (JOIN), а берут объекты из справочника: видимость по категории
+проверяется условием category_id IN (...), а post.category и
+post.location подставляются после выборки.
+
+Справочник хранится в памяти процесса и в общем кеше под номером
+версии. Сигналы при сохранении или удалении категории/местоположения
+(в том числе из админки) записывают в кеш новую версию; каждый процесс
+сверяет её при обращении и перечитывает данные из кеша или базы.
+Версия - случайная строка, поэтому после очистки кеша процессы не
+примут старые данные за актуальные.
+
+Массовые вставки без сигналов (bulk_create, update(), import_fixture,
+generate_data) должны сами вызвать invalidate(). Сброс доходит до
+других процессов только через общий кеш: с LocMemCache (по умолчанию
+в разработке) у shell, management-команд и runserver свои кеши, и
+runserver увидит новые категории не раньше чем через DATA_TIMEOUT или
+после перезапуска.
+"""
+import threading
+import uuid
+from typing import Dict, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Model
+from django.db.models.query import ModelIterable
+
+from core import db_router
+
+VERSION_KEY = 'blog:registry:version'
+DATA_TIMEOUT = 24 * 60 * 60
+
+_lock = threading.Lock()
+_local = {'version': None, 'registry': None}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'POSTS_LOOKUP_REGISTRY', True)
+
+
+def get_cache():
+    """Возвращает кеш, заданный в settings.LOOKUP_REGISTRY_ALIAS."""
+    return caches[getattr(settings, 'LOOKUP_REGISTRY_ALIAS', 'default')]
+
+
+class Registry:
+    """Категории по id и slug, местоположения по id.
+
+    Attributes:
+        categories (Dict[int, Category]): Все категории по id.
+        locations (Dict[int, Location]): Все местоположения по id.
+        published_category_ids (List[int]): id опубликованных категорий.
+    """
+
+    def __init__(self, categories: List[Model], locations: List[Model]):
+        self.categories = {category.pk: category for category in categories}
+        self.locations = {location.pk: location for location in locations}
+        self._slugs = {category.slug: category for category in categories}
+        self.published_category_ids = sorted(
+            category.pk for category in categories if category.is_published)
+
+    def category(self, pk: int) -> Optional[Model]:
+        return self.categories.get(pk)
+
+    def category_by_slug(self, slug: str) -> Optional[Model]:
+        return self._slugs.get(slug)
+
+    def location(self, pk: int) -> Optional[Model]:
+        return self.locations.get(pk)
+
+    def attach(self, post: Model) -> None:
+        """Подставляет категорию и местоположение поста без запросов.
+
+        Если объекта нет в справочнике, связь загрузится как обычно.
+        """
+        for field, lookup in (('category', self.category),
+                              ('location', self.location)):
+            related = lookup(getattr(post, f'{field}_id'))
+            if related is not None:
+                setattr(post, field, related)
+
+
+def get_version(cache) -> str:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY, '')
+    return version
+
+
+def load() -> Dict[str, List[Model]]:
+    """Категории и местоположения из основной базы, не с реплики."""
+    with db_router.primary():
+        return {
+            'categories': list(
+                apps.get_model('blog', 'Category').objects.all()),
+            'locations': list(
+                apps.get_model('blog', 'Location').objects.all()),
+        }
+
+
+def get_registry() -> Registry:
+    """Актуальный справочник (одно обращение к кешу, если он не менялся)."""
+    cache = get_cache()
+    version = get_version(cache)
+    with _lock:
+        if _local['version'] == version and _local['registry'] is not None:
+            return _local['registry']
+    key = f'blog:registry:{version}'
+    data = cache.get(key)
+    if data is None:
+        data = load()
+        cache.set(key, data, DATA_TIMEOUT)
+    registry = Registry(data['categories'], data['locations'])
+    with _lock:
+        _local.update(version=version, registry=registry)
+    return registry
+
+
+def invalidate() -> None:
+    """Делает справочник недействительным во всех процессах."""
+    get_cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+    with _lock:
+        _local.update(version=None, registry=None)
+
+
+class RegistryModelIterable(ModelIterable):
+    """Выдает посты с категорией и местоположением из справочника."""
+
+    def __iter__(self):
+        registry = get_registry()
+        for post in super().__iter__():
+            registry.attach(post)
+            yield post
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog import feed_cache, profile_cache, registry
+from blog.models import Category, Location, Post
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Location)
+@receiver([post_save, post_delete], sender='comments.Comment')
+def invalidate_feed_cache(sender, **kwargs):
+    """Сбрасывает кеш ленты после изменения связанных с ней данных."""
+    feed_cache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Location)
+def invalidate_registry(sender, **kwargs):
+    """Перечитывает справочник категорий и местоположений."""
+    registry.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender='comments.Comment')
+def invalidate_author_profile(sender, instance, **kwargs):
+    """Сбрасывает сводку профиля автора поста или комментария."""
+    profile_cache.invalidate(instance.author_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_all_profiles(sender, **kwargs):
+    """Публикация категории меняет видимость постов всех авторов."""
+    profile_cache.invalidate_all()
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_profile(sender, instance, update_fields=None, **kwargs):
+    """Сбрасывает сводку и ленты при изменении пользователя (кроме входа).
+
+    Имя автора выводится в карточках, лентах и на странице поста, а
+    их ETag и кеш страниц зависят от поколения ленты.
+    """
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    profile_cache.invalidate(instance.pk)
+    feed_cache.invalidate()
@@ -0,0 +1,303 @@
+"""Карта сайта: индекс и сегменты по SITEMAP_SEGMENT_SIZE адресов.
+
+Разделы (посты, категории, профили) делятся на сегменты по диапазонам
+pk: сегмент n содержит строки с pk из [n * size, (n + 1) * size), поэтому
+в нем не больше size адресов, а новая строка не сдвигает границы
+остальных сегментов. Для каждого сегмента одним запросом с GROUP BY
+считается отпечаток (число строк, сумма pk, последняя дата изменения;
+для категорий и профилей - еще хеш slug или username). Сегмент
+перезаписывается, только если отпечаток изменился с прошлого запуска.
+Отпечатки хранятся в manifest.json рядом с файлами.
+
+Файлы пишутся в отдельный каталог SITEMAP_ROOT (адрес SITEMAP_URL),
+а не в STATIC_ROOT: collectstatic --clear его не очищает. Каждый файл
+сначала целиком пишется под временным именем и затем заменяет прежний
+через os.replace(), поэтому читатель никогда не видит отсутствующий
+или недописанный файл. Строки читаются из базы пачками, поэтому
+память не зависит от размера таблиц.
+"""
+import hashlib
+import json
+import os
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+from urllib.parse import quote, urljoin
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Count, F, Max, QuerySet, Sum
+from django.db.models.functions import Floor, Greatest
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import RFC3986_SUBDELIMS
+
+from blog.models import Category, Post
+from core.constants import SITEMAP_CHUNK_SIZE, SITEMAP_SEGMENT_SIZE
+
+User = get_user_model()
+
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+# Подходит под конвертеры int, slug и str и не встречается в маршрутах.
+URL_SENTINEL = '1234567890'
+SPOOL_SIZE = 1024 * 1024
+
+
+class Section:
+    """Раздел карты сайта.
+
+    Attributes:
+        name (str): Имя раздела в названиях файлов.
+        url_name (str): Маршрут страницы объекта.
+        url_kwarg (str): Аргумент маршрута.
+        key_field (str): Поле, подставляемое в адрес.
+        lastmod_field (Optional[str]): Поле или аннотация с датой
+            изменения; None - в карте нет lastmod.
+    """
+
+    name = ''
+    url_name = ''
+    url_kwarg = ''
+    key_field = 'pk'
+    lastmod_field = None
+
+    def get_queryset(self) -> QuerySet:
+        raise NotImplementedError
+
+    def url_template(self) -> str:
+        """Адрес страницы с URL_SENTINEL вместо ключа.
+
+        reverse() на каждую строку сегмента заметно медленнее подстановки.
+        """
+        return reverse(self.url_name, kwargs={self.url_kwarg: URL_SENTINEL})
+
+    def fingerprints(self, size: int) -> Dict[int, str]:
+        """Отпечатки всех непустых сегментов раздела одним запросом."""
+        aggregates = {'count': Count('pk'), 'keys': Sum('pk')}
+        if self.lastmod_field:
+            aggregates['lastmod'] = Max(self.lastmod_field)
+        rows = (
+            self.get_queryset()
+            .annotate(segment=Floor(F('pk') / size))
+            .order_by()
+            .values('segment')
+            .annotate(**aggregates)
+        )
+        result = {}
+        for row in rows:
+            number = int(row.pop('segment'))
+            if self.key_field != 'pk':
+                row['digest'] = self.key_digest(number, size)
+            result[number] = json.dumps(row, default=str, sort_keys=True)
+        return result
+
+    def key_digest(self, number: int, size: int) -> str:
+        """MD5 ключей сегмента, из которых строятся адреса.
+
+        У категорий и пользователей нет даты изменения, а адрес меняется
+        вместе со slug или username, поэтому ключи читаются из базы.
+        """
+        digest = hashlib.md5()
+        for row in self.rows(number, size):
+            digest.update(f'{row[0]}\n'.encode())
+        return digest.hexdigest()
+
+    def rows(self, number: int, size: int) -> Iterator[Tuple]:
+        """Ключи и даты изменения строк сегмента, пачками из базы."""
+        fields = [self.key_field]
+        if self.lastmod_field:
+            fields.append(self.lastmod_field)
+        return (
+            self.get_queryset()
+            .filter(pk__gte=number * size, pk__lt=(number + 1) * size)
+            .order_by('pk')
+            .values_list(*fields)
+            .iterator(chunk_size=SITEMAP_CHUNK_SIZE)
+        )
+
+
+class PostSection(Section):
+    """Опубликованные и уже видимые посты."""
+
+    name = 'posts'
+    url_name = 'blog:post_detail'
+    url_kwarg = 'post_id'
+    lastmod_field = 'lastmod'
+
+    def get_queryset(self) -> QuerySet:
+        """Отложенный пост изменяется в момент публикации."""
+        return (
+            Post.objects.filter(Post.optimized.published_filter())
+            .annotate(lastmod=Greatest('updated_at', 'pub_date'))
+        )
+
+
+class CategorySection(Section):
+    """Опубликованные категории."""
+
+    name = 'categories'
+    url_name = 'blog:category_posts'
+    url_kwarg = 'category_slug'
+    key_field = 'slug'
+
+    def get_queryset(self) -> QuerySet:
+        return Category.objects.filter(is_published=True)
+
+
+class ProfileSection(Section):
+    """Профили активных пользователей."""
+
+    name = 'profiles'
+    url_name = 'blog:profile'
+    url_kwarg = 'username'
+    key_field = 'username'
+
+    def get_queryset(self) -> QuerySet:
+        return User.objects.filter(is_active=True)
+
+
+SECTIONS = (PostSection(), CategorySection(), ProfileSection())
+
+
+class BuildResult(NamedTuple):
+    """Итог построения карты сайта.
+
+    Attributes:
+        written (List[str]): Перезаписанные сегменты.
+        skipped (int): Сегменты без изменений.
+        removed (List[str]): Удаленные опустевшие сегменты.
+    """
+
+    written: List[str]
+    skipped: int
+    removed: List[str]
+
+
+def get_base_url() -> str:
+    return getattr(settings, 'SITEMAP_BASE_URL', 'http://localhost:8000')
+
+
+def get_size() -> int:
+    return getattr(settings, 'SITEMAP_SEGMENT_SIZE', SITEMAP_SEGMENT_SIZE)
+
+
+def get_storage() -> FileSystemStorage:
+    """Хранилище в каталоге SITEMAP_ROOT с адресом SITEMAP_URL."""
+    return FileSystemStorage(
+        location=getattr(settings, 'SITEMAP_ROOT', 'sitemaps'),
+        base_url=getattr(settings, 'SITEMAP_URL', '/sitemaps/'))
+
+
+def index_url(storage: FileSystemStorage = None,
+              base_url: str = None) -> str:
+    """Абсолютный адрес индекса карты сайта."""
+    storage = storage or get_storage()
+    return urljoin(base_url or get_base_url(), storage.url(INDEX_NAME))
+
+
+def format_lastmod(value) -> str:
+    return value.date().isoformat()
+
+
+def segment_lines(section: Section, rows: Iterator[Tuple],
+                  base_url: str) -> Iterator[str]:
+    """Строки XML сегмента с адресами строк rows."""
+    prefix, suffix = urljoin(
+        base_url, section.url_template()).split(URL_SENTINEL)
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for row in rows:
+        key = quote(str(row[0]), safe=RFC3986_SUBDELIMS + '/~:@')
+        line = f'<url><loc>{escape(prefix + key + suffix)}</loc>'
+        if len(row) > 1:
+            line += f'<lastmod>{format_lastmod(row[1])}</lastmod>'
+        yield line + '</url>\n'
+    yield '</urlset>\n'
+
+
+def index_lines(segments: Dict[str, Dict], storage: FileSystemStorage,
+                base_url: str) -> Iterator[str]:
+    """Строки XML индекса со ссылками на сегменты."""
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for name in sorted(segments):
+        url = urljoin(base_url, storage.url(name))
+        yield (
+            f'<sitemap><loc>{escape(url)}</loc>'
+            f'<lastmod>{segments[name]["lastmod"]}</lastmod></sitemap>\n'
+        )
+    yield '</sitemapindex>\n'
+
+
+def write(storage: FileSystemStorage, name: str,
+          lines: Iterator[str]) -> None:
+    """Записывает строки в файл хранилища, атомарно заменяя прежний.
+
+    Строки копятся во временном файле (в памяти до SPOOL_SIZE байт,
+    дальше - на диске), сохраняются под временным именем и заменяют
+    прежний файл через os.replace().
+    """
+    with SpooledTemporaryFile(max_size=SPOOL_SIZE) as buffer:
+        for line in lines:
+            buffer.write(line.encode())
+        buffer.seek(0)
+        temp = storage.save(f'{name}.tmp', File(buffer, name=name))
+    os.replace(storage.path(temp), storage.path(name))
+
+
+def read_manifest(storage: FileSystemStorage) -> Dict:
+    if not storage.exists(MANIFEST_NAME):
+        return {}
+    with storage.open(MANIFEST_NAME) as file:
+        return json.loads(file.read())
+
+
+def build(storage: FileSystemStorage = None, base_url: str = None,
+          force: bool = False) -> BuildResult:
+    """Перестраивает изменившиеся сегменты и индекс карты сайта.
+
+    Опустевшие сегменты удаляются после записи индекса, который на них
+    уже не ссылается.
+
+    Args:
+        storage: Локальное хранилище (по умолчанию get_storage()).
+        base_url: Схема и домен сайта (по умолчанию SITEMAP_BASE_URL).
+        force: Перезаписать все сегменты.
+
+    Returns:
+        BuildResult: Перезаписанные, пропущенные и удаленные сегменты.
+    """
+    storage = storage or get_storage()
+    base_url = base_url or get_base_url()
+    size = get_size()
+    manifest = read_manifest(storage)
+    if manifest.get('base_url') != base_url or manifest.get('size') != size:
+        force = True
+    previous = manifest.get('segments', {})
+    segments = {}
+    written = []
+    now = format_lastmod(timezone.now())
+    for section in SECTIONS:
+        for number, fingerprint in sorted(section.fingerprints(size).items()):
+            name = f'sitemap-{section.name}-{number}.xml'
+            old = previous.get(name)
+            if not force and old and old['fingerprint'] == fingerprint:
+                segments[name] = old
+                continue
+            write(storage, name, segment_lines(
+                section, section.rows(number, size), base_url))
+            segments[name] = {'fingerprint': fingerprint, 'lastmod': now}
+            written.append(name)
+    removed = sorted(set(previous) - set(segments))
+    if written or removed or force or not storage.exists(INDEX_NAME):
+        write(storage, INDEX_NAME, index_lines(segments, storage, base_url))
+    for name in removed:
+        storage.delete(name)
+    content = json.dumps(
+        {'base_url': base_url, 'size': size, 'segments': segments})
+    write(storage, MANIFEST_NAME, [content])
+    return BuildResult(written, len(segments) - len(written), removed)
@@ -0,0 +1,20 @@
+from blog import feed_cache
+from blog.models import Post
+from blog.thumbnails import generate_thumbnails
+from jobs.registry import task
+
+
+@task('blog.generate_thumbnails')
+def generate_post_thumbnails(post_id: int) -> None:
+    """Создает копии изображения поста и сбрасывает кеш ленты.
+
+    Страницы, отрисованные до появления копий, ссылаются на оригинал,
+    поэтому после генерации сбрасывается кеш страниц ленты (и их ETag).
+    Закешированные карточки обновляются сами: наличие копии входит в
+    ключ карточки (см. PostMixin.get_context_data).
+    """
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    generate_thumbnails(post.image)
+    feed_cache.invalidate()
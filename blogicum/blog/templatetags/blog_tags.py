@@ -0,0 +1,12 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def authored_by(post, user) -> bool:
+    """Проверяет, является ли пользователь автором поста.
+
+    Сравнивает идентификаторы, не загружая автора из базы.
+    """
+    return user.is_authenticated and post.author_id == user.pk
@@ -0,0 +1,125 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Optional
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import DatabaseError
+from django.db.models.fields.files import ImageFieldFile
+from PIL import Image, ImageOps, features
+
+from core import db_router
+from core.constants import (POST_IMAGE_SIZES, THUMBNAIL_QUALITY,
+                            THUMBNAILS_DIR)
+from jobs.registry import enqueue
+
+FORMATS = {'jpeg': 'jpg', 'webp': 'webp'}
+QUEUED_TIMEOUT = 300
+
+
+def webp_supported() -> bool:
+    return features.check('webp')
+
+
+class Thumbnail:
+    """Уменьшенная копия изображения поста для ленты или страницы поста.
+
+    Хранится рядом с оригиналом в THUMBNAILS_DIR/<size>/ в форматах JPEG
+    и WebP, без метаданных. Если копии еще нет, при первом обращении к url
+    ставится фоновая задача на её создание, а до её выполнения отдается
+    оригинал. Факт наличия копии запоминается в кеше, чтобы не проверять
+    хранилище на каждой отрисовке.
+
+    Attributes:
+        image (ImageFieldFile): Исходное изображение.
+        size_name (str): Ключ размера из POST_IMAGE_SIZES.
+    """
+
+    def __init__(self, image: ImageFieldFile, size_name: str):
+        self.image = image
+        self.size_name = size_name
+        self._available = None
+
+    def name(self, fmt: str) -> str:
+        """Путь копии в хранилище для формата fmt ('jpeg' или 'webp')."""
+        original = PurePosixPath(self.image.name)
+        return str(
+            original.parent / THUMBNAILS_DIR / self.size_name
+            / f'{original.stem}.{FORMATS[fmt]}'
+        )
+
+    def _cache_key(self) -> str:
+        return f'blog:thumbnail:{self.name("jpeg")}'
+
+    def generate(self) -> None:
+        """Создает копии во всех поддерживаемых форматах."""
+        storage = self.image.storage
+        with self.image.open('rb') as file:
+            with Image.open(file) as original:
+                picture = ImageOps.exif_transpose(original).convert('RGB')
+        picture.thumbnail(
+            POST_IMAGE_SIZES[self.size_name], Image.Resampling.LANCZOS)
+        picture.info = {}
+        formats = ['jpeg'] + (['webp'] if webp_supported() else [])
+        for fmt in formats:
+            buffer = BytesIO()
+            picture.save(buffer, format=fmt.upper(),
+                         quality=THUMBNAIL_QUALITY, optimize=True)
+            name = self.name(fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+        cache.set(self._cache_key(), True, None)
+
+    def ensure(self) -> bool:
+        """Проверяет наличие копий и ставит задачу на их создание.
+
+        Returns:
+            bool: True, если копии доступны.
+        """
+        if self._available is None:
+            self._available = self._check_or_generate()
+        return self._available
+
+    def _check_or_generate(self) -> bool:
+        """Задача ставится при отрисовке GET-запроса.
+
+        Сбой очереди не должен ронять страницу, а запись задачи не
+        должна закреплять читателя за основной базой.
+        """
+        key = self._cache_key()
+        if cache.get(key):
+            return True
+        if self.image.storage.exists(self.name('jpeg')):
+            cache.set(key, True, None)
+            return True
+        if cache.add(f'{key}:queued', True, QUEUED_TIMEOUT):
+            try:
+                with db_router.side_write():
+                    enqueue('blog.generate_thumbnails',
+                            post_id=self.image.instance.pk)
+            except (DatabaseError, OSError, ValueError):
+                return False
+        return bool(cache.get(key))
+
+    @property
+    def url(self) -> str:
+        """URL JPEG-копии или оригинала, если копию создать не удалось."""
+        if not self.ensure():
+            return self.image.url
+        return self.image.storage.url(self.name('jpeg'))
+
+    @property
+    def webp_url(self) -> Optional[str]:
+        """URL WebP-копии, если Pillow поддерживает WebP."""
+        if not webp_supported() or not self.ensure():
+            return None
+        return self.image.storage.url(self.name('webp'))
+
+
+def generate_thumbnails(image: ImageFieldFile) -> None:
+    """Создает копии изображения всех размеров из POST_IMAGE_SIZES."""
+    if not image:
+        return
+    for size_name in POST_IMAGE_SIZES:
+        Thumbnail(image, size_name).generate()
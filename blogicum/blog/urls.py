@@ -1,34 +1,62 @@
 from django.urls import include, path
 
+from blog.feeds import (AuthorAtomFeed, AuthorFeed, CategoryAtomFeed,
+                        CategoryFeed, PostAtomFeed, PostFeed)
 from blog.views import (CategoryPostListView, PostCreateView, PostDeleteView,
-                        PostDetailView, PostListView, PostUpdateView,
-                        UserPostListView)
+                        PostDetailView, PostExportView, PostListView,
+                        PostUpdateView, UserPostListView)
+from core.executor import as_view
 
 app_name = 'blog'
 
 urlpatterns = [
     path(
         '',
-        PostListView.as_view(),
+        as_view(PostListView),
         name='index'
     ),
+    path(
+        'feed/rss/',
+        PostFeed(),
+        name='feed_rss'
+    ),
+    path(
+        'feed/atom/',
+        PostAtomFeed(),
+        name='feed_atom'
+    ),
     path(
         'category/<slug:category_slug>/',
-        CategoryPostListView.as_view(),
+        as_view(CategoryPostListView),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/feed/rss/',
+        CategoryFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/atom/',
+        CategoryAtomFeed(),
+        name='category_feed_atom'
+    ),
     path(
         'posts/create/',
         PostCreateView.as_view(),
         name='create_post'
     ),
+    path(
+        'posts/export/',
+        as_view(PostExportView),
+        name='export_posts'
+    ),
     path(
         'posts/<int:post_id>/',
         include('comments.urls', namespace='comments')
     ),
     path(
         'posts/<int:post_id>/',
-        PostDetailView.as_view(),
+        as_view(PostDetailView),
         name='post_detail'
     ),
     path(
@@ -46,4 +74,14 @@ urlpatterns = [
         UserPostListView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/feed/rss/',
+        AuthorFeed(),
+        name='author_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/feed/atom/',
+        AuthorAtomFeed(),
+        name='author_feed_atom'
+    ),
 ]
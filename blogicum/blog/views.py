@@ -1,24 +1,34 @@
 from typing import Optional
 
-from django.contrib.auth import get_user_model
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import QuerySet
+from django.contrib.auth.mixins import (LoginRequiredMixin,
+                                        UserPassesTestMixin)
+from django.db.models import OuterRef, QuerySet, Subquery
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  UpdateView, View)
 
-from blog.mixins import PostDetailDeleteMixin, PostFormMixin, PostMixin
+from blog import export, feed_cache, profile_cache, registry
+from blog.mixins import (FeedCacheMixin, FeedConditionalMixin,
+                         PostDetailDeleteMixin, PostFormMixin, PostMixin)
 from blog.models import Category, Post
 from comments.forms import CommentForm
-from core.mixins import AuthorRequiredMixin, CachedObjectMixin
+from comments.models import Comment
+from comments.mixins import CommentPageMixin
+from core.mixins import (AuthorRequiredMixin, CachedObjectMixin,
+                         ConditionalGetMixin, ReplicaReadMixin)
 
-User = get_user_model()
 
-
-class PostListView(PostMixin, ListView):
+class PostListView(ReplicaReadMixin, FeedCacheMixin, FeedConditionalMixin,
+                   PostMixin, ListView):
     """Представление для отображения списка опубликованных постов.
 
+    Анонимным читателям страницы отдаются из кеша ленты, на условные
+    запросы с неизмененной страницей - 304.
+
     Attributes:
         template_name (str): Путь к шаблону страницы.
     """
@@ -26,9 +36,27 @@ class PostListView(PostMixin, ListView):
     template_name = 'blog/index.html'
 
 
-class CategoryPostListView(PostMixin, ListView):
+def get_published_category(slug: str) -> Category:
+    """Опубликованная категория по slug, из справочника, если он включен.
+
+    Raises:
+        Http404: Если категория не найдена или не опубликована.
+    """
+    if not registry.is_enabled():
+        return get_object_or_404(Category, slug=slug, is_published=True)
+    category = registry.get_registry().category_by_slug(slug)
+    if category is None or not category.is_published:
+        raise Http404('Категория не найдена.')
+    return category
+
+
+class CategoryPostListView(ReplicaReadMixin, FeedCacheMixin,
+                           FeedConditionalMixin, PostMixin, ListView):
     """Представление для отображения постов конкретной категории.
 
+    Анонимным читателям страницы отдаются из кеша ленты, на условные
+    запросы с неизмененной страницей - 304.
+
     Attributes:
         template_name (str): Путь к шаблону страницы.
     """
@@ -44,11 +72,7 @@ class CategoryPostListView(PostMixin, ListView):
         Raises:
             Http404: Если категория не найдена или не опубликована.
         """
-        self.category = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        self.category = get_published_category(self.kwargs['category_slug'])
         return Post.optimized.visible().filter(category=self.category)
 
     def get_context_data(self, **kwargs):
@@ -62,9 +86,12 @@ class CategoryPostListView(PostMixin, ListView):
         return context
 
 
-class UserPostListView(PostMixin, ListView):
+class UserPostListView(ReplicaReadMixin, FeedConditionalMixin, PostMixin,
+                       ListView):
     """Представление для отображения постов конкретного пользователя.
 
+    На условные запросы с неизмененной страницей отвечает 304.
+
     Attributes:
         template_name (str): Путь к шаблону страницы.
     """
@@ -76,27 +103,52 @@ class UserPostListView(PostMixin, ListView):
 
         Для автора возвращает все посты с дополнительными аннотациями.
         Для других пользователей - только опубликованные посты.
+        Пользователь берется из закешированной сводки профиля.
 
         Returns:
             QuerySet[Post]: Посты указанного пользователя.
+
+        Raises:
+            Http404: Если пользователь не найден.
         """
-        self.profile_user = get_object_or_404(
-            User,
-            username=self.kwargs['username']
-        )
-        if self.profile_user == self.request.user:
+        self.summary = profile_cache.get_summary(self.kwargs['username'])
+        if self.summary is None:
+            raise Http404('Пользователь не найден.')
+        self.profile_user = self.summary.user
+        if self.is_owner():
             return Post.optimized.with_optimization().filter(
                 author=self.profile_user)
         return Post.optimized.visible().filter(author=self.profile_user)
 
+    def is_owner(self) -> bool:
+        return self.profile_user.pk == self.request.user.pk
+
+    def get_etag_parts(self) -> list:
+        """Данные шапки профиля: имя пользователя и счетчики."""
+        user = self.profile_user
+        return [
+            user.username, user.get_full_name(), self.summary.post_count,
+            self.summary.total_post_count, self.summary.comment_count,
+        ]
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Пагинатор с количеством постов из сводки вместо COUNT(*)."""
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        paginator.count = (
+            self.summary.total_post_count if self.is_owner()
+            else self.summary.post_count
+        )
+        return paginator
+
     def get_context_data(self, **kwargs):
-        """Добавляет профиль пользователя в контекст шаблона.
+        """Добавляет профиль пользователя и его счетчики в контекст.
 
         Returns:
             Dict[str, Any]: Контекст данных для шаблона.
         """
         context = super().get_context_data(**kwargs)
         context['profile'] = self.profile_user
+        context['profile_summary'] = self.summary
         return context
 
 
@@ -130,41 +182,118 @@ class PostUpdateView(AuthorRequiredMixin,
     pass
 
 
-class PostDetailView(PostDetailDeleteMixin, DetailView):
+class PostDetailView(ReplicaReadMixin, ConditionalGetMixin, CommentPageMixin,
+                     PostDetailDeleteMixin, DetailView):
     """Представление для просмотра деталей поста.
 
+    На условные запросы с неизмененной страницей отвечает 304.
+
     Attributes:
         template_name (str): Путь к шаблону страницы.
     """
 
     template_name = 'blog/detail.html'
 
+    def get_validators(self):
+        """Время изменения поста и последнего изменения его комментариев.
+
+        Пост выбирается тем же запросом, что и для страницы, с подзапросом
+        времени последнего комментария; на 304 тратится только он, без
+        выборки комментариев и рендера.
+
+        Last-Modified не отдается, как и в лентах: переименование
+        категории, местоположения или автора не сдвигает ни updated_at,
+        ни время комментариев, а меняет только поколение ленты в ETag.
+
+        Returns:
+            Tuple[list, None]: Части ETag.
+
+        Raises:
+            Http404: Если пост не найден.
+        """
+        self.object = self.get_object()
+        last_comment = self.object.last_comment
+        return [
+            feed_cache.get_generation(), self.object.updated_at.isoformat(),
+            last_comment.isoformat() if last_comment else None,
+        ], None
+
     def get_object(self, queryset: Optional[QuerySet[Post]] = None) -> Post:
         """Получает объект поста с проверкой прав доступа.
 
+        Автор видит свой пост всегда, остальные - только опубликованный.
+        Оба случая проверяются одним запросом. Пост, уже выбранный
+        в get_validators, повторно не запрашивается.
+
         Args:
             queryset: Базовый QuerySet.
 
         Returns:
-            Post: Запрошенный пост.
+            Post: Запрошенный пост с аннотацией last_comment.
 
         Raises:
             Http404: Если пост не найден.
         """
-        post = get_object_or_404(
-            Post.optimized.with_optimization(), pk=self.kwargs['post_id'])
-        if post.author == self.request.user:
-            return post
+        if getattr(self, 'object', None) is not None:
+            return self.object
+        last_comment = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by('-updated_at')
+            .values('updated_at')[:1]
+        )
         return get_object_or_404(
-            Post.optimized.visible(), pk=self.kwargs['post_id'])
+            Post.optimized.visible_for(self.request.user)
+            .annotate(last_comment=Subquery(last_comment)),
+            pk=self.kwargs['post_id']
+        )
 
     def get_context_data(self, **kwargs):
-        """Добавляет форму комментария и список комментариев в контекст.
+        """Добавляет форму комментария и первую порцию комментариев.
+
+        Остальные комментарии подгружаются фрагментами
+        (comments:comment_list).
 
         Returns:
             Dict[str, Any]: Контекст данных для шаблона.
         """
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = self.get_comments_page(self.object.pk)
         return context
+
+
+class PostExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Потоковая выгрузка всех постов с комментариями (только для staff).
+
+    Формат задается GET-параметром format: jsonl (по умолчанию) или csv.
+    Под WSGI ответ формируется по мере чтения из базы
+    (StreamingHttpResponse). Под ASGI потоковый ответ перебирается в
+    цикле событий, где запросы к базе запрещены, поэтому выгрузка
+    строится во временный файл в потоке пула (core.executor) и
+    отдается FileResponse.
+    """
+
+    raise_exception = True
+
+    def test_func(self) -> bool:
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        """Отдает выгрузку как прикрепленный файл.
+
+        Raises:
+            Http404: Если формат не поддерживается.
+        """
+        fmt = request.GET.get('format', 'jsonl')
+        if fmt not in export.FORMATS:
+            raise Http404('Неизвестный формат выгрузки.')
+        filename = f'posts-{timezone.now():%Y%m%d-%H%M%S}.{fmt}'
+        if isinstance(request, ASGIRequest):
+            return FileResponse(
+                export.export_file(fmt), as_attachment=True,
+                filename=filename, content_type=export.FORMATS[fmt])
+        response = StreamingHttpResponse(
+            export.export_lines(fmt), content_type=export.FORMATS[fmt])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"')
+        return response
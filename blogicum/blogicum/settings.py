@@ -3,6 +3,12 @@ Django settings for blogicum project.
 
 Generated by 'django-admin startproject' using Django 3.2.16.
 
+Значения берутся из переменных окружения DJANGO_*. Профиль задается
+DJANGO_PROFILE: development (по умолчанию) или production. Профиль
+production выключает DEBUG и debug_toolbar, включает постоянные
+соединения с БД, кеш сессий, кеш шаблонов и кеш ленты; любое значение
+можно переопределить переменной окружения.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/topics/settings/
 
@@ -10,25 +16,60 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+
+def env(name, default=None):
+    return os.environ.get(f'DJANGO_{name}', default)
+
+
+def env_bool(name, default):
+    value = env(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default):
+    value = env(name)
+    return default if value in (None, '') else int(value)
+
+
+def env_list(name, default):
+    value = env(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
+PROFILE = env('PROFILE', 'development')
+if PROFILE not in ('development', 'production'):
+    raise ImproperlyConfigured(f'Неизвестный DJANGO_PROFILE: {PROFILE}.')
+PRODUCTION = PROFILE == 'production'
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-es45zm3ktok-m!!fk%&bf&t5@avcr^7bp@q5@j$%mm18f_$_f='
+SECRET_KEY = env('SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured(
+            'В профиле production нужно задать DJANGO_SECRET_KEY.')
+    SECRET_KEY = (
+        'django-insecure-es45zm3ktok-m!!fk%&bf&t5@avcr^7bp@q5@j$%mm18f_$_f=')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_bool('DEBUG', not PRODUCTION)
 
-ALLOWED_HOSTS = [
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', [
     'localhost',
     '127.0.0.1',
-]
+])
 
 
 # Application definition
@@ -38,17 +79,21 @@ INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'users.apps.UsersConfig',
     'comments.apps.CommentsConfig',
+    'jobs.apps.JobsConfig',
+    'search.apps.SearchConfig',
+    'core.apps.CoreConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'debug_toolbar',
     'django_bootstrap5',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,19 +101,33 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# debug_toolbar нужен только при разработке (см. также blogicum/urls.py).
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+_template_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+if not DEBUG:
+    _template_loaders = [
+        ('django.template.loaders.cached.Loader', _template_loaders),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': _template_loaders,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -87,11 +146,86 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': env('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': env('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': env('DB_USER', ''),
+        'PASSWORD': env('DB_PASSWORD', ''),
+        'HOST': env('DB_HOST', ''),
+        'PORT': env('DB_PORT', ''),
+        # Постоянные соединения: не открывать новое на каждый запрос.
+        'CONN_MAX_AGE': env_int('CONN_MAX_AGE', 60 if PRODUCTION else 0),
     }
 }
 
+# Реплики только для чтения (см. core.db_router): DJANGO_REPLICA_DB_NAMES -
+# имена баз через запятую с теми же параметрами подключения, что у default.
+# Реплики с другими хостами задаются в DATABASES и DATABASE_REPLICAS.
+DATABASE_REPLICAS = []
+for number, name in enumerate(env_list('REPLICA_DB_NAMES', []), start=1):
+    DATABASE_REPLICAS.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = dict(
+        DATABASES['default'], NAME=name, TEST={'MIRROR': 'default'})
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает из основной базы.
+REPLICA_PIN_SECONDS = env_int('REPLICA_PIN_SECONDS', 10)
+
+# Режим WAL, mmap и busy_timeout для каждого соединения SQLite
+# (см. core.sqlite); PRAGMA переопределяются словарем SQLITE_PRAGMAS.
+SQLITE_TUNING = env_bool('SQLITE_TUNING', False)
+SQLITE_PRAGMAS = {}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# В production кеш по умолчанию файловый, чтобы сбросы кешей сигналами
+# были видны всем процессам; для нескольких серверов задайте memcached.
+# В нем живут страницы лент, карточки постов, сводки профилей и
+# справочник: при 300 записях (значение Django по умолчанию) случайное
+# вытеснение выбрасывало бы их почти сразу, поэтому предел поднят.
+# Замеры запросов хранятся в отдельном кеше 'metrics': им нужен
+# атомарный incr(), а у файлового кеша его нет (см. core.checks).
+# LocMemCache в разработке живет в памяти процесса: сброс справочника
+# категорий, ленты и сводок профилей из generate_data, import_fixture
+# или shell не доходит до запущенного runserver - перезапустите его
+# или задайте CACHE_BACKEND с общим кешем.
+CACHE_BACKEND = env('CACHE_BACKEND', (
+    'django.core.cache.backends.filebased.FileBasedCache'
+    if PRODUCTION
+    else 'django.core.cache.backends.locmem.LocMemCache'
+))
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': env('CACHE_LOCATION', (
+            str(Path(tempfile.gettempdir()) / 'blogicum-cache')
+            if PRODUCTION else ''
+        )),
+        'TIMEOUT': env_int('CACHE_TIMEOUT', 300),
+    },
+    # Замеры запросов (core.metrics) требуют атомарного incr(), которого
+    # нет у файлового кеша. LocMemCache копит их в каждом процессе
+    # отдельно; для общих замеров задайте memcached или redis.
+    'metrics': {
+        'BACKEND': env('METRICS_CACHE_BACKEND',
+                       'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env('METRICS_CACHE_LOCATION', 'blogicum-metrics'),
+    },
+}
+
+# Клиенты memcached не принимают MAX_ENTRIES: память ограничивает сам
+# сервер memcached.
+if 'memcached' not in CACHE_BACKEND:
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': env_int('CACHE_MAX_ENTRIES', 20000),
+    }
+
+SESSION_ENGINE = env('SESSION_ENGINE', (
+    'django.contrib.sessions.backends.cached_db' if PRODUCTION
+    else 'django.contrib.sessions.backends.db'
+))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -130,6 +264,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
 
 STATIC_URL = '/static/'
+STATIC_ROOT = env('STATIC_ROOT', BASE_DIR / 'staticfiles')
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -154,4 +289,58 @@ LOGIN_URL = 'login'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = env('MEDIA_ROOT', BASE_DIR / 'media')
+
+# Keyset-пагинация лент постов: без COUNT(*) и OFFSET,
+# только ссылки «вперед/назад».
+POSTS_CURSOR_PAGINATION = False
+
+# Брать число комментариев из Post.comment_count вместо Count('comments').
+POSTS_DENORMALIZED_COMMENT_COUNT = True
+
+# Кеш страниц ленты для анонимных читателей (см. blog.feed_cache).
+FEED_CACHE_ENABLED = env_bool('FEED_CACHE_ENABLED', PRODUCTION)
+FEED_CACHE_ALIAS = 'default'
+FEED_CACHE_TIMEOUT = 300
+
+# Асинхронные ленты, страница поста и подгрузка комментариев под ASGI
+# (blogicum/asgi.py включает их по умолчанию): ORM и шаблоны выполняются
+# в ограниченном пуле потоков core.executor.
+ASYNC_VIEWS = env_bool('ASYNC_VIEWS', False)
+ASYNC_EXECUTOR_THREADS = env_int('ASYNC_EXECUTOR_THREADS', 8)
+
+# Адрес сайта в карте сайта (blog.sitemaps, команда build_sitemaps).
+SITEMAP_BASE_URL = env('SITEMAP_BASE_URL', 'http://localhost:8000')
+# Каталог карты сайта вне STATIC_ROOT, чтобы collectstatic --clear
+# не удалял её. При DEBUG файлы раздает runserver, в production -
+# веб-сервер по адресу SITEMAP_URL.
+SITEMAP_ROOT = env('SITEMAP_ROOT', BASE_DIR / 'sitemaps')
+SITEMAP_URL = '/sitemaps/'
+
+# Категории и местоположения берутся из справочника в памяти
+# (blog.registry) вместо JOIN в запросах лент.
+POSTS_LOOKUP_REGISTRY = True
+LOOKUP_REGISTRY_ALIAS = 'default'
+
+# Кеш сводки профиля автора (см. blog.profile_cache), 0 - без кеша.
+PROFILE_CACHE_ALIAS = 'default'
+PROFILE_CACHE_TIMEOUT = 300
+
+# Время жизни закешированной карточки поста в лентах, 0 - без кеша.
+POST_CARD_CACHE_TIMEOUT = 0 if DEBUG else 300
+
+# Фоновые задачи (jobs): выполняются командой run_workers,
+# при JOBS_ALWAYS_EAGER - сразу в потоке запроса.
+JOBS_ALWAYS_EAGER = False
+JOBS_WORKER_THREADS = 4
+JOBS_MAX_ATTEMPTS = 3
+JOBS_POLL_INTERVAL = 1
+JOBS_STALE_AFTER = 600
+
+# Поисковый индекс постов: 'auto' (FTS5 на SQLite), 'fts5' или 'python'.
+SEARCH_BACKEND = 'auto'
+
+# Замеры запросов по представлениям (core.middleware, команда view_metrics).
+METRICS_CACHE_ALIAS = 'metrics'
+METRICS_WINDOW_MINUTES = 15
+METRICS_FLUSH_INTERVAL = 10
@@ -3,16 +3,20 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from pages.views import robots_txt
+
 
 handler404 = 'pages.views.page_not_found_view'
 handler500 = 'pages.views.server_error_view'
 handler403 = 'pages.views.permission_denied'
 
 urlpatterns = [
+    path('robots.txt', robots_txt, name='robots_txt'),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('search/', include('search.urls', namespace='search')),
     path('', include('blog.urls', namespace='posts')),
 ]
 
@@ -21,3 +25,5 @@ if settings.DEBUG:
     urlpatterns += [path("__debug__/", include(debug_toolbar.urls))]
     urlpatterns += static(
         settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += static(
+        settings.SITEMAP_URL, document_root=settings.SITEMAP_ROOT)
@@ -1,43 +1,52 @@
-from django.shortcuts import get_object_or_404
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404
 from django.urls import reverse
+from django.utils import timezone
 
 from blog.models import Post
 from comments.forms import CommentForm
 from comments.models import Comment
+from core.constants import COMMENTS_IN_PAGE, CURSOR_QUERY_PARAM
+from core.paginators import CursorPage, CursorPaginator, cursor_page_or_404
+
+COMMENT_FIELDS = ('text', 'post', 'author', 'created_at', 'updated_at')
 
 
 class BaseCommentMixin:
     """Базовый миксин для операций с комментариями.
 
     Предоставляет общую функциональность для работы с комментариями:
-    - Получение связанного поста
+    - Выборка комментария поста из URL с автором одним запросом
     - Базовые настройки (модель, шаблон, URL параметр)
 
+    Строка поста не читается: принадлежность комментария посту
+    проверяется условием post_id в той же выборке, а для записи
+    достаточно post_id из URL.
+
     Attributes:
         model (Type[Comment]): Модель комментария.
         template_name (str): Путь к шаблону.
         pk_url_kwarg (str): Имя параметра URL с ID комментария.
-        current_post (Post): Текущий пост (устанавливается в dispatch).
     """
 
     model = Comment
-    queryset = Comment.objects.select_related('author').all()
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        """Обрабатывает запрос и сохраняет текущий пост.
-
-        Args:
-            request: HttpRequest объект.
-            *args: Дополнительные позиционные аргументы.
-            **kwargs: Дополнительные именованные аргументы.
+    def get_queryset(self):
+        """Комментарии поста из URL; из автора - только id и username.
 
         Returns:
-            HttpResponse: Результат обработки запроса.
+            QuerySet: Комментарии с присоединенным автором.
         """
-        self.current_post = get_object_or_404(Post, pk=kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+        return (
+            Comment.objects.filter(post_id=self.kwargs['post_id'])
+            .select_related('author')
+            .only(*COMMENT_FIELDS, 'author__username')
+        )
 
     def get_success_url(self) -> str:
         """Генерирует URL для перенаправления после успешного действия.
@@ -46,7 +55,26 @@ class BaseCommentMixin:
             str: URL страницы детального просмотра поста.
         """
         return reverse(
-            'blog:post_detail', kwargs={'post_id': self.current_post.pk})
+            'blog:post_detail', kwargs={'post_id': self.kwargs['post_id']})
+
+
+class VisiblePostMixin:
+    """Миксин для проверки, что пост из URL доступен пользователю.
+
+    Проверка - один EXISTS по первичному ключу поста с условием
+    видимости, без чтения строки поста.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Проверяет пост перед обработкой запроса.
+
+        Raises:
+            Http404: Если пост не найден или недоступен пользователю.
+        """
+        if not Post.optimized.visible_for(
+                request.user).filter(pk=kwargs['post_id']).exists():
+            raise Http404('Пост не найден.')
+        return super().dispatch(request, *args, **kwargs)
 
 
 class CommentFormMixin:
@@ -71,6 +99,81 @@ class CommentFormMixin:
         Returns:
             HttpResponse: Результат обработки валидной формы.
         """
-        form.instance.post = self.current_post
+        form.instance.post_id = self.kwargs['post_id']
         form.instance.author = self.request.user
         return super().form_valid(form)
+
+
+class CommentCountMixin:
+    """Миксин для поддержки денормализованного Post.comment_count.
+
+    Изменяет счетчик поста в той же транзакции, что и запись комментария,
+    через F-выражение, поэтому параллельные запросы не теряют обновления.
+    Вместе со счетчиком обновляется Post.updated_at: удаленный комментарий
+    не оставляет строки, по которой изменился бы валидатор страницы поста.
+
+    Attributes:
+        comment_count_delta (int): На сколько изменить счетчик
+            (1 - при создании, -1 - при удалении).
+    """
+
+    comment_count_delta = 0
+
+    def shift_comment_count(self):
+        """Атомарно изменяет счетчик комментариев текущего поста."""
+        Post.objects.filter(pk=self.kwargs['post_id']).update(
+            comment_count=F('comment_count') + self.comment_count_delta,
+            updated_at=timezone.now())
+
+    def form_valid(self, form: CommentForm):
+        """Сохраняет комментарий и увеличивает счетчик поста."""
+        with transaction.atomic():
+            response = super().form_valid(form)
+            self.shift_comment_count()
+        return response
+
+    def delete(self, request, *args, **kwargs):
+        """Удаляет комментарий и уменьшает счетчик поста."""
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            self.shift_comment_count()
+        return response
+
+
+class CommentPageMixin:
+    """Миксин для постраничного вывода комментариев к посту.
+
+    Комментарии выбираются keyset-пагинацией по (created_at, id) в порядке
+    Comment.Meta.ordering, поэтому стоимость любой порции одинакова.
+
+    Attributes:
+        comments_per_page (int): Количество комментариев в одной порции.
+    """
+
+    comments_per_page = COMMENTS_IN_PAGE
+
+    def get_comments_page(self, post_id: int,
+                          cursor: Optional[str] = None) -> CursorPage:
+        """Возвращает порцию комментариев поста, начиная с курсора.
+
+        Args:
+            post_id: Первичный ключ поста.
+            cursor: Курсор предыдущей порции или None для первой.
+
+        Returns:
+            CursorPage: Комментарии с авторами и курсор следующей порции.
+
+        Raises:
+            Http404: Если курсор поврежден.
+        """
+        paginator = CursorPaginator(
+            Comment.objects.select_related('author').filter(post_id=post_id),
+            self.comments_per_page,
+            date_field='created_at',
+            descending=False,
+        )
+        return cursor_page_or_404(paginator, cursor)
+
+    def get_cursor(self) -> Optional[str]:
+        """Курсор из GET-параметра запроса."""
+        return self.request.GET.get(CURSOR_QUERY_PARAM)
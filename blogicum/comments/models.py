@@ -14,9 +14,11 @@ class Comment(models.Model):
         post (ForeignKey): Связь с постом, к которому относится комментарий.
         author (ForeignKey): Связь с автором комментария.
         created_at (DateTimeField): Дата и время создания комментария.
+        updated_at (DateTimeField): Дата и время последнего изменения.
 
     Мета:
         ordering: Сортировка комментариев по дате создания (от старых к новым).
+        indexes: Индекс (post, created_at) для комментариев на странице поста.
         verbose_name (str): Человекочитаемое имя модели в единственном числе.
         verbose_name_plural (str):
             Человекочитаемое имя модели во множественном числе.
@@ -41,8 +43,18 @@ class Comment(models.Model):
         auto_now_add=True,
         verbose_name='Дата комментария'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменен'
+    )
 
     class Meta:
         verbose_name = 'Коментарий'
         verbose_name_plural = 'Коментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
@@ -1,11 +1,17 @@
 from django.urls import path
 
 from comments.views import (CommentCreateView, CommentDeliteView,
-                            CommentUpdateView)
+                            CommentListView, CommentUpdateView)
+from core.executor import as_view
 
 app_name = 'comments'
 
 urlpatterns = [
+    path(
+        'comments/',
+        as_view(CommentListView),
+        name='comment_list'
+    ),
     path(
         'comment/',
         CommentCreateView.as_view(),
@@ -1,19 +1,27 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import CreateView, DeleteView, UpdateView
+from django.views.generic import (CreateView, DeleteView, TemplateView,
+                                  UpdateView)
 
-from comments.mixins import BaseCommentMixin, CommentFormMixin
-from core.mixins import AuthorRequiredMixin, CachedObjectMixin
+from comments.mixins import (BaseCommentMixin, CommentCountMixin,
+                             CommentFormMixin, CommentPageMixin,
+                             VisiblePostMixin)
+from core.mixins import (AuthorRequiredMixin, CachedObjectMixin,
+                         ReplicaReadMixin)
 
 
 class CommentCreateView(LoginRequiredMixin,
+                        VisiblePostMixin,
                         BaseCommentMixin,
+                        CommentCountMixin,
                         CommentFormMixin,
                         CreateView):
     """Представление для создания нового комментария.
 
     Наследует функциональность:
     - LoginRequiredMixin: Требует аутентификации пользователя
+    - VisiblePostMixin: Проверяет, что пост доступен пользователю
     - BaseCommentMixin: Базовые настройки работы с комментариями
+    - CommentCountMixin: Увеличивает счетчик комментариев поста
     - CommentFormMixin: Обработка формы комментария
     - CreateView: Стандартная логика создания объекта
 
@@ -29,7 +37,7 @@ class CommentCreateView(LoginRequiredMixin,
             (обрабатывается в CommentFormMixin)
     """
 
-    pass
+    comment_count_delta = 1
 
 
 class CommentUpdateView(AuthorRequiredMixin,
@@ -67,6 +75,7 @@ class CommentUpdateView(AuthorRequiredMixin,
 class CommentDeliteView(AuthorRequiredMixin,
                         CachedObjectMixin,
                         BaseCommentMixin,
+                        CommentCountMixin,
                         DeleteView):
     """Представление для удаления комментария.
 
@@ -74,6 +83,7 @@ class CommentDeliteView(AuthorRequiredMixin,
     - AuthorRequiredMixin: Проверка авторства комментария
     - CachedObjectMixin: Кеширует обьект в рамках запроса
     - BaseCommentMixin: Базовые настройки работы с комментариями
+    - CommentCountMixin: Уменьшает счетчик комментариев поста
     - DeleteView: Стандартная логика удаления объекта
 
     Attributes:
@@ -89,4 +99,31 @@ class CommentDeliteView(AuthorRequiredMixin,
             Перенаправление после удаления (обрабатывается в BaseCommentMixin)
     """
 
-    pass
+    comment_count_delta = -1
+
+
+class CommentListView(ReplicaReadMixin, VisiblePostMixin, CommentPageMixin,
+                      TemplateView):
+    """Фрагмент со следующей порцией комментариев к посту.
+
+    Подгружается со страницы поста по ссылке «Показать ещё», поэтому
+    первая отрисовка поста ограничена одной порцией комментариев.
+
+    Attributes:
+        template_name (str): Шаблон фрагмента со списком комментариев.
+    """
+
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        """Добавляет порцию комментариев в контекст.
+
+        Returns:
+            Dict[str, Any]: Контекст данных для шаблона.
+        """
+        post_id = self.kwargs['post_id']
+        context = super().get_context_data(**kwargs)
+        context['post_id'] = post_id
+        context['comments'] = self.get_comments_page(
+            post_id, self.get_cursor())
+        return context
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core import checks  # noqa: F401
+        from core.middleware import install_query_tracking
+        from core.sqlite import configure_connection
+
+        connection_created.connect(
+            configure_connection, dispatch_uid='core.sqlite')
+        connection_created.connect(
+            install_query_tracking, dispatch_uid='core.metrics')
@@ -0,0 +1,352 @@
+"""Измерение задержек страниц внутри процесса, без сетевого стека.
+
+Запросы выполняются тестовым клиентом Django либо прямым вызовом WSGI-
+или ASGI-приложения проекта; последние ближе к production, так как
+проходят тот же путь, что и запрос от gunicorn/uwsgi или uvicorn.
+В режиме WSGI каждое соединение - отдельный поток, в режиме ASGI -
+корутина в одном цикле событий, как у ASGI-сервера.
+
+BackgroundWriter создает комментарии в отдельных потоках во время
+замера чтения, чтобы видеть, как блокировки записи влияют на читателей.
+"""
+import asyncio
+import itertools
+import math
+import threading
+import time
+from io import BytesIO
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+
+Caller = Callable[[str], int]
+AsyncCaller = Callable[[str], Awaitable[int]]
+
+MODES = ('wsgi', 'asgi', 'client')
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    """Перцентиль методом ближайшего ранга."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def get_host() -> str:
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*']
+    return hosts[0].lstrip('.') if hosts else 'localhost'
+
+
+def wsgi_caller(cookies: Optional[Dict[str, str]] = None) -> Caller:
+    """Вызывает WSGI-приложение проекта и возвращает код ответа."""
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    cookie = '; '.join(f'{key}={value}' for key, value in
+                       (cookies or {}).items())
+
+    def call(url: str) -> int:
+        parts = urlsplit(url)
+        environ = {
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'HTTP_HOST': get_host(),
+            'HTTP_COOKIE': cookie,
+            'wsgi.input': BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        status = []
+
+        def start_response(value, headers, exc_info=None):
+            status.append(value)
+
+        body = application(environ, start_response)
+        try:
+            for _ in body:
+                pass
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+        return int(status[0].split()[0])
+
+    return call
+
+
+def asgi_caller(cookies: Optional[Dict[str, str]] = None) -> AsyncCaller:
+    """Вызывает ASGI-приложение проекта и возвращает код ответа."""
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    cookie = '; '.join(f'{key}={value}' for key, value in
+                       (cookies or {}).items())
+    host = get_host()
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def call(url: str) -> int:
+        parts = urlsplit(url)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': parts.path,
+            'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(),
+            'root_path': '',
+            'headers': [(b'host', host.encode()),
+                        (b'cookie', cookie.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': (host, 80),
+        }
+        status = []
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+
+        await application(scope, receive, send)
+        return status[0]
+
+    return call
+
+
+def client_caller(cookies: Optional[Dict[str, str]] = None) -> Caller:
+    """Вызывает представления через django.test.Client."""
+    client = Client(HTTP_HOST=get_host())
+    for key, value in (cookies or {}).items():
+        client.cookies[key] = value
+
+    def call(url: str) -> int:
+        return client.get(url).status_code
+
+    return call
+
+
+def comment_caller(cookies: Optional[Dict[str, str]] = None) -> Caller:
+    """Отправляет форму комментария (POST) через django.test.Client.
+
+    Исключения представления, например «database is locked», дают
+    ответ 500, а не прерывают поток.
+    """
+    client = Client(HTTP_HOST=get_host(), raise_request_exception=False)
+    for key, value in (cookies or {}).items():
+        client.cookies[key] = value
+    counter = itertools.count()
+
+    def call(url: str) -> int:
+        text = f'Комментарий нагрузочного теста {next(counter)}'
+        return client.post(url, {'text': text}).status_code
+
+    return call
+
+
+class BackgroundWriter:
+    """Потоки, которые пишут по адресу url, пока их не остановят.
+
+    Attributes:
+        url (str): Адрес записи (например, добавление комментария).
+        threads (int): Количество пишущих потоков.
+        interval (float): Пауза между записями одного потока, с.
+        writes (int): Количество выполненных записей.
+        errors (int): Количество ответов с кодом 5xx.
+        elapsed (float): Время работы, с.
+    """
+
+    def __init__(self, url: str, make_caller: Callable[[], Caller],
+                 threads: int = 1, interval: float = 0.0):
+        self.url = url
+        self.make_caller = make_caller
+        self.threads = threads
+        self.interval = interval
+        self.writes = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers = []
+        self._started = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Записей в секунду."""
+        if not self.elapsed:
+            return 0.0
+        return self.writes / self.elapsed
+
+    def worker(self, call: Caller):
+        try:
+            while not self._stop.is_set():
+                status = call(self.url)
+                with self._lock:
+                    self.writes += 1
+                    self.errors += status >= 500
+                self._stop.wait(self.interval)
+        finally:
+            connections.close_all()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._workers = [
+            threading.Thread(target=self.worker, args=(self.make_caller(),))
+            for _ in range(self.threads)
+        ]
+        for thread in self._workers:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._workers:
+            thread.join()
+        self._workers = []
+        self.elapsed += time.perf_counter() - self._started
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class RouteResult:
+    """Замеры одного адреса.
+
+    Attributes:
+        name (str): Имя маршрута в отчете.
+        url (str): Запрошенный адрес.
+        samples (List[float]): Длительности запросов, мс.
+        errors (int): Количество ответов с кодом 5xx.
+        elapsed (float): Общее время прогона, с.
+    """
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.samples = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Запросов в секунду с учетом параллельности."""
+        if not self.elapsed:
+            return 0.0
+        return len(self.samples) / self.elapsed
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'requests': len(self.samples),
+            'errors': self.errors,
+            'p50': percentile(self.samples, 50),
+            'p95': percentile(self.samples, 95),
+            'p99': percentile(self.samples, 99),
+            'rps': self.throughput,
+        }
+
+
+def split(requests: int, concurrency: int) -> List[int]:
+    """Делит requests запросов между concurrency исполнителями."""
+    concurrency = max(1, min(concurrency, requests))
+    return [requests // concurrency + (index < requests % concurrency)
+            for index in range(concurrency)]
+
+
+def run_route(name: str, url: str, make_caller: Callable[[], Caller],
+              requests: int, concurrency: int = 1,
+              warmup: int = 0) -> RouteResult:
+    """Выполняет requests запросов к url в concurrency потоков.
+
+    Args:
+        name: Имя маршрута в отчете.
+        url: Адрес с query string.
+        make_caller: Фабрика функции запроса; вызывается в каждом потоке.
+        requests: Общее количество замеряемых запросов.
+        concurrency: Количество параллельных потоков.
+        warmup: Количество незамеряемых запросов перед прогоном.
+
+    Returns:
+        RouteResult: Длительности запросов и пропускная способность.
+    """
+    result = RouteResult(name, url)
+    lock = threading.Lock()
+    caller = make_caller()
+    for _ in range(warmup):
+        caller(url)
+
+    def measure(count: int, call: Caller):
+        samples, errors = [], 0
+        for _ in range(count):
+            start = time.perf_counter()
+            status = call(url)
+            samples.append((time.perf_counter() - start) * 1000)
+            errors += status >= 500
+        with lock:
+            result.samples += samples
+            result.errors += errors
+
+    def worker(count: int, call: Caller):
+        try:
+            measure(count, call)
+        finally:
+            connections.close_all()
+
+    shares = split(requests, concurrency)
+    started = time.perf_counter()
+    if len(shares) == 1:
+        measure(requests, caller)
+    else:
+        threads = [
+            threading.Thread(target=worker, args=(share, make_caller()))
+            for share in shares
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_route_async(name: str, url: str,
+                    make_caller: Callable[[], AsyncCaller], requests: int,
+                    concurrency: int = 1, warmup: int = 0) -> RouteResult:
+    """Выполняет requests запросов к url в concurrency корутинах.
+
+    Корутины работают в одном цикле событий и вызывают ASGI-приложение
+    одновременно, как соединения к ASGI-серверу. Аргументы - как
+    у run_route.
+
+    Returns:
+        RouteResult: Длительности запросов и пропускная способность.
+    """
+    result = RouteResult(name, url)
+
+    async def measure(count: int, call: AsyncCaller):
+        for _ in range(count):
+            start = time.perf_counter()
+            status = await call(url)
+            result.samples.append((time.perf_counter() - start) * 1000)
+            result.errors += status >= 500
+
+    async def run():
+        caller = make_caller()
+        for _ in range(warmup):
+            await caller(url)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            measure(share, caller)
+            for share in split(requests, concurrency)))
+        result.elapsed = time.perf_counter() - started
+
+    asyncio.run(run())
+    return result
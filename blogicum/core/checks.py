@@ -0,0 +1,25 @@
+"""Проверки настроек при запуске (manage.py check, runserver, migrate)."""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches)
+def check_metrics_cache(app_configs, **kwargs):
+    """Кеш замеров должен поддерживать атомарный incr().
+
+    BaseCache.incr() - это get() и set(): при одновременных сбросах
+    нескольких процессов замеры и имена представлений теряются.
+    """
+    alias = getattr(settings, 'METRICS_CACHE_ALIAS', 'default')
+    backend = type(caches[alias])
+    if backend.incr is not BaseCache.incr:
+        return []
+    return [Error(
+        f'Кеш замеров "{alias}" ({backend.__name__}) не поддерживает '
+        f'атомарный incr().',
+        hint='Укажите в METRICS_CACHE_ALIAS кеш memcached, redis или '
+             'LocMemCache (DJANGO_METRICS_CACHE_BACKEND).',
+        id='core.E001',
+    )]
@@ -1,3 +1,17 @@
 POSTS_IN_PAGE = 10
+CURSOR_QUERY_PARAM = 'cursor'
+COMMENTS_IN_PAGE = 20
 MAX_LEN_TITLE_NAME = 256
 LEN_TEXT_FOR_ADMIN = 25
+ADMIN_SEARCH_LIMIT = 1000
+POST_IMAGE_SIZES = {
+    'feed': (640, 640),
+    'detail': (1280, 1280),
+}
+THUMBNAILS_DIR = 'thumbs'
+THUMBNAIL_QUALITY = 85
+EXPORT_CHUNK_SIZE = 2000
+FEED_ITEMS = 20
+FEED_SUMMARY_LENGTH = 300
+SITEMAP_SEGMENT_SIZE = 50000
+SITEMAP_CHUNK_SIZE = 2000
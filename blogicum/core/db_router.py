@@ -0,0 +1,148 @@
+"""Маршрутизация чтения на реплики базы данных.
+
+Запись всегда идет в основную базу (default). Чтение отправляется на
+одну из реплик из settings.DATABASE_REPLICAS, только если запрос
+обрабатывает представление только для чтения (ReplicaReadMixin) и
+пользователь не закреплен за основной базой.
+
+Закрепление дает read-your-writes: если во время запроса была запись,
+ReplicaRoutingMiddleware ставит cookie на REPLICA_PIN_SECONDS секунд,
+и пока она жива, все чтения пользователя идут в основную базу, даже
+если реплика еще не получила его пост или комментарий.
+
+Данные, которые сохраняются в общий кеш (справочник, сводка профиля,
+страницы ленты), читаются в блоке primary(), чтобы отстающая реплика
+не попала в кеш на всё время его жизни.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_primary_pin'
+ROUTED_APPS = ('blog', 'comments', 'users')
+
+
+class RoutingState:
+    """Состояние маршрутизации текущего запроса.
+
+    Attributes:
+        use_replica (bool): Представление разрешает чтение с реплики.
+        wrote (bool): Во время запроса была запись в базу.
+        primary_depth (int): Вложенность блоков primary().
+    """
+
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+        self.primary_depth = 0
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar(
+    'db_routing_state', default=None)
+
+
+def get_state() -> Optional[RoutingState]:
+    return _state.get()
+
+
+def begin():
+    """Начинает маршрутизацию запроса; возвращает токен для end()."""
+    return _state.set(RoutingState())
+
+
+def end(token) -> None:
+    _state.reset(token)
+
+
+def get_replicas() -> List[str]:
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def get_pin_seconds() -> int:
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+
+@contextmanager
+def primary():
+    """Блок, внутри которого чтение идет из основной базы."""
+    state = get_state()
+    if state is None:
+        yield
+        return
+    state.primary_depth += 1
+    try:
+        yield
+    finally:
+        state.primary_depth -= 1
+
+
+@contextmanager
+def side_write():
+    """Служебная запись в основную базу без закрепления пользователя.
+
+    Для записей, которые не видны автору запроса (постановка фоновой
+    задачи при чтении): cookie закрепления после них не нужен.
+    """
+    state = get_state()
+    if state is None:
+        yield
+        return
+    wrote = state.wrote
+    with primary():
+        try:
+            yield
+        finally:
+            state.wrote = wrote
+
+
+class ReplicaRouter:
+    """Роутер баз данных: чтение с реплик, запись в основную базу."""
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        """Случайная реплика или None (решение по умолчанию).
+
+        Основная база используется вне запроса, в представлениях с
+        записью, у закрепленных пользователей, внутри primary() и
+        после записи в том же запросе.
+        """
+        state = get_state()
+        replicas = get_replicas()
+        if (not replicas or state is None or not state.use_replica
+                or state.wrote or state.primary_depth
+                or model._meta.app_label not in getattr(
+                    settings, 'REPLICA_ROUTED_APPS', ROUTED_APPS)):
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        """Основная база для объектов с реплики, иначе None.
+
+        Любая запись закрепляет пользователя за основной базой. Для
+        объекта, прочитанного с реплики, основная база возвращается явно:
+        иначе Django запишет его обратно в реплику. В остальных случаях
+        решение остается за Django (база объекта или default).
+        """
+        state = get_state()
+        if state is not None:
+            state.wrote = True
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in get_replicas():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        """Связи между объектами основной базы и реплик разрешены."""
+        aliases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints) -> Optional[bool]:
+        """Реплики получают схему репликацией, а не миграциями."""
+        if db in get_replicas():
+            return False
+        return None
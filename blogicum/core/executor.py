@@ -0,0 +1,114 @@
+"""Асинхронные обертки представлений и ограниченный пул потоков.
+
+В Django 3.2 нет асинхронного ORM, а шаблоны синхронные, поэтому
+асинхронное представление выполняет синхронное представление-класс
+и рендер шаблона в пуле get_executor(). Под ASGI синхронное
+представление Django запускает через sync_to_async(thread_sensitive=
+True): у каждого запроса свой поток, который держится всё время
+ожидания базы. Пул ограничен settings.ASYNC_EXECUTOR_THREADS - это
+и предел одновременных соединений с базой; остальные запросы ждут
+в очереди пула, не занимая потоков, а цикл событий продолжает
+принимать соединения.
+
+Контекст (маршрутизация на реплики, счетчик SQL-запросов) передается
+в поток пула через contextvars. Соединения потоков пула живут как
+постоянные: close_old_connections() до и после вызова закрывает их
+по CONN_MAX_AGE и после ошибок, как в начале и конце запроса.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_max_workers() -> int:
+    return getattr(settings, 'ASYNC_EXECUTOR_THREADS', 8)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Пул потоков процесса; создается при первом обращении."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_max_workers(),
+                thread_name_prefix='blogicum-db')
+        return _executor
+
+
+def _call(func: Callable, args, kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func: Callable, *args, **kwargs):
+    """Выполняет func в пуле потоков с текущим контекстом."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(), partial(context.run, _call, func, args, kwargs))
+
+
+def render_view(view: Callable, request, *args, **kwargs):
+    """Вызывает представление и сразу рендерит TemplateResponse.
+
+    Ленивые QuerySet вычисляются при рендере, поэтому он должен идти
+    в том же потоке пула, а не в потоке обработчика Django. Время
+    рендера добавляется к замеру RequestMetricsMiddleware.
+    """
+    response = view(request, *args, **kwargs)
+    if hasattr(response, 'render') and callable(response.render):
+        start = time.perf_counter()
+        response.render()
+        if hasattr(request, '_metrics_template_ms'):
+            request._metrics_template_ms += (
+                time.perf_counter() - start) * 1000
+    return response
+
+
+def async_view(view_class: type, **initkwargs) -> Callable:
+    """Асинхронное представление поверх представления-класса.
+
+    Args:
+        view_class: Синхронное представление-класс.
+        **initkwargs: Аргументы view_class.as_view().
+
+    Returns:
+        Callable: Корутинная функция представления; view_class
+        сохраняется для middleware (ReplicaRoutingMiddleware).
+    """
+    view = view_class.as_view(**initkwargs)
+
+    async def wrapper(request, *args, **kwargs):
+        return await run_sync(render_view, view, request, *args, **kwargs)
+
+    wrapper.view_class = view_class
+    wrapper.view_initkwargs = initkwargs
+    wrapper.__doc__ = view_class.__doc__
+    wrapper.__module__ = view_class.__module__
+    wrapper.__name__ = wrapper.__qualname__ = view_class.__name__
+    return wrapper
+
+
+def as_view(view_class: type, **initkwargs) -> Callable:
+    """Асинхронное представление при settings.ASYNC_VIEWS, иначе обычное.
+
+    Под WSGI асинхронное представление выполнялось бы через
+    async_to_sync с отдельным циклом событий на запрос, поэтому
+    обертка включается только для ASGI (см. blogicum/asgi.py).
+    """
+    if getattr(settings, 'ASYNC_VIEWS', False):
+        return async_view(view_class, **initkwargs)
+    return view_class.as_view(**initkwargs)
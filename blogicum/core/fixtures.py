@@ -0,0 +1,256 @@
+"""Потоковая загрузка фикстур в формате dumpdata (JSON).
+
+В отличие от loaddata файл не читается в память целиком: объекты
+разбираются по одному, копятся по моделям и вставляются пакетами без
+вызова save() и сигналов.
+"""
+import json
+from collections import defaultdict
+from typing import Dict, Iterator, List, TextIO, Type
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+from django.utils import timezone
+
+READ_CHUNK = 1 << 16
+
+
+class FixtureError(Exception):
+    """Файл фикстуры поврежден или ссылается на неизвестную модель."""
+
+
+def iter_fixture(stream: TextIO,
+                 chunk_size: int = READ_CHUNK) -> Iterator[dict]:
+    """Поочередно отдает объекты JSON-массива верхнего уровня.
+
+    Args:
+        stream: Текстовый файл с JSON-массивом объектов.
+        chunk_size: Сколько символов читать за раз.
+
+    Raises:
+        FixtureError: Если файл не является JSON-массивом.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while not buffer:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith('['):
+        raise FixtureError('Ожидался JSON-массив объектов.')
+    position = 1
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if eof:
+                raise FixtureError(f'Поврежденный JSON: {error}')
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
+        position = end
+
+
+class FixtureImporter:
+    """Вставляет объекты фикстуры пакетами в порядке зависимостей.
+
+    Объекты группируются по моделям. Перед вставкой пакета модели
+    сбрасываются накопленные объекты моделей, на которые она ссылается
+    (пользователи -> категории и местоположения -> посты -> комментарии),
+    поэтому внешние ключи уже существуют при выполнении INSERT.
+
+    Вставка выполняется тем же запросом, что и bulk_create, но в режиме
+    raw, как в loaddata: значения полей auto_now_add берутся из файла,
+    а не заменяются текущим временем. Поля auto_now/auto_now_add,
+    которых нет в файле (выгрузка старой схемы), получают время начала
+    загрузки.
+
+    Attributes:
+        batch_size (int): Количество объектов в одном INSERT.
+        using (str): Алиас базы данных.
+        exclude (set): Метки моделей ('app.model'), которые пропускаются.
+        ignore_conflicts (bool): Пропускать строки с существующим pk.
+        counts (Dict[str, int]): Количество вставленных строк по моделям.
+    """
+
+    def __init__(self, batch_size: int = 5000, using: str = DEFAULT_DB_ALIAS,
+                 exclude=(), ignore_conflicts: bool = False):
+        self.batch_size = batch_size
+        self.using = using
+        self.exclude = {label.lower() for label in exclude}
+        self.ignore_conflicts = ignore_conflicts
+        self.counts = defaultdict(int)
+        self._pending: Dict[Type[Model], List[Model]] = defaultdict(list)
+        self._m2m: Dict[Type[Model], list] = defaultdict(list)
+        self._natural_keys = {}
+        self._models = set()
+        self._now = timezone.now()
+
+    def load(self, items) -> Dict[str, int]:
+        """Загружает все объекты, например из iter_fixture.
+
+        Returns:
+            Dict[str, int]: Количество строк по меткам моделей.
+        """
+        for item in items:
+            self.add(item)
+        self.flush()
+        return dict(self.counts)
+
+    def add(self, item: dict) -> None:
+        """Добавляет объект фикстуры в очередь своей модели."""
+        label = str(item.get('model', '')).lower()
+        if label in self.exclude:
+            return
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            raise FixtureError(f'Неизвестная модель: {label!r}.')
+        if model._meta.swapped:
+            raise FixtureError(
+                f'Модель {label} заменена на {model._meta.swapped}.')
+        instance, relations = self.build(model, item)
+        self._pending[model].append(instance)
+        for through, rows in relations:
+            self._m2m[through].extend(rows)
+        if len(self._pending[model]) >= self.batch_size:
+            self.flush_model(model)
+
+    def build(self, model: Type[Model], item: dict):
+        """Создает экземпляр модели и строки промежуточных таблиц M2M."""
+        opts = model._meta
+        data = {}
+        relations = []
+        if item.get('pk') is not None:
+            data[opts.pk.attname] = opts.pk.to_python(item['pk'])
+        for name, value in item.get('fields', {}).items():
+            field = opts.get_field(name)
+            if field.many_to_many:
+                if opts.pk.attname not in data:
+                    raise FixtureError(
+                        f'{opts.label}: для M2M-полей нужен pk объекта.')
+                relations.append(
+                    self.m2m_rows(field, data[opts.pk.attname], value))
+            elif field.remote_field and value is not None:
+                data[field.attname] = self.related_pk(
+                    field.remote_field.model, value,
+                    field.remote_field.field_name)
+            else:
+                data[field.attname] = field.to_python(value)
+        for field in opts.concrete_fields:
+            if field.attname not in data and (
+                    getattr(field, 'auto_now', False)
+                    or getattr(field, 'auto_now_add', False)):
+                data[field.attname] = self._now
+        return model(**data), relations
+
+    def related_pk(self, model: Type[Model], value, field_name: str = 'pk'):
+        """Значение ключа связанного объекта, в том числе по natural key."""
+        if field_name == 'pk':
+            target = model._meta.pk
+        else:
+            target = model._meta.get_field(field_name)
+        if not isinstance(value, list):
+            return target.to_python(value)
+        key = (model, field_name, tuple(value))
+        if key not in self._natural_keys:
+            manager = model._default_manager.db_manager(self.using)
+            try:
+                obj = manager.get_by_natural_key(*value)
+            except model.DoesNotExist:
+                raise FixtureError(
+                    f'{model._meta.label}: нет объекта {value!r}.')
+            self._natural_keys[key] = getattr(obj, target.attname)
+        return self._natural_keys[key]
+
+    def m2m_rows(self, field, pk, values: list):
+        through = field.remote_field.through
+        related = field.remote_field.model
+        keys = [fk for fk in through._meta.concrete_fields if fk.remote_field]
+        source = next(
+            fk for fk in keys if fk.remote_field.model is field.model)
+        target = next(
+            fk for fk in keys
+            if fk is not source and fk.remote_field.model is related)
+        rows = [
+            through(**{
+                source.attname: pk,
+                target.attname: self.related_pk(related, value),
+            })
+            for value in values
+        ]
+        return through, rows
+
+    def flush_model(self, model: Type[Model]) -> None:
+        """Вставляет очередь модели, предварительно - её зависимостей."""
+        objects = self._pending.pop(model, [])
+        for field in model._meta.concrete_fields:
+            if field.remote_field and self._pending.get(
+                    field.remote_field.model):
+                self.flush_model(field.remote_field.model)
+        if objects:
+            self.insert(model, objects)
+
+    def flush(self) -> None:
+        """Вставляет все накопленные объекты и строки M2M.
+
+        Как и loaddata, в конце проверяет внешние ключи загруженных
+        таблиц: ссылки на отсутствующие объекты дают IntegrityError.
+        """
+        while self._pending:
+            self.flush_model(next(iter(self._pending)))
+        for through, rows in self._m2m.items():
+            if rows:
+                self.insert(through, rows)
+        self._m2m.clear()
+        self.reset_sequences()
+        connections[self.using].check_constraints(
+            table_names=[model._meta.db_table for model in self._models])
+
+    def insert(self, model: Type[Model], objects: List[Model]) -> None:
+        """INSERT пакетами размера batch_size (не больше лимита СУБД)."""
+        connection = connections[self.using]
+        opts = model._meta
+        with_pk = [obj for obj in objects if obj.pk is not None]
+        without_pk = [obj for obj in objects if obj.pk is None]
+        manager = model._base_manager.db_manager(self.using)
+        for group, fields in (
+            (with_pk, opts.concrete_fields),
+            (without_pk, [field for field in opts.concrete_fields
+                          if field is not opts.auto_field]),
+        ):
+            if not group:
+                continue
+            size = min(
+                self.batch_size,
+                connection.ops.bulk_batch_size(fields, group) or len(group),
+            )
+            for start in range(0, len(group), max(size, 1)):
+                manager._insert(
+                    group[start:start + size], fields=fields, raw=True,
+                    using=self.using,
+                    ignore_conflicts=self.ignore_conflicts,
+                )
+        self.counts[opts.label_lower] += len(objects)
+        self._models.add(model)
+
+    def reset_sequences(self) -> None:
+        """Сдвигает последовательности pk после явной вставки pk."""
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), self._models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+from django.test import Client
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from blog.models import Category, Post
+from core import benchmark, executor, sqlite
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Нагрузочный прогон основных страниц внутри процесса.
+
+    Адреса по умолчанию подбираются по текущей базе (лента, вторая
+    страница ленты, категория, пост, профиль автора, поиск), поэтому
+    команду удобно запускать после generate_data. Для каждого адреса
+    выводятся p50/p95/p99 задержки в миллисекундах и пропускная
+    способность в запросах в секунду.
+
+    --mode asgi вызывает ASGI-приложение из concurrency корутин; при
+    DJANGO_ASYNC_VIEWS=1 ленты, пост и комментарии обрабатываются
+    асинхронными представлениями (core.executor). Сравнение WSGI и ASGI -
+    два прогона с одинаковым --concurrency.
+
+    С --writers во время замера каждого адреса фоновые потоки добавляют
+    комментарии к самому обсуждаемому посту через CommentCreateView;
+    в отчет добавляются записи в секунду и ошибки записи. Так видно,
+    насколько запись блокирует чтение с настройками SQLite и без них
+    (DJANGO_SQLITE_TUNING).
+    """
+
+    help = 'Замеряет задержки и пропускную способность страниц.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'urls', nargs='*',
+            help='Адреса для замера (по умолчанию - основные страницы).')
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Количество замеряемых запросов на адрес (100).')
+        parser.add_argument(
+            '--warmup', type=int, default=5,
+            help='Незамеряемые запросы перед прогоном (5).')
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help='Параллельные соединения: потоки (wsgi, client) '
+                 'или корутины (asgi) (1).')
+        parser.add_argument(
+            '--mode', choices=benchmark.MODES, default='wsgi',
+            help='wsgi/asgi - вызов WSGI/ASGI-приложения, '
+                 'client - тестовый клиент.')
+        parser.add_argument(
+            '--username', default=None,
+            help='Выполнять запросы от имени пользователя.')
+        parser.add_argument(
+            '--writers', type=int, default=0,
+            help='Потоки, добавляющие комментарии во время замера (0).')
+        parser.add_argument(
+            '--write-interval', type=float, default=0.0,
+            help='Пауза между комментариями одного потока, с (0).')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests должен быть > 0.')
+        if options['writers'] < 0:
+            raise CommandError('--writers должен быть >= 0.')
+        post = self.get_post()
+        routes = [(url, url) for url in options['urls']]
+        if not routes and post is not None:
+            routes = self.default_routes(post)
+        if not routes or (options['writers'] and post is None):
+            raise CommandError(
+                'Нет опубликованных постов: запустите generate_data.')
+        cookies = self.login(options['username'])
+        callers = {
+            'wsgi': benchmark.wsgi_caller,
+            'asgi': benchmark.asgi_caller,
+            'client': benchmark.client_caller,
+        }
+        make_caller = callers[options['mode']]
+        run_route = (benchmark.run_route_async if options['mode'] == 'asgi'
+                     else benchmark.run_route)
+
+        writers = options['writers']
+        if options['mode'] == 'asgi':
+            async_views = getattr(settings, 'ASYNC_VIEWS', False)
+            self.stdout.write(
+                f'ASGI: async views {"on" if async_views else "off"}, '
+                f'executor threads: {executor.get_max_workers()}')
+        self.write_header(writers)
+        for name, url in routes:
+            writer = self.get_writer(post, writers, options)
+            if writer:
+                writer.start()
+            try:
+                result = run_route(
+                    name, url, lambda: make_caller(cookies),
+                    requests=options['requests'],
+                    concurrency=options['concurrency'],
+                    warmup=options['warmup'],
+                )
+            finally:
+                if writer:
+                    writer.stop()
+            stats = result.summary()
+            row = (
+                f'{name:<24}{stats["requests"]:>7}{stats["errors"]:>6}'
+                f'{stats["p50"]:>10.1f}{stats["p95"]:>10.1f}'
+                f'{stats["p99"]:>10.1f}{stats["rps"]:>10.1f}'
+            )
+            if writer:
+                row += f'{writer.throughput:>8.1f}{writer.errors:>6}'
+            self.stdout.write(row)
+
+    def write_header(self, writers):
+        """Заголовок отчета; с --writers - режим журнала SQLite."""
+        header = (
+            f'{"route":<24}{"req":>7}{"err":>6}{"p50 ms":>10}'
+            f'{"p95 ms":>10}{"p99 ms":>10}{"rps":>10}'
+        )
+        if writers:
+            if connection.vendor == 'sqlite':
+                journal_mode = sqlite.read_pragmas(
+                    connection)['journal_mode']
+                self.stdout.write(f'SQLite journal_mode: {journal_mode}')
+            header += f'{"wps":>8}{"werr":>6}'
+        self.stdout.write(header)
+
+    def get_writer(self, post, threads, options):
+        """Фоновые потоки, добавляющие комментарии к посту, или None."""
+        if not threads:
+            return None
+        cookies = self.login(options['username'] or post.author.username)
+        url = reverse('blog:comments:add_comment',
+                      kwargs={'post_id': post.pk})
+        return benchmark.BackgroundWriter(
+            url, lambda: benchmark.comment_caller(cookies),
+            threads=threads, interval=options['write_interval'])
+
+    def login(self, username):
+        """Cookie сессии пользователя username."""
+        if not username:
+            return {}
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f'Пользователь {username} не найден.')
+        client = Client()
+        client.force_login(user)
+        return {key: morsel.value for key, morsel in client.cookies.items()}
+
+    def get_post(self):
+        """Самый обсуждаемый видимый пост или None."""
+        return Post.optimized.visible().order_by('-comment_count').first()
+
+    def default_routes(self, post):
+        """Типичные страницы с данными из текущей базы."""
+        routes = [
+            ('index', reverse('blog:index')),
+            ('index page 2', reverse('blog:index') + '?page=2'),
+            ('post_detail', reverse(
+                'blog:post_detail', kwargs={'post_id': post.pk})),
+            ('profile', reverse(
+                'blog:profile', kwargs={'username': post.author.username})),
+            ('search', reverse('search:index') + '?'
+             + urlencode({'q': post.title.split()[0]})),
+        ]
+        category = (
+            Category.objects.filter(is_published=True)
+            .annotate(last_post=Max('posts__pub_date'))
+            .order_by('-last_post').first()
+        )
+        if category is not None:
+            routes.insert(2, ('category_posts', reverse(
+                'blog:category_posts',
+                kwargs={'category_slug': category.slug})))
+        return routes
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from core import metrics
+
+
+class Command(BaseCommand):
+    """Показывает средние замеры запросов по представлениям."""
+
+    help = ('Выводит количество запросов, SQL и время по представлениям '
+            'за последние минуты (данные RequestMetricsMiddleware).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            default=None,
+            help='Окно в минутах (по умолчанию METRICS_WINDOW_MINUTES).'
+        )
+
+    def handle(self, *args, **options):
+        totals = metrics.read(options['minutes'])
+        if not totals:
+            self.stdout.write('Замеров пока нет.')
+            return
+        self.stdout.write(
+            f'{"view":<32}{"req":>8}{"avg ms":>10}{"sql":>8}'
+            f'{"db ms":>10}{"tpl ms":>10}{"KB":>10}'
+        )
+        rows = sorted(
+            totals.items(), key=lambda item: item[1]['total_ms'],
+            reverse=True)
+        for view_name, stats in rows:
+            count = stats['requests']
+            self.stdout.write(
+                f'{view_name:<32}{count:>8}'
+                f'{stats["total_ms"] / count:>10.1f}'
+                f'{stats["queries"] / count:>8.1f}'
+                f'{stats["db_ms"] / count:>10.1f}'
+                f'{stats["template_ms"] / count:>10.1f}'
+                f'{stats["response_bytes"] / count / 1024:>10.1f}'
+            )
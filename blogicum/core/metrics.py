@@ -0,0 +1,144 @@
+"""Поминутные счетчики замеров запросов по представлениям.
+
+Каждый процесс копит замеры в локальном буфере и раз в
+METRICS_FLUSH_INTERVAL секунд прибавляет их к счетчикам кеша
+METRICS_CACHE_ALIAS через cache.add() + cache.incr(): у каждого поля
+корзины свой ключ. Замеры не теряются, только если add() и incr()
+атомарны (memcached, redis, LocMemCache в пределах процесса); кеши,
+где incr() - это get() и set() (файловый, в базе), отклоняет проверка
+core.checks при запуске. С LocMemCache корзины у каждого процесса
+свои, и view_metrics видит только замеры своего процесса.
+Время хранится в целых микросекундах - memcached умеет incr только
+для целых чисел.
+
+Имена представлений регистрируются в каждой минуте отдельно:
+cache.add() метки минуты отсекает повторную регистрацию, а номер
+ячейки с именем выдает cache.incr() счетчика минуты. Метки, ячейки и
+счетчики живут столько же, сколько корзины, поэтому вытесненная
+запись скрывает представление не дольше чем на окно замеров.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Set
+
+from django.conf import settings
+from django.core.cache import caches
+
+FIELDS = ('requests', 'total_ms', 'queries', 'db_ms', 'template_ms',
+          'response_bytes')
+# Поля со временем в миллисекундах хранятся как целые микросекунды.
+SCALE = {'total_ms': 1000, 'db_ms': 1000, 'template_ms': 1000}
+
+_lock = threading.Lock()
+_buffer: Dict[str, Dict[str, float]] = defaultdict(
+    lambda: dict.fromkeys(FIELDS, 0))
+_last_flush = time.monotonic()
+
+
+def get_cache():
+    return caches[getattr(settings, 'METRICS_CACHE_ALIAS', 'default')]
+
+
+def _counter(minute: int, view_name: str, field: str) -> str:
+    return f'core:metrics:{minute}:{view_name}:{field}'
+
+
+def _increment(cache, key: str, delta: int, timeout: int) -> None:
+    if not delta:
+        return
+    cache.add(key, 0, timeout)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Ключ вытеснен между add() и incr().
+        cache.add(key, delta, timeout)
+
+
+def _views_key(minute: int) -> str:
+    return f'core:metrics:{minute}:views'
+
+
+def _register(cache, minute: int, view_name: str, timeout: int) -> None:
+    """Записывает имя представления в свободную ячейку минуты."""
+    if cache.add(f'core:metrics:{minute}:view:{view_name}', True, timeout):
+        key = _views_key(minute)
+        cache.add(key, 0, timeout)
+        slot = cache.incr(key)
+        cache.set(f'{key}:{slot}', view_name, timeout)
+
+
+def get_view_names(cache, minutes: range) -> Set[str]:
+    """Представления, замеры которых попали в минуты minutes."""
+    counts = cache.get_many([_views_key(minute) for minute in minutes])
+    slots = [
+        f'{key}:{slot}'
+        for key, count in counts.items() for slot in range(1, count + 1)
+    ]
+    return set(cache.get_many(slots).values())
+
+
+def record(view_name: str, **values: float) -> None:
+    """Добавляет замеры одного запроса в локальный буфер процесса.
+
+    Буфер сбрасывается в кеш не чаще settings.METRICS_FLUSH_INTERVAL
+    секунд, чтобы не писать в кеш на каждом запросе.
+    """
+    with _lock:
+        stats = _buffer[view_name]
+        stats['requests'] += 1
+        for field, value in values.items():
+            stats[field] += value
+    if time.monotonic() - _last_flush >= getattr(
+            settings, 'METRICS_FLUSH_INTERVAL', 10):
+        flush()
+
+
+def flush() -> None:
+    """Переносит накопленные замеры в поминутные корзины кеша."""
+    global _last_flush
+    with _lock:
+        pending = dict(_buffer)
+        _buffer.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    cache = get_cache()
+    minute = int(time.time() // 60)
+    timeout = getattr(settings, 'METRICS_WINDOW_MINUTES', 15) * 60 + 60
+    for view_name, stats in pending.items():
+        _register(cache, minute, view_name, timeout)
+        for field in FIELDS:
+            _increment(
+                cache, _counter(minute, view_name, field),
+                round(stats[field] * SCALE.get(field, 1)), timeout)
+
+
+def read(minutes: int = None) -> Dict[str, Dict[str, float]]:
+    """Суммирует замеры по представлениям за последние minutes минут.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Суммы полей FIELDS по имени
+            представления.
+    """
+    if minutes is None:
+        minutes = getattr(settings, 'METRICS_WINDOW_MINUTES', 15)
+    cache = get_cache()
+    current = int(time.time() // 60)
+    totals = {}
+    window = range(current - minutes + 1, current + 1)
+    for view_name in get_view_names(cache, window):
+        stored = cache.get_many([
+            _counter(minute, view_name, field)
+            for minute in window for field in FIELDS
+        ])
+        if not stored:
+            continue
+        totals[view_name] = {}
+        for field in FIELDS:
+            total = sum(stored.get(_counter(minute, view_name, field), 0)
+                        for minute in window)
+            if field in SCALE:
+                total /= SCALE[field]
+            totals[view_name][field] = total
+    return totals
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from core import db_router, metrics
+
+
+class QueryTracker:
+    """Обертка выполнения SQL, считающая запросы и их суммарное время."""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.queries += 1
+
+
+_tracker: ContextVar[Optional[QueryTracker]] = ContextVar(
+    'query_tracker', default=None)
+
+
+def track_queries(execute, sql, params, many, context):
+    """Постоянная обертка соединения: считает SQL в текущий QueryTracker.
+
+    Трекер запроса берется из contextvars, поэтому учитываются и
+    запросы из других потоков: sync_to_async под ASGI и пула
+    core.executor.
+    """
+    tracker = _tracker.get()
+    if tracker is None:
+        return execute(sql, params, many, context)
+    return tracker(execute, sql, params, many, context)
+
+
+def install_query_tracking(sender, connection, **kwargs):
+    """Обработчик connection_created: подключает track_queries."""
+    if track_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, track_queries)
+
+
+class AsyncCapableMiddleware:
+    """База для middleware, работающих и под WSGI, и под ASGI.
+
+    Под ASGI Django передает корутину get_response, и middleware
+    само становится корутинной функцией (как MiddlewareMixin), чтобы
+    асинхронное представление не вызывалось через async_to_sync из
+    отдельного потока. Потомки задают before() и after().
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.before(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(state)
+        return self.after(request, response, state)
+
+    async def __acall__(self, request):
+        state = self.before(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(state)
+        return self.after(request, response, state)
+
+    def before(self, request):
+        """Выполняется до представления; результат передается дальше."""
+        raise NotImplementedError
+
+    def finish(self, state) -> None:
+        """Выполняется после представления, в том числе при ошибке."""
+
+    def after(self, request, response, state):
+        return response
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """Middleware для замеров стоимости запроса в production.
+
+    Для каждого запроса считает количество SQL-запросов, время в базе,
+    время рендера TemplateResponse, общее время и размер ответа.
+    Значения отдаются в заголовке Server-Timing и накапливаются по имени
+    представления (blog:index, blog:post_detail, ...) в core.metrics;
+    посмотреть их можно командой view_metrics.
+
+    Работает без DEBUG, так как не использует connection.queries.
+    Запросы считает track_queries, подключенная ко всем соединениям.
+    """
+
+    def before(self, request):
+        tracker = QueryTracker()
+        request._metrics_template_ms = 0.0
+        return tracker, _tracker.set(tracker), time.perf_counter()
+
+    def finish(self, state) -> None:
+        _tracker.reset(state[1])
+
+    def after(self, request, response, state):
+        tracker, _, start = state
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = tracker.duration * 1000
+        template_ms = request._metrics_template_ms
+        size = 0 if response.streaming else len(response.content)
+
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={db_ms:.1f};desc="{tracker.queries} queries"',
+            f'tpl;dur={template_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ))
+        metrics.record(
+            self.get_view_name(request),
+            total_ms=total_ms,
+            queries=tracker.queries,
+            db_ms=db_ms,
+            template_ms=template_ms,
+            response_bytes=size,
+        )
+        return response
+
+    @staticmethod
+    def get_view_name(request) -> str:
+        """Имя представления по app_name, а не по namespace подключения."""
+        match = request.resolver_match
+        if match is None or not match.url_name:
+            return '<unresolved>'
+        return ':'.join(match.app_names + [match.url_name])
+
+    def process_template_response(self, request, response):
+        """Замеряет время рендера TemplateResponse."""
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_template_ms += (
+                time.perf_counter() - start) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """Middleware, включающее чтение с реплик (см. core.db_router).
+
+    Чтение с реплики разрешается только для GET/HEAD-запросов
+    к представлениям с ReplicaReadMixin и только если у пользователя нет
+    cookie закрепления. После запроса с записью в базу cookie ставится
+    на settings.REPLICA_PIN_SECONDS секунд (read-your-writes).
+
+    Должно стоять до SessionMiddleware, чтобы сохранение сессии тоже
+    считалось записью.
+    """
+
+    def before(self, request):
+        token = db_router.begin()
+        return token, db_router.get_state()
+
+    def finish(self, state) -> None:
+        db_router.end(state[0])
+
+    def after(self, request, response, state):
+        routing = state[1]
+        pin_seconds = db_router.get_pin_seconds()
+        if routing.wrote and db_router.get_replicas() and pin_seconds:
+            response.set_cookie(
+                db_router.PIN_COOKIE, '1', max_age=pin_seconds,
+                httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (request.method in ('GET', 'HEAD')
+                and getattr(view_class, 'read_from_replica', False)
+                and db_router.PIN_COOKIE not in request.COOKIES):
+            db_router.get_state().use_replica = True
@@ -1,9 +1,14 @@
-from typing import Optional
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.db.models import QuerySet
 from django.db import models
 
@@ -105,3 +110,66 @@ class CachedObjectMixin:
     def dispatch(self, request, *args, **kwargs):
         self.object = self.get_object()
         return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaReadMixin:
+    """Миксин для представлений, которые могут читать с реплики.
+
+    Учитывается ReplicaRoutingMiddleware только для GET/HEAD-запросов
+    (см. core.db_router).
+
+    Attributes:
+        read_from_replica (bool): Разрешить чтение с реплики.
+    """
+
+    read_from_replica = True
+
+
+class ConditionalGetMixin:
+    """Миксин для условных GET-запросов (ETag / Last-Modified).
+
+    Валидаторы страницы считаются в get_validators до основной выборки.
+    Если If-None-Match или If-Modified-Since клиента совпадает с ними,
+    отдается 304 Not Modified без выборки и рендера шаблона.
+
+    ETag слабый (W/): страница с тем же содержимым может отличаться
+    маской CSRF-токена. В него входят путь с параметрами, пользователь
+    и CSRF-cookie, поэтому разные зрители не получают чужую страницу.
+    """
+
+    def get_validators(self) -> Tuple[Optional[list], Optional[datetime]]:
+        """Части ETag и время последнего изменения страницы.
+
+        Returns:
+            Tuple[Optional[list], Optional[datetime]]: Значения, от которых
+                зависит страница, и время изменения для Last-Modified.
+                (None, None) - запрос обрабатывается без проверок.
+        """
+        return None, None
+
+    def make_etag(self, parts: list) -> str:
+        request = self.request
+        key = repr([
+            request.get_full_path(),
+            request.user.pk,
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+            *parts,
+        ])
+        return f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+
+    def get(self, request, *args, **kwargs):
+        """Отдает 304 по валидаторам или полную страницу с ними."""
+        parts, last_modified = self.get_validators()
+        etag = self.make_etag(parts) if parts is not None else None
+        timestamp = (
+            int(last_modified.timestamp()) if last_modified else None)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if etag is not None:
+                response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
@@ -0,0 +1,208 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Model, Q
+from django.db.models.query import QuerySet
+from django.http import Http404
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+class InvalidCursor(Exception):
+    """Курсор не удалось разобрать."""
+
+
+def pack_cursor(values: list) -> str:
+    """Упаковывает значения, сериализуемые в JSON, в строку для URL.
+
+    Returns:
+        str: Курсор в base64 без завершающих '='.
+    """
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def unpack_cursor(cursor: str) -> list:
+    """Распаковывает курсор, созданный pack_cursor.
+
+    Raises:
+        InvalidCursor: Если курсор поврежден.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values
+
+
+def encode_cursor(direction: str, value: datetime, pk: int) -> str:
+    """Упаковывает позицию в выборке в непрозрачную строку для URL.
+
+    Args:
+        direction: Направление перехода (CURSOR_NEXT или CURSOR_PREVIOUS).
+        value: Дата граничного объекта (например, pub_date поста).
+        pk: Первичный ключ граничного объекта.
+
+    Returns:
+        str: Курсор в base64 без завершающих '='.
+    """
+    return pack_cursor([direction, value.isoformat(), pk])
+
+
+def decode_cursor(cursor: str) -> Tuple[str, datetime, int]:
+    """Распаковывает курсор, созданный encode_cursor.
+
+    Args:
+        cursor: Строка курсора из GET-параметра.
+
+    Returns:
+        Tuple[str, datetime, int]: Направление, дата и pk.
+
+    Raises:
+        InvalidCursor: Если курсор поврежден или подделан.
+    """
+    try:
+        direction, value, pk = unpack_cursor(cursor)
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(value), int(pk)
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+
+
+class CursorPage:
+    """Страница курсорной пагинации.
+
+    Повторяет ту часть интерфейса django.core.paginator.Page, которая
+    нужна шаблонам (итерация, has_next, has_previous), но вместо номеров
+    страниц отдает курсоры соседних страниц.
+
+    Attributes:
+        object_list (List[Model]): Объекты страницы.
+        next_cursor (Optional[str]): Курсор следующей страницы.
+        previous_cursor (Optional[str]): Курсор предыдущей страницы.
+        is_cursor (bool): Признак курсорной страницы для шаблонов.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list: List[Model],
+                 next_cursor: Optional[str],
+                 previous_cursor: Optional[str],
+                 paginator: 'CursorPaginator'):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.paginator = paginator
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинатор по паре (поле даты, id).
+
+    В отличие от django.core.paginator.Paginator не выполняет COUNT(*)
+    и не использует OFFSET: каждая страница выбирается условием
+    по границе предыдущей, поэтому её стоимость не зависит от глубины.
+    По умолчанию порядок совпадает с Post.Meta.ordering ('-pub_date'),
+    id используется для однозначности при одинаковой дате.
+
+    Attributes:
+        queryset (QuerySet): Исходная выборка.
+        per_page (int): Количество объектов на странице.
+        date_field (str): Поле даты, по которому упорядочена выборка.
+        descending (bool): Порядок от новых к старым.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int,
+                 date_field: str = 'pub_date', descending: bool = True):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.date_field = date_field
+        self.descending = descending
+
+    def _cursor_for(self, direction: str, obj: Model) -> str:
+        return encode_cursor(
+            direction, getattr(obj, self.date_field), obj.pk)
+
+    def _after(self, value: datetime, pk: int, forward: bool) -> Q:
+        """Условие «строго после границы» в выбранном направлении."""
+        lookup = 'lt' if forward == self.descending else 'gt'
+        return (
+            Q(**{f'{self.date_field}__{lookup}': value})
+            | Q(**{self.date_field: value, f'pk__{lookup}': pk})
+        )
+
+    def page(self, cursor: Optional[str] = None) -> CursorPage:
+        """Возвращает страницу, начинающуюся от курсора.
+
+        Args:
+            cursor: Курсор из GET-параметра или None для первой страницы.
+
+        Returns:
+            CursorPage: Объекты страницы и курсоры соседних страниц.
+
+        Raises:
+            InvalidCursor: Если курсор не удалось разобрать.
+        """
+        boundary = None
+        direction = CURSOR_NEXT
+        if cursor:
+            direction, value, pk = decode_cursor(cursor)
+            boundary = (value, pk)
+        forward = direction == CURSOR_NEXT
+
+        prefix = '-' if forward == self.descending else ''
+        queryset = self.queryset.order_by(
+            f'{prefix}{self.date_field}', f'{prefix}pk')
+        if boundary:
+            queryset = queryset.filter(self._after(*boundary, forward))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or not forward:
+                next_cursor = self._cursor_for(CURSOR_NEXT, rows[-1])
+            if boundary and (has_more or forward):
+                previous_cursor = self._cursor_for(CURSOR_PREVIOUS, rows[0])
+        return CursorPage(rows, next_cursor, previous_cursor, self)
+
+
+def cursor_page_or_404(paginator: CursorPaginator,
+                       cursor: Optional[str]) -> CursorPage:
+    """Возвращает страницу по курсору или 404 для неверного курсора."""
+    try:
+        return paginator.page(cursor)
+    except InvalidCursor:
+        raise Http404('Неверный курсор пагинации.')
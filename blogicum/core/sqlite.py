@@ -0,0 +1,66 @@
+"""Настройка соединений SQLite для параллельной работы.
+
+По умолчанию SQLite ведет журнал отката (journal_mode=DELETE): запись
+комментария блокирует весь файл, и читатели ждут её окончания. При
+SQLITE_TUNING каждое новое соединение переводится в режим WAL, в котором
+читатели не блокируют писателя и наоборот, а конкурирующие писатели
+ждут busy_timeout миллисекунд вместо немедленной ошибки
+«database is locked».
+
+Значения PRAGMA можно переопределить словарем settings.SQLITE_PRAGMAS,
+None в нем отключает соответствующую настройку.
+"""
+from typing import Dict
+
+from django.conf import settings
+
+PRAGMAS = {
+    # Читатели не блокируются писателем, писатель - читателями.
+    'journal_mode': 'WAL',
+    # В режиме WAL fsync только при checkpoint: транзакция не теряет
+    # целостности при сбое, но последние коммиты могут откатиться.
+    'synchronous': 'NORMAL',
+    # Ожидание блокировки записи, мс.
+    'busy_timeout': 5000,
+    # Чтение файла базы через отображение в память, байты.
+    'mmap_size': 256 * 1024 * 1024,
+    # Кеш страниц соединения; отрицательное значение - в КиБ.
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'SQLITE_TUNING', False)
+
+
+def get_pragmas() -> Dict[str, object]:
+    """PRAGMA по умолчанию с учетом settings.SQLITE_PRAGMAS."""
+    pragmas = dict(PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {}))
+    return {name: value for name, value in pragmas.items()
+            if value is not None}
+
+
+def configure_connection(sender, connection, **kwargs) -> None:
+    """Обработчик connection_created: применяет PRAGMA к соединению SQLite.
+
+    Args:
+        sender: Класс обертки соединения.
+        connection: Обертка нового соединения (DatabaseWrapper).
+    """
+    if connection.vendor != 'sqlite' or not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def read_pragmas(connection) -> Dict[str, object]:
+    """Текущие значения настраиваемых PRAGMA соединения."""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in PRAGMAS:
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
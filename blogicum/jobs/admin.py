@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Структура интерфейса фоновых задач для админ панели."""
+
+    list_display = ('pk', 'name', 'status', 'attempts',
+                    'run_after', 'updated_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name',)
+    list_display_links = ('name',)
+    readonly_fields = ('created_at', 'updated_at')
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    """Запускает исполнитель фоновых задач."""
+
+    help = 'Выполняет фоновые задачи из таблицы jobs_job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=None,
+            help='Размер пула потоков (по умолчанию JOBS_WORKER_THREADS).'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        worker = Worker(threads=options['threads'])
+        if not options['once']:
+            self.stdout.write('Воркер запущен, Ctrl+C для остановки.')
+            try:
+                worker.run_forever()
+            except KeyboardInterrupt:
+                worker.stop()
+            return
+        worker.requeue_stale()
+        total = 0
+        while True:
+            done = worker.run_pending()
+            if not done:
+                break
+            total += done
+        self.stdout.write(self.style.SUCCESS(f'Выполнено задач: {total}.'))
@@ -0,0 +1,58 @@
+from django.db import models
+
+
+class Job(models.Model):
+    """Фоновая задача, сохраненная в базе данных.
+
+    Задачи переживают перезапуск процесса: воркер выбирает строки
+    в статусе PENDING, у которых наступило время run_after.
+
+    Attributes:
+        name (CharField): Имя зарегистрированной задачи.
+        kwargs (JSONField): Именованные аргументы задачи.
+        status (CharField): Состояние задачи.
+        attempts (PositiveIntegerField): Количество выполненных попыток.
+        last_error (TextField): Текст последней ошибки.
+        run_after (DateTimeField): Не запускать раньше этого времени.
+        created_at (DateTimeField): Дата постановки в очередь.
+        updated_at (DateTimeField): Дата последнего изменения статуса.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=128)
+    kwargs = models.JSONField('Аргументы', default=dict, blank=True)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    attempts = models.PositiveIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    run_after = models.DateTimeField('Запустить не раньше')
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'),
+                name='job_status_run_after_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.pk} - {self.name} ({self.status})'
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from jobs.models import Job
+
+_tasks: Dict[str, Callable] = {}
+
+
+class UnknownTask(LookupError):
+    """Задача с таким именем не зарегистрирована."""
+
+
+def task(name: str) -> Callable:
+    """Декоратор регистрации функции как фоновой задачи.
+
+    Функция принимает только именованные аргументы, сериализуемые в JSON.
+    Модули tasks.py приложений импортируются автоматически при запуске.
+
+    Args:
+        name: Уникальное имя задачи, под которым она хранится в Job.name.
+
+    Returns:
+        Callable: Декоратор, возвращающий исходную функцию.
+    """
+    def decorator(func: Callable) -> Callable:
+        _tasks[name] = func
+        func.task_name = name
+        return func
+    return decorator
+
+
+def get_task(name: str) -> Callable:
+    """Возвращает функцию задачи по имени.
+
+    Raises:
+        UnknownTask: Если задача не зарегистрирована.
+    """
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTask(name)
+
+
+def enqueue(name: str, delay: int = 0, **kwargs) -> Optional[Job]:
+    """Ставит задачу в очередь.
+
+    При settings.JOBS_ALWAYS_EAGER задача выполняется сразу в текущем
+    потоке, что удобно в тестах.
+
+    Args:
+        name: Имя зарегистрированной задачи.
+        delay: Через сколько секунд задачу можно запускать.
+        **kwargs: Именованные аргументы задачи.
+
+    Returns:
+        Optional[Job]: Созданная запись или None при немедленном запуске.
+
+    Raises:
+        UnknownTask: Если задача не зарегистрирована.
+    """
+    func = get_task(name)
+    if getattr(settings, 'JOBS_ALWAYS_EAGER', False):
+        func(**kwargs)
+        return None
+    return Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        run_after=timezone.now() + timedelta(seconds=delay)
+    )
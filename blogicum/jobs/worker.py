@@ -0,0 +1,110 @@
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Исполнитель фоновых задач из таблицы Job.
+
+    Задачи захватываются условным UPDATE по статусу, поэтому несколько
+    процессов-воркеров могут работать с одной таблицей без блокировок
+    строк. Упавшая задача возвращается в очередь с экспоненциальной
+    задержкой, пока не исчерпает settings.JOBS_MAX_ATTEMPTS попыток.
+
+    Attributes:
+        threads (int): Размер пула потоков, 0 - выполнять в текущем потоке.
+        batch_size (int): Сколько задач захватывать за один проход.
+    """
+
+    def __init__(self, threads: int = None, batch_size: int = None):
+        self.threads = (
+            settings.JOBS_WORKER_THREADS if threads is None else threads)
+        self.batch_size = batch_size or max(self.threads, 1) * 2
+        self.max_attempts = getattr(settings, 'JOBS_MAX_ATTEMPTS', 3)
+        self.stale_after = getattr(settings, 'JOBS_STALE_AFTER', 600)
+        self.poll_interval = getattr(settings, 'JOBS_POLL_INTERVAL', 1)
+        self._stop = threading.Event()
+
+    def requeue_stale(self) -> int:
+        """Возвращает в очередь задачи, зависшие после падения воркера."""
+        border = timezone.now() - timedelta(seconds=self.stale_after)
+        return Job.objects.filter(
+            status=Job.RUNNING, updated_at__lt=border
+        ).update(status=Job.PENDING, updated_at=timezone.now())
+
+    def claim(self) -> List[int]:
+        """Захватывает готовые к запуску задачи.
+
+        Returns:
+            List[int]: Первичные ключи захваченных задач.
+        """
+        candidates = Job.objects.filter(
+            status=Job.PENDING, run_after__lte=timezone.now()
+        ).values_list('pk', flat=True)[:self.batch_size]
+        claimed = []
+        for pk in candidates:
+            if Job.objects.filter(pk=pk, status=Job.PENDING).update(
+                    status=Job.RUNNING,
+                    attempts=F('attempts') + 1,
+                    updated_at=timezone.now()):
+                claimed.append(pk)
+        return claimed
+
+    def execute(self, pk: int) -> None:
+        """Выполняет задачу и сохраняет результат."""
+        close_old_connections()
+        job = Job.objects.get(pk=pk)
+        try:
+            get_task(job.name)(**job.kwargs)
+        except Exception:
+            logger.exception('Задача %s завершилась ошибкой', job)
+            job.last_error = traceback.format_exc()
+            if job.attempts >= self.max_attempts:
+                job.status = Job.FAILED
+            else:
+                job.status = Job.PENDING
+                job.run_after = timezone.now() + timedelta(
+                    seconds=2 ** job.attempts)
+        else:
+            job.status = Job.DONE
+        job.save(update_fields=(
+            'status', 'last_error', 'run_after', 'updated_at'))
+        close_old_connections()
+
+    def run_pending(self) -> int:
+        """Выполняет одну порцию готовых задач.
+
+        Returns:
+            int: Количество выполненных задач.
+        """
+        claimed = self.claim()
+        if not self.threads:
+            for pk in claimed:
+                self.execute(pk)
+        else:
+            with ThreadPoolExecutor(self.threads) as executor:
+                list(executor.map(self.execute, claimed))
+        return len(claimed)
+
+    def run_forever(self) -> None:
+        """Выполняет задачи, пока не будет вызван stop()."""
+        self.requeue_stale()
+        while not self._stop.is_set():
+            if not self.run_pending():
+                self._stop.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -3,6 +3,8 @@ from typing import Optional
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
+from blog import sitemaps
+
 
 def page_not_found_view(
         request: HttpRequest,
@@ -66,3 +68,24 @@ def csrf_failure_view(
         HttpResponse: Рендер шаблона 403csrf.html с HTTP-статусом 403.
     """
     return render(request, 'pages/403csrf.html', status=403)
+
+
+def robots_txt(request: HttpRequest) -> HttpResponse:
+    """robots.txt со ссылкой на индекс карты сайта.
+
+    Индекс лежит в каталоге SITEMAP_ROOT по адресу SITEMAP_URL, а не
+    в корне сайта, поэтому поисковики принимают его адреса страниц
+    только по ссылке из robots.txt.
+
+    Args:
+        request: Объект HTTP-запроса.
+
+    Returns:
+        HttpResponse: Текст robots.txt.
+    """
+    lines = [
+        'User-agent: *',
+        'Disallow: /admin/',
+        f'Sitemap: {sitemaps.index_url()}',
+    ]
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain')
@@ -0,0 +1,176 @@
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.db.models.query import QuerySet
+
+from core.paginators import (CURSOR_NEXT, CursorPage, InvalidCursor,
+                             pack_cursor, unpack_cursor)
+from search.models import SearchTerm
+
+TOKEN_RE = re.compile(r'\w+')
+MAX_TERM_LENGTH = 64
+TITLE_WEIGHT = 2
+FTS_TABLE = 'search_post_fts'
+
+Hit = Tuple[float, int]
+
+_fts_available = {}
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбивает текст на нормализованные слова."""
+    return [
+        token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(text.lower())
+    ]
+
+
+class FTS5Backend:
+    """Индекс на виртуальной таблице SQLite FTS5.
+
+    Ранжирование - bm25 с удвоенным весом заголовка; чем меньше
+    значение, тем выше пост в выдаче.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        """Проверяет, создана ли таблица индекса (результат кешируется)."""
+        if connection.vendor != 'sqlite':
+            return False
+        name = connection.settings_dict['NAME']
+        if name not in _fts_available:
+            _fts_available[name] = (
+                FTS_TABLE in connection.introspection.table_names())
+        return _fts_available[name]
+
+    def index(self, post) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [post.pk, post.title, post.text]
+            )
+
+    def remove(self, pk: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    def search(self, query: str, after: Optional[Hit],
+               limit: int) -> List[Hit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = ' '.join(f'"{token}"' for token in tokens)
+        sql = (
+            'SELECT score, rowid FROM ('
+            f'SELECT rowid, bm25({FTS_TABLE}, {TITLE_WEIGHT}.0, 1.0) '
+            f'AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)'
+        )
+        params = [match]
+        if after:
+            sql += ' WHERE score > %s OR (score = %s AND rowid > %s)'
+            params += [after[0], after[0], after[1]]
+        sql += ' ORDER BY score, rowid LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(score, pk) for score, pk in cursor.fetchall()]
+
+
+class PythonBackend:
+    """Обратный индекс в таблице SearchTerm для любых СУБД.
+
+    Пост находится, если содержит все слова запроса; вес - сумма
+    вхождений (заголовок с коэффициентом TITLE_WEIGHT). Оценка хранится
+    со знаком минус, чтобы порядок совпадал с FTS5Backend.
+    """
+
+    def index(self, post) -> None:
+        weights = Counter(tokenize(post.text))
+        for token in tokenize(post.title):
+            weights[token] += TITLE_WEIGHT
+        SearchTerm.objects.filter(post_id=post.pk).delete()
+        SearchTerm.objects.bulk_create(
+            SearchTerm(term=term, post_id=post.pk, weight=weight)
+            for term, weight in weights.items()
+        )
+
+    def remove(self, pk: int) -> None:
+        SearchTerm.objects.filter(post_id=pk).delete()
+
+    def clear(self) -> None:
+        SearchTerm.objects.all().delete()
+
+    def search(self, query: str, after: Optional[Hit],
+               limit: int) -> List[Hit]:
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        hits = (
+            SearchTerm.objects.filter(term__in=terms)
+            .values('post_id')
+            .annotate(score=-Sum('weight'), matched=Count('term'))
+            .filter(matched=len(terms))
+        )
+        if after:
+            hits = hits.filter(
+                Q(score__gt=after[0])
+                | Q(score=after[0], post_id__gt=after[1])
+            )
+        hits = hits.order_by('score', 'post_id')[:limit]
+        return [(hit['score'], hit['post_id']) for hit in hits]
+
+
+def get_backend():
+    """Возвращает бэкенд по settings.SEARCH_BACKEND.
+
+    'auto' выбирает FTS5, если таблица индекса создана миграцией.
+    """
+    name = getattr(settings, 'SEARCH_BACKEND', 'auto')
+    if name == 'fts5' or (name == 'auto' and FTS5Backend.is_available()):
+        return FTS5Backend()
+    return PythonBackend()
+
+
+def search_page(query: str, queryset: QuerySet, per_page: int,
+                cursor: Optional[str] = None) -> CursorPage:
+    """Страница результатов поиска по queryset в порядке релевантности.
+
+    Найденные индексом посты дополнительно фильтруются queryset
+    (например, Post.optimized.visible()), поэтому правила видимости
+    совпадают с лентой. Пагинация - keyset по (оценка, id).
+
+    Raises:
+        InvalidCursor: Если курсор поврежден.
+    """
+    after = None
+    if cursor:
+        try:
+            _, score, pk = unpack_cursor(cursor)
+            after = (float(score), int(pk))
+        except (TypeError, ValueError):
+            raise InvalidCursor(cursor)
+    backend = get_backend()
+    rows = []
+    while len(rows) <= per_page:
+        hits = backend.search(query, after, per_page * 2)
+        if not hits:
+            break
+        posts = queryset.in_bulk([pk for _, pk in hits])
+        rows += [(hit, posts[hit[1]]) for hit in hits if hit[1] in posts]
+        after = hits[-1]
+    next_cursor = None
+    if len(rows) > per_page:
+        score, pk = rows[per_page - 1][0]
+        next_cursor = pack_cursor([CURSOR_NEXT, score, pk])
+    return CursorPage(
+        [post for _, post in rows[:per_page]], next_cursor, None, None)
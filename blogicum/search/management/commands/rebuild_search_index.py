@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from search.backends import get_backend
+
+
+class Command(BaseCommand):
+    """Полностью перестраивает поисковый индекс постов."""
+
+    help = 'Перестраивает поисковый индекс по заголовкам и текстам постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Сколько постов читать из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        posts = Post.objects.only('title', 'text').order_by('pk')
+        total = 0
+        with transaction.atomic():
+            backend.clear()
+            for post in posts.iterator(chunk_size=options['chunk_size']):
+                backend.index(post)
+                total += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{type(backend).__name__}: проиндексировано постов: {total}.'))
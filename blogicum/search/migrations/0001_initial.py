@@ -0,0 +1,56 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:35
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE search_post_fts USING fts5("
+            "title, text, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite собран без FTS5: будет использован PythonBackend.
+        return
+    schema_editor.execute(
+        'INSERT INTO search_post_fts (rowid, title, text) '
+        'SELECT id, title, text FROM blog_post'
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS search_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('blog', '0006_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Слово')),
+                ('weight', models.PositiveIntegerField(verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'слово индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['term', 'post'], name='search_term_post_idx'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
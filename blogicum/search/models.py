@@ -0,0 +1,35 @@
+from django.db import models
+
+from blog.models import Post
+
+
+class SearchTerm(models.Model):
+    """Запись обратного индекса: слово и вес его вхождений в пост.
+
+    Используется, когда база данных не поддерживает SQLite FTS5.
+
+    Attributes:
+        term (CharField): Нормализованное слово.
+        post (ForeignKey): Пост, в котором встречается слово.
+        weight (PositiveIntegerField): Вес слова в посте (вхождения
+            в заголовок считаются с коэффициентом TITLE_WEIGHT).
+    """
+
+    term = models.CharField('Слово', max_length=64)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+        verbose_name='Пост'
+    )
+    weight = models.PositiveIntegerField('Вес')
+
+    class Meta:
+        verbose_name = 'слово индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        indexes = (
+            models.Index(fields=('term', 'post'), name='search_term_post_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.term} - {self.post_id}'
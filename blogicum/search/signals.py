@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.models import Post
+from search.backends import get_backend
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    """Обновляет пост в поисковом индексе."""
+    get_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post(sender, instance, **kwargs):
+    """Удаляет пост из поискового индекса."""
+    get_backend().remove(instance.pk)
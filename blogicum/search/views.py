@@ -0,0 +1,50 @@
+from django.http import Http404
+from django.views.generic import TemplateView
+
+from blog.models import Post
+from core.constants import CURSOR_QUERY_PARAM, POSTS_IN_PAGE
+from core.paginators import InvalidCursor
+from search.backends import search_page
+
+
+class SearchView(TemplateView):
+    """Представление для полнотекстового поиска по опубликованным постам.
+
+    Результаты упорядочены по релевантности и листаются курсором.
+
+    Attributes:
+        template_name (str): Путь к шаблону страницы.
+        paginate_by (int): Количество постов на странице.
+    """
+
+    template_name = 'search/results.html'
+    paginate_by = POSTS_IN_PAGE
+
+    def get_context_data(self, **kwargs):
+        """Добавляет запрос и страницу результатов в контекст.
+
+        Returns:
+            Dict[str, Any]: Контекст данных для шаблона.
+
+        Raises:
+            Http404: Если курсор поврежден.
+        """
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        context['query'] = query
+        if not query:
+            return context
+        try:
+            page = search_page(
+                query,
+                Post.optimized.visible(),
+                self.paginate_by,
+                self.request.GET.get(CURSOR_QUERY_PARAM)
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор пагинации.')
+        context['page_obj'] = page
+        context['query_string'] = self.request.GET.copy()
+        context['query_string'].pop(CURSOR_QUERY_PARAM, None)
+        context['query_string'] = context['query_string'].urlencode()
+        return context
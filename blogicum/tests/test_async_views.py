@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import re
+import threading
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils import timezone
+
+from blog.views import PostListView
+from core import executor
+
+# Потоки пула работают со своими соединениями и видят только
+# закоммиченные данные.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+URLCONFS = ('comments.urls', 'blog.urls', 'blogicum.urls')
+
+
+def reload_urls():
+    for name in URLCONFS:
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_urls(settings):
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        title='Асинхронный пост', image='')
+    mixer.blend('comments.Comment', post=post, author=user,
+                text='Асинхронный комментарий')
+    return post
+
+
+def get(url):
+    return asyncio.run(AsyncClient().get(url))
+
+
+def test_urls_switch_to_async_views(async_urls):
+    match = resolve(reverse('blog:index'))
+    assert asyncio.iscoroutinefunction(match.func)
+    assert match.func.view_class is PostListView
+
+
+def test_async_views_render_in_executor(async_urls, post, user):
+    urls = {
+        reverse('blog:index'): post.title,
+        reverse('blog:category_posts',
+                args=[post.category.slug]): post.title,
+        reverse('blog:post_detail', args=[post.pk]): post.title,
+        reverse('blog:comments:comment_list',
+                args=[post.pk]): 'Асинхронный комментарий',
+    }
+    for url, text in urls.items():
+        response = get(url)
+        assert response.status_code == 200, url
+        assert text in response.content.decode()
+        queries = re.search(r'desc="(\d+) queries"',
+                            response['Server-Timing'])
+        assert int(queries.group(1)) > 0
+    assert get(reverse('blog:post_detail', args=[10 ** 6])).status_code == 404
+
+
+def test_executor_is_bounded():
+    calls = []
+
+    def work():
+        calls.append(threading.current_thread().name)
+        return len(calls)
+
+    async def run_many():
+        return await asyncio.gather(
+            *(executor.run_sync(work) for _ in range(20)))
+
+    assert sorted(asyncio.run(run_many())) == list(range(1, 21))
+    assert len(set(calls)) <= executor.get_max_workers()
+    assert all(name.startswith('blogicum-db') for name in calls)
+
+
+def test_benchmark_asgi_mode(async_urls, post):
+    out = StringIO()
+    call_command('benchmark', mode='asgi', requests=4, concurrency=4,
+                 warmup=1, stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith('ASGI: async views on')
+    rows = lines[2:]
+    assert {row.split()[0] for row in rows} >= {'index', 'post_detail'}
+    assert all(row.split()[-5] == '0' for row in rows)
@@ -0,0 +1,67 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+from django.utils import timezone
+
+from blog import registry
+from blog.models import Category, Post
+from comments.models import Comment
+from core.benchmark import percentile
+
+pytestmark = [pytest.mark.django_db]
+
+
+def generate(**options):
+    call_command(
+        'generate_data', stdout=StringIO(), seed=1, batch_size=7, **options)
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 95) == 95
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_generate_data_creates_consistent_dataset():
+    generate(posts=40, users=3, categories=4, comments_per_post=3,
+             future_share=0.3, unpublished_share=0.2, hidden_categories=0.5)
+    assert Post.objects.count() == 40
+    assert Category.objects.count() == 4
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    assert Post.objects.filter(is_published=False).exists()
+    mismatched = Post.objects.annotate(
+        real=Count('comments')).exclude(comment_count=F('real'))
+    assert not mismatched.exists()
+    assert Comment.objects.count() == sum(
+        Post.objects.values_list('comment_count', flat=True))
+
+
+def test_generate_data_can_run_twice():
+    generate(posts=5)
+    generate(posts=5)
+    assert Post.objects.count() == 10
+
+
+def test_benchmark_reports_percentiles():
+    generate(posts=15, comments_per_post=2, unpublished_share=0)
+    out = StringIO()
+    call_command(
+        'benchmark', mode='client', requests=3, warmup=1, stdout=out)
+    report = out.getvalue()
+    assert 'p95 ms' in report
+    for route in ('index', 'post_detail', 'profile', 'search'):
+        assert route in report
+    rows = report.splitlines()[1:]
+    assert all(row.split()[-5] == '0' for row in rows)
+
+
+def test_generate_data_refreshes_registry():
+    registry.invalidate()
+    assert not registry.get_registry().categories
+    generate(posts=5, future_share=0, unpublished_share=0,
+             hidden_categories=0)
+    assert Post.optimized.visible().count() == 5
@@ -0,0 +1,43 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from comments.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_views_keep_counter(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/comment/'
+    user_client.post(url, data={'text': 'Первый'})
+    user_client.post(url, data={'text': 'Второй'})
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+def test_rebuild_comment_count(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('comments.Comment', post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command('rebuild_comment_count', batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+def test_feed_does_not_aggregate_comments(
+        client, many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as queries:
+        client.get('/')
+    assert not any(
+        'GROUP BY' in query['sql'].upper()
+        for query in queries.captured_queries
+    ), 'Лента не должна группировать посты для подсчета комментариев.'
@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from core.constants import COMMENTS_IN_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    return mixer.cycle(COMMENTS_IN_PAGE + 5).blend(
+        'comments.Comment',
+        post=post_with_published_location,
+        text=mixer.sequence('Комментарий номер {0}.'),
+    )
+
+
+def test_detail_renders_first_comment_batch(
+        client, post_with_published_location, many_comments):
+    post = post_with_published_location
+    response = client.get(f'/posts/{post.id}/')
+    comments = response.context['comments']
+    assert list(comments) == many_comments[:COMMENTS_IN_PAGE]
+    assert comments.has_next()
+    content = response.content.decode()
+    assert many_comments[COMMENTS_IN_PAGE].text not in content
+    assert f'/posts/{post.id}/comments/?cursor=' in content
+
+
+def test_comment_fragment_returns_next_batch(
+        client, post_with_published_location, many_comments):
+    post = post_with_published_location
+    first = client.get(f'/posts/{post.id}/').context['comments']
+    response = client.get(
+        f'/posts/{post.id}/comments/', {'cursor': first.next_cursor})
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['comments']) == (
+        many_comments[COMMENTS_IN_PAGE:])
+    assert not response.context['comments'].has_next()
+    assert '<html' not in response.content.decode()
+
+
+def test_comment_fragment_hidden_for_unpublished_post(
+        another_user_client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    response = another_user_client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+from comments.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        text='Длинный текст. ' * 1000)
+
+
+@pytest.fixture
+def comment(mixer, post, another_user):
+    Post.objects.filter(pk=post.pk).update(comment_count=1)
+    return mixer.blend('comments.Comment', post=post, author=another_user,
+                       text='Исходный текст')
+
+
+def post_queries(queries):
+    return [query['sql'] for query in queries.captured_queries
+            if '"blog_post"' in query['sql']]
+
+
+def comment_url(name, post_id, comment_id):
+    return reverse(f'blog:comments:{name}', kwargs={
+        'post_id': post_id, 'comment_id': comment_id})
+
+
+def test_create_checks_post_without_loading_it(another_user_client, post):
+    url = reverse('blog:comments:add_comment', kwargs={'post_id': post.pk})
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.post(url, {'text': 'Первый'})
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.filter(post=post).count() == 1
+    touched = post_queries(queries)
+    assert len(touched) == 2
+    assert touched[0].startswith('SELECT (1) AS "a"')
+    assert touched[1].startswith('UPDATE "blog_post"')
+    assert not any('"blog_post"."text"' in sql for sql in touched)
+
+
+def test_create_on_hidden_post_is_404(
+        user_client, another_user_client, post):
+    post.is_published = False
+    post.save()
+    url = reverse('blog:comments:add_comment', kwargs={'post_id': post.pk})
+    response = another_user_client.post(url, {'text': 'Чужой'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert user_client.post(url, {'text': 'Автор'}).status_code == (
+        HTTPStatus.FOUND)
+    assert list(Comment.objects.values_list('text', flat=True)) == ['Автор']
+
+
+@pytest.mark.parametrize('name', ['edit_comment', 'delete_comment'])
+def test_comment_from_another_post_is_404(
+        another_user_client, mixer, user, published_category, comment, name):
+    other = mixer.blend('blog.Post', author=user,
+                        category=published_category, is_published=True)
+    url = comment_url(name, other.pk, comment.pk)
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+    response = another_user_client.post(url, {'text': 'Подмена'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    comment.refresh_from_db()
+    assert comment.text == 'Исходный текст'
+
+
+def test_edit_resolves_comment_in_one_query(another_user_client, comment):
+    url = comment_url('edit_comment', comment.post_id, comment.pk)
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.post(url, {'text': 'Исправлено'})
+    assert response.status_code == HTTPStatus.FOUND
+    selects = [query['sql'] for query in queries.captured_queries
+               if 'FROM "comments_comment"' in query['sql']]
+    assert len(selects) == 1
+    assert '"users_customuser"."email"' not in selects[0]
+    assert not post_queries(queries)
+    comment.refresh_from_db()
+    assert comment.text == 'Исправлено'
+
+
+def test_delete_updates_counter_without_loading_post(
+        another_user_client, comment, post):
+    url = comment_url('delete_comment', post.pk, comment.pk)
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.post(url)
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Comment.objects.filter(pk=comment.pk).exists()
+    assert [sql.split()[0] for sql in post_queries(queries)] == ['UPDATE']
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from blog import feed_cache
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1))
+
+
+def detail_url(post):
+    return reverse('blog:post_detail', kwargs={'post_id': post.pk})
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+def test_detail_not_modified_without_rendering(client, post):
+    url = detail_url(post)
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'].startswith('W/"')
+    assert 'Last-Modified' not in response
+
+    with CaptureQueriesContext(connection) as queries:
+        again = revalidate(client, url, response)
+    assert again.status_code == HTTPStatus.NOT_MODIFIED
+    assert again.content == b''
+    assert again['ETag'] == response['ETag']
+    assert again.templates == []
+    assert not any(
+        'FROM "comments_comment"' in query['sql']
+        and 'FROM "blog_post"' not in query['sql']
+        for query in queries.captured_queries)
+
+
+def test_detail_changes_after_location_rename(
+        client, post, published_location):
+    Post.objects.filter(pk=post.pk).update(location=published_location)
+    url = detail_url(post)
+    response = client.get(url)
+    published_location.name = 'Новое место'
+    published_location.save()
+    since = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+    assert since.status_code == HTTPStatus.OK
+    assert 'Новое место' in since.content.decode()
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK
+
+
+def test_detail_changes_after_comment_edit_and_delete(user_client, post):
+    url = detail_url(post)
+    first = user_client.get(url)
+    user_client.post(
+        reverse('blog:comments:add_comment', kwargs={'post_id': post.pk}),
+        {'text': 'Первый'})
+    after_add = revalidate(user_client, url, first)
+    assert after_add.status_code == HTTPStatus.OK
+
+    comment = post.comments.get()
+    user_client.post(
+        reverse('blog:comments:edit_comment', kwargs={
+            'post_id': post.pk, 'comment_id': comment.pk}),
+        {'text': 'Исправленный'})
+    after_edit = revalidate(user_client, url, after_add)
+    assert after_edit.status_code == HTTPStatus.OK
+    assert 'Исправленный' in after_edit.content.decode()
+
+    post.refresh_from_db()
+    updated_at = post.updated_at
+    user_client.post(
+        reverse('blog:comments:delete_comment', kwargs={
+            'post_id': post.pk, 'comment_id': comment.pk}))
+    post.refresh_from_db()
+    assert post.updated_at > updated_at
+    assert revalidate(
+        user_client, url, after_edit).status_code == HTTPStatus.OK
+
+
+def test_etag_is_per_user(client, user_client, another_user_client, post):
+    url = detail_url(post)
+    response = user_client.get(url)
+    assert revalidate(
+        another_user_client, url, response).status_code == HTTPStatus.OK
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize('url_name, kwargs', [
+    ('blog:index', {}),
+    ('blog:category_posts', {'category_slug': 'news'}),
+    ('blog:profile', {'username': 'author'}),
+])
+def test_feed_not_modified_until_page_changes(
+        client, mixer, user, published_category, url_name, kwargs):
+    user.username = 'author'
+    user.save()
+    published_category.slug = 'news'
+    published_category.save()
+    mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1))
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1))
+    url = reverse(url_name, kwargs=kwargs)
+
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    with CaptureQueriesContext(connection) as queries:
+        again = revalidate(client, url, response)
+    assert again.status_code == HTTPStatus.NOT_MODIFIED
+    post_queries = [query for query in queries.captured_queries
+                    if 'FROM "blog_post"' in query['sql']]
+    assert len(post_queries) == 1
+    assert 'JOIN' not in post_queries[0]['sql']
+
+    # Отложенный пост появляется в ленте без сохранения и сигналов.
+    Post.objects.filter(pk=scheduled.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1))
+    response = revalidate(client, url, response)
+    assert response.status_code == HTTPStatus.OK
+
+    scheduled.delete()
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK
+
+
+def test_feed_bad_page_is_not_validated(client):
+    response = client.get(reverse('blog:index') + '?page=abc')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert 'ETag' not in response
+
+
+@override_settings(FEED_CACHE_ENABLED=True)
+def test_cached_feed_page_revalidated_without_queries(client, post):
+    feed_cache.invalidate()
+    url = reverse('blog:index')
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    with CaptureQueriesContext(connection) as queries:
+        again = revalidate(client, url, response)
+        cached = client.get(url)
+    assert again.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.status_code == HTTPStatus.OK
+    assert cached['ETag'] == response['ETag']
+    assert not queries.captured_queries
+
+
+def test_feed_changes_after_author_rename(client, user, post):
+    url = reverse('blog:index')
+    response = client.get(url)
+    user.username = 'renamed-author'
+    user.save()
+    fresh = revalidate(client, url, response)
+    assert fresh.status_code == HTTPStatus.OK
+    assert 'renamed-author' in fresh.content.decode()
+
+    client.force_login(user)
+    response = client.get(url)
+    assert revalidate(client, url, response).status_code == (
+        HTTPStatus.NOT_MODIFIED)
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_cursor_pagination_walks_feed(
+        client, many_posts_with_published_locations):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert response.status_code == HTTPStatus.OK
+    assert not any(
+        query['sql'].upper().startswith('SELECT COUNT(*)')
+        for query in queries.captured_queries
+    ), 'Курсорная пагинация не должна выполнять COUNT(*) по постам.'
+    first_page = response.context['page_obj']
+    assert list(first_page) == expected[:N_PER_PAGE]
+    assert not first_page.has_previous()
+    assert first_page.has_next()
+
+    response = client.get('/', {'cursor': first_page.next_cursor})
+    second_page = response.context['page_obj']
+    assert list(second_page) == expected[N_PER_PAGE:N_PER_PAGE * 2]
+    assert second_page.has_previous()
+
+    response = client.get('/', {'cursor': second_page.previous_cursor})
+    assert list(response.context['page_obj']) == expected[:N_PER_PAGE]
+    assert not response.context['page_obj'].has_previous()
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_cursor_pagination_rejects_broken_cursor(client):
+    response = client.get('/', {'cursor': 'not-a-cursor'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
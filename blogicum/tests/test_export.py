@@ -0,0 +1,119 @@
+import asyncio
+import csv
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.asgi import get_asgi_application
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.export import CSV_COLUMNS, export_lines
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def exported_posts(mixer, user, published_category, published_location):
+    posts = mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, image='')
+    mixer.cycle(3).blend('comments.Comment', post=posts[0], author=user)
+    mixer.blend('comments.Comment', post=posts[1], author=user)
+    return posts
+
+
+@pytest.fixture
+def staff_client(mixer):
+    staff = mixer.blend('users.CustomUser', is_staff=True)
+    client = Client()
+    client.force_login(staff)
+    return client
+
+
+def test_jsonl_export_nests_comments(exported_posts):
+    lines = list(export_lines('jsonl', chunk_size=2))
+    rows = [json.loads(line) for line in lines]
+    assert [row['id'] for row in rows] == [post.id for post in exported_posts]
+    assert len(rows[0]['comments']) == 3
+    assert len(rows[1]['comments']) == 1
+    assert rows[2]['comments'] == []
+    assert rows[0]['author'] == exported_posts[0].author.username
+    assert rows[0]['category'] == exported_posts[0].category.slug
+
+
+def test_export_reads_in_chunks(exported_posts):
+    with CaptureQueriesContext(connection) as queries:
+        list(export_lines('jsonl', chunk_size=2))
+    assert len(queries) == 1 + 3
+
+
+def test_csv_export_row_per_comment(exported_posts):
+    rows = list(csv.reader(export_lines('csv')))
+    assert tuple(rows[0]) == CSV_COLUMNS
+    assert len(rows) == 1 + 3 + 1 + 3
+
+
+def test_export_command_writes_file(tmp_path, exported_posts):
+    path = tmp_path / 'posts.jsonl'
+    call_command('export_posts', output=str(path), stdout=StringIO())
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 5
+
+
+def test_export_view_streams_for_staff(staff_client, exported_posts):
+    response = staff_client.get('/posts/export/', {'format': 'csv'})
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming
+    assert response['Content-Type'].startswith('text/csv')
+    assert 'attachment' in response['Content-Disposition']
+    content = b''.join(response.streaming_content).decode()
+    assert len(list(csv.reader(StringIO(content)))) == 8
+
+
+def test_export_view_forbidden_for_regular_users(user_client):
+    response = user_client.get('/posts/export/')
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_export_view_unknown_format(staff_client):
+    response = staff_client.get('/posts/export/', {'format': 'xml'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def asgi_get(path, query, cookies):
+    """GET через get_asgi_application(), как под ASGI-сервером."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'root_path': '',
+        'query_string': query.encode(),
+        'headers': [(b'host', b'testserver'), (b'cookie', cookies.encode())],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 1),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(get_asgi_application()(scope, receive, send))
+    return messages
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_view_under_asgi(staff_client, exported_posts):
+    cookies = '; '.join(
+        f'{name}={morsel.value}'
+        for name, morsel in staff_client.cookies.items())
+    messages = asgi_get('/posts/export/', 'format=csv', cookies)
+    assert messages[0]['status'] == HTTPStatus.OK
+    headers = dict(messages[0]['headers'])
+    assert headers[b'Content-Type'].startswith(b'text/csv')
+    assert b'attachment' in headers[b'Content-Disposition']
+    content = b''.join(
+        message.get('body', b'') for message in messages[1:]).decode()
+    assert len(list(csv.reader(StringIO(content)))) == 8
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from blog import feed_cache
+
+pytestmark = [pytest.mark.django_db]
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'feed-cache-tests',
+    },
+    'filebased': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    },
+}
+
+
+@pytest.fixture(params=list(CACHE_BACKENDS))
+def feed_cache_settings(request, tmp_path):
+    backend = dict(CACHE_BACKENDS[request.param])
+    if request.param == 'filebased':
+        backend['LOCATION'] = str(tmp_path)
+    with override_settings(CACHES={'default': backend},
+                           FEED_CACHE_ENABLED=True):
+        feed_cache.get_cache().clear()
+        yield
+
+
+@pytest.mark.usefixtures('feed_cache_settings')
+def test_anonymous_feed_served_from_cache(
+        client, many_posts_with_published_locations):
+    first = client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get('/')
+    assert second.content == first.content
+    assert not any(
+        'blog_post' in query['sql'] for query in queries.captured_queries
+    ), 'Повторный запрос ленты анонимом должен обслуживаться из кеша.'
+
+
+@pytest.mark.usefixtures('feed_cache_settings')
+def test_feed_cache_invalidated_on_post_save(
+        client, mixer, user, published_category):
+    client.get('/')
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Новый пост в ленте')
+    assert post.title in client.get('/').content.decode()
+
+
+@pytest.mark.usefixtures('feed_cache_settings')
+def test_feed_cache_expires_at_scheduled_publication(
+        mixer, user, published_category):
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30))
+    assert 0 < feed_cache.get_timeout() <= 30
+
+
+def test_evicted_generation_does_not_revive_old_pages():
+    first = feed_cache.page_key('/')
+    feed_cache.invalidate()
+    feed_cache.invalidate()
+    feed_cache.get_cache().delete(feed_cache.GENERATION_KEY)
+    assert feed_cache.page_key('/') != first
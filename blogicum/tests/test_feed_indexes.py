@@ -0,0 +1,46 @@
+import re
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from blog.models import Category, Post
+from comments.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+# Таблица и индексы, которыми запрос ленты должен искать строки. Для
+# главной ленты без ANALYZE планировщик может выбрать любой из двух.
+EXPECTED_INDEXES = {
+    'index': ('blog_post', 'post_category_date_idx|post_published_date_idx'),
+    'category': ('blog_post', 'post_category_date_idx'),
+    'profile': ('blog_post', 'post_author_date_idx'),
+    'comments': ('comments_comment', 'comment_post_created_idx'),
+}
+
+
+def feed_querysets():
+    category = Category.objects.first()
+    author = get_user_model().objects.first()
+    post = Post.objects.first()
+    return {
+        'index': Post.optimized.visible(),
+        'category': Post.optimized.visible().filter(category=category),
+        'profile': Post.optimized.visible().filter(author=author),
+        'comments': Comment.objects.filter(post=post),
+    }
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite',
+                    reason='Разбор плана написан для EXPLAIN QUERY PLAN.')
+@pytest.mark.usefixtures('many_posts_with_published_locations')
+@pytest.mark.parametrize(
+    'name', ['index', 'category', 'profile', 'comments'])
+def test_feed_queries_use_indexes(name):
+    plan = feed_querysets()[name][:10].explain()
+    table, indexes = EXPECTED_INDEXES[name]
+    search = re.compile(
+        rf'\bSEARCH (TABLE )?"?{table}"? USING (COVERING )?INDEX '
+        rf'"?({indexes})"?(\s|$)')
+    assert search.search(plan), (
+        f'Запрос `{name}` не ищет строки {table} по индексу:\n{plan}')
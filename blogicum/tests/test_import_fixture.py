@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog import registry
+from blog.models import Category, Post
+from comments.models import Comment
+from core.fixtures import FixtureError, iter_fixture
+
+pytestmark = [pytest.mark.django_db]
+
+CREATED_AT = '2022-12-18T23:03:52.159Z'
+
+
+def fixture_rows(author_pk):
+    """Посты идут раньше своей категории, как в несортированной выгрузке."""
+    rows = [
+        {'model': 'blog.post', 'pk': pk, 'fields': {
+            'title': f'Пост {pk}', 'text': 'Текст', 'is_published': True,
+            'created_at': CREATED_AT, 'pub_date': CREATED_AT,
+            'author': author_pk, 'category': 7, 'location': None,
+            'image': '',
+        }}
+        for pk in range(100, 112)
+    ]
+    rows.append({'model': 'blog.category', 'pk': 7, 'fields': {
+        'title': 'Категория', 'description': 'Описание', 'slug': 'imported',
+        'is_published': True, 'created_at': CREATED_AT,
+    }})
+    rows += [
+        {'model': 'comments.comment', 'pk': pk, 'fields': {
+            'text': 'Комментарий', 'post': 100, 'author': author_pk,
+            'created_at': CREATED_AT,
+        }}
+        for pk in range(1, 4)
+    ]
+    return rows
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+def test_iter_fixture_streams_objects(chunk_size):
+    rows = [{'model': 'blog.category', 'pk': pk} for pk in range(5)]
+    stream = StringIO("\n  " + json.dumps(rows, indent=2))
+    assert list(iter_fixture(stream, chunk_size=chunk_size)) == rows
+
+
+def test_iter_fixture_rejects_broken_json():
+    with pytest.raises(FixtureError):
+        list(iter_fixture(StringIO('[{"model": "blog.post", ')))
+    with pytest.raises(FixtureError):
+        list(iter_fixture(StringIO('{"model": "blog.post"}')))
+
+
+def test_import_fixture(tmp_path, user):
+    path = tmp_path / 'dump.json'
+    path.write_text(json.dumps(fixture_rows(user.pk)), encoding='utf-8')
+    out = StringIO()
+    call_command('import_fixture', str(path), batch_size=5, stdout=out)
+    assert Post.objects.count() == 12
+    assert Category.objects.get(pk=7).slug == 'imported'
+    assert Comment.objects.count() == 3
+    post = Post.objects.get(pk=100)
+    assert post.created_at == datetime(
+        2022, 12, 18, 23, 3, 52, 159000, tzinfo=timezone.utc)
+    assert post.comment_count == 3
+    assert 'строк/с' in out.getvalue()
+    new_post = Post.objects.create(
+        title='Новый', text='Текст', pub_date=post.pub_date, author=user)
+    assert new_post.pk == 112
+
+
+def test_import_fixture_rolls_back_on_missing_relation(tmp_path, user):
+    rows = fixture_rows(user.pk + 100)
+    path = tmp_path / 'dump.json'
+    path.write_text(json.dumps(rows), encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command('import_fixture', str(path), stdout=StringIO())
+    assert not Post.objects.exists()
+
+
+def test_import_fixture_refreshes_registry(tmp_path, user):
+    registry.invalidate()
+    assert not registry.get_registry().categories
+    path = tmp_path / 'dump.json'
+    path.write_text(json.dumps(fixture_rows(user.pk)), encoding='utf-8')
+    call_command('import_fixture', str(path), stdout=StringIO())
+    assert Post.optimized.visible().count() == 12
@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from jobs.models import Job
+from jobs.registry import enqueue, task
+from jobs.worker import Worker
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task('tests.remember')
+def remember(value):
+    calls.append(value)
+
+
+@task('tests.explode')
+def explode():
+    raise RuntimeError('boom')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_enqueue_stores_job_until_worker_runs():
+    job = enqueue('tests.remember', value=1)
+    assert job.status == Job.PENDING
+    assert calls == []
+    assert Worker(threads=0).run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+    assert calls == [1]
+
+
+@override_settings(JOBS_ALWAYS_EAGER=True)
+def test_eager_mode_runs_immediately():
+    assert enqueue('tests.remember', value=2) is None
+    assert calls == [2]
+    assert not Job.objects.exists()
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2)
+def test_failed_job_retried_then_marked_failed():
+    job = enqueue('tests.explode')
+    Worker(threads=0).run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.PENDING
+    assert 'boom' in job.last_error
+
+    Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+    Worker(threads=0).run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
+    assert job.attempts == 2
+
+
+def test_run_workers_once():
+    enqueue('tests.remember', value=3)
+    call_command('run_workers', once=True, threads=0)
+    assert calls == [3]
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import registry
+from blog.models import Category, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True, image='')
+
+
+def lookup_queries(queries):
+    return [
+        query['sql'] for query in queries.captured_queries
+        if '"blog_category"' in query['sql']
+        or '"blog_location"' in query['sql']
+    ]
+
+
+def test_feed_does_not_join_lookups(client, posts):
+    client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.context['page_obj']) == set(posts)
+    assert lookup_queries(queries) == []
+
+
+def test_posts_get_lookups_from_registry(posts, published_location):
+    list(Post.optimized.visible())
+    with CaptureQueriesContext(connection) as queries:
+        post = Post.optimized.visible().first()
+        assert post.category.slug == posts[0].category.slug
+        assert post.location.name == published_location.name
+    assert len(queries) == 1
+
+
+def test_category_page_without_category_query(client, published_category,
+                                              posts):
+    url = f'/category/{published_category.slug}/'
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.context['category'] == published_category
+    assert lookup_queries(queries) == []
+
+
+def test_category_save_refreshes_registry(client, published_category, posts):
+    url = f'/category/{published_category.slug}/'
+    assert client.get(url).status_code == HTTPStatus.OK
+    published_category.is_published = False
+    published_category.save()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert not Post.optimized.visible().exists()
+
+
+def test_location_save_refreshes_registry(posts, published_location):
+    published_location.name = 'Новое место'
+    published_location.save()
+    assert Post.optimized.visible().first().location.name == 'Новое место'
+
+
+def test_cleared_cache_does_not_revive_stale_registry(published_category):
+    registry.get_registry()
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False)
+    cache.clear()
+    assert published_category.pk not in (
+        registry.get_registry().published_category_ids)
+
+
+def test_registry_can_be_disabled(settings, client, posts):
+    settings.POSTS_LOOKUP_REGISTRY = False
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert set(response.context['page_obj']) == set(posts)
+    assert lookup_queries(queries)
@@ -0,0 +1,55 @@
+import pytest
+from django.core.cache import cache
+from django.db.models import F
+from django.test.utils import override_settings
+
+from blog.models import Post
+from comments.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+CARD_BODY = 'includes/post_card_body.html'
+
+
+def rendered(response, template_name):
+    return [t for t in response.templates if t.name == template_name]
+
+
+@override_settings(POST_CARD_CACHE_TIMEOUT=60)
+def test_post_cards_rendered_once(
+        client, many_posts_with_published_locations):
+    cache.clear()
+    first = client.get('/')
+    assert rendered(first, CARD_BODY)
+    second = client.get('/')
+    assert not rendered(second, CARD_BODY), (
+        'Повторная отрисовка ленты должна брать карточки из кеша.')
+    assert second.content == first.content
+
+
+@override_settings(POST_CARD_CACHE_TIMEOUT=60)
+def test_post_card_refreshed_after_edit(
+        client, many_posts_with_published_locations):
+    cache.clear()
+    client.get('/')
+    post = max(
+        many_posts_with_published_locations,
+        key=lambda item: (item.pub_date, item.pk))
+    post.title = 'Заголовок после правки'
+    post.save()
+    assert post.title in client.get('/').content.decode()
+
+
+@override_settings(POST_CARD_CACHE_TIMEOUT=60)
+def test_comment_refreshes_only_its_card(
+        client, user, many_posts_with_published_locations):
+    cache.clear()
+    first = client.get('/')
+    post = first.context['page_obj'][0]
+    Comment.objects.create(post_id=post.pk, author=user, text='Текст')
+    Post.objects.filter(pk=post.pk).update(
+        comment_count=F('comment_count') + 1)
+    response = client.get('/')
+    assert len(rendered(response, CARD_BODY)) == 1
+    assert f'Комментарии ({post.comment_total + 1})' in (
+        response.content.decode())
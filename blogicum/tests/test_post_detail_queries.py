@@ -0,0 +1,42 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def post_lookups(queries, post_id):
+    return [
+        query for query in queries.captured_queries
+        if 'FROM "blog_post"' in query['sql']
+        and f'"blog_post"."id" = {post_id}' in query['sql']
+    ]
+
+
+@pytest.mark.parametrize('client_name', ['client', 'another_user_client'])
+def test_detail_resolves_post_in_one_query(
+        request, client_name, post_with_published_location):
+    client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.OK
+    assert len(post_lookups(queries, post.id)) == 1
+
+
+def test_detail_unpublished_post_for_author_in_one_query(
+        user_client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.OK
+    assert len(post_lookups(queries, post.id)) == 1
+
+
+def test_detail_unpublished_post_hidden_from_others(
+        another_user_client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    response = another_user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+
+BOOT_SCRIPT = '''
+import json
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+django.setup()
+call_command('migrate', verbosity=0)
+call_command('check', deploy=False)
+
+from django.test import Client
+response = Client(HTTP_HOST='blog.example.com').get('/')
+loaders = settings.TEMPLATES[0]['OPTIONS']['loaders']
+print(json.dumps({
+    'status': response.status_code,
+    'debug': settings.DEBUG,
+    'apps': settings.INSTALLED_APPS,
+    'middleware': settings.MIDDLEWARE,
+    'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+    'cache': settings.CACHES['default']['BACKEND'],
+    'session_engine': settings.SESSION_ENGINE,
+    'loader': loaders[0][0],
+}))
+'''
+
+
+@pytest.fixture
+def production_env(tmp_path):
+    environ = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith('DJANGO_')
+    }
+    environ.update(
+        DJANGO_SETTINGS_MODULE='blogicum.settings',
+        DJANGO_PROFILE='production',
+        DJANGO_SECRET_KEY='test-secret-key',
+        DJANGO_ALLOWED_HOSTS='blog.example.com',
+        DJANGO_DB_NAME=str(tmp_path / 'db.sqlite3'),
+        DJANGO_CACHE_LOCATION=str(tmp_path / 'cache'),
+        DJANGO_MEDIA_ROOT=str(tmp_path / 'media'),
+    )
+    return environ
+
+
+def boot(environ):
+    return subprocess.run(
+        [sys.executable, '-c', BOOT_SCRIPT],
+        cwd=Path(settings.BASE_DIR), env=environ,
+        capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_production_profile_boots(production_env):
+    result = boot(production_env)
+    assert result.returncode == 0, result.stderr
+    config = json.loads(result.stdout.strip().splitlines()[-1])
+    assert config['status'] == 200
+    assert config['debug'] is False
+    assert 'debug_toolbar' not in config['apps']
+    assert not [name for name in config['middleware']
+                if name.startswith('debug_toolbar')]
+    assert config['conn_max_age'] > 0
+    assert config['cache'].endswith('FileBasedCache')
+    assert config['session_engine'].endswith('cached_db')
+    assert config['loader'] == 'django.template.loaders.cached.Loader'
+
+
+def test_production_profile_requires_secret_key(production_env):
+    del production_env['DJANGO_SECRET_KEY']
+    result = boot(production_env)
+    assert result.returncode != 0
+    assert 'DJANGO_SECRET_KEY' in result.stderr
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import profile_cache
+from blog.models import Post
+from comments.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def author_posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, image='',
+        pub_date=timezone.now() - timedelta(days=1))
+
+
+def summary(client, user):
+    response = client.get(f'/profile/{user.username}/')
+    assert response.status_code == HTTPStatus.OK
+    return response.context['profile_summary']
+
+
+def test_cached_profile_skips_users_and_count(client, user, author_posts):
+    summary(client, user)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/profile/{user.username}/')
+    sql = [query['sql'] for query in queries.captured_queries]
+    assert response.context['page_obj'].paginator.count == 3
+    assert not [query for query in sql if 'FROM "users_customuser"' in query
+                and 'INNER JOIN' not in query]
+    assert not [query for query in sql if 'COUNT(' in query]
+
+
+def test_summary_counters(client, user, another_user, author_posts):
+    Comment.objects.create(post=author_posts[0], author=user, text='Текст')
+    Comment.objects.create(
+        post=author_posts[0], author=another_user, text='Текст')
+    data = summary(client, user)
+    assert data.post_count == 3
+    assert data.comment_count == 1
+    assert data.last_post_date == max(post.pub_date for post in author_posts)
+
+
+def test_new_post_refreshes_summary(
+        client, mixer, user, author_posts, published_category):
+    assert summary(client, user).post_count == 3
+    mixer.blend('blog.Post', author=user, category=published_category,
+                is_published=True, pub_date=timezone.now(), image='')
+    assert summary(client, user).post_count == 4
+
+
+def test_comment_refreshes_summary(client, user, author_posts):
+    assert summary(client, user).comment_count == 0
+    comment = Comment.objects.create(
+        post=author_posts[0], author=user, text='Текст')
+    assert summary(client, user).comment_count == 1
+    comment.delete()
+    assert summary(client, user).comment_count == 0
+
+
+def test_unpublished_category_refreshes_summary(
+        client, user, author_posts, published_category):
+    assert summary(client, user).post_count == 3
+    published_category.is_published = False
+    published_category.save()
+    assert summary(client, user).post_count == 0
+
+
+def test_owner_paginates_hidden_posts(user_client, user, author_posts):
+    Post.objects.filter(pk=author_posts[0].pk).update(is_published=False)
+    cache.clear()
+    response = user_client.get(f'/profile/{user.username}/')
+    assert response.context['page_obj'].paginator.count == 3
+    assert response.context['profile_summary'].post_count == 2
+
+
+def test_renamed_user_profile(client, user, author_posts):
+    old_username = user.username
+    summary(client, user)
+    user.username = f'{old_username}-renamed'
+    user.save()
+    response = client.get(f'/profile/{old_username}/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert summary(client, user).user.username == user.username
+
+
+def test_invalidation_survives_evicted_username_key(
+        client, mixer, user, author_posts, published_category):
+    assert summary(client, user).post_count == 3
+    cache.delete(profile_cache.username_key(user.username))
+    mixer.blend('blog.Post', author=user, category=published_category,
+                is_published=True, pub_date=timezone.now(), image='')
+    assert summary(client, user).post_count == 4
+
+
+def test_evicted_generation_does_not_revive_old_summaries(
+        client, user, author_posts, published_category):
+    assert summary(client, user).post_count == 3
+    published_category.is_published = False
+    published_category.save()
+    cache.delete(profile_cache.GENERATION_KEY)
+    assert summary(client, user).post_count == 0
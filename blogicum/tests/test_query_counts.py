@@ -0,0 +1,124 @@
+"""Количество SQL-запросов на страницах не должно зависеть от объема данных.
+
+Для каждого именованного маршрута blog, comments, users и pages страница
+запрашивается при нескольких объемах данных; число запросов должно
+оставаться одинаковым. Так ловятся N+1 регрессии, например потеря
+select_related в BaseCommentMixin.queryset.
+"""
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+pytestmark = [pytest.mark.django_db]
+
+SCALES = (2, 12, 30)
+URL_MODULES = ('blog.urls', 'comments.urls', 'users.urls', 'pages.urls')
+
+
+def iter_routes(patterns, namespace='', inside=False, arguments=()):
+    """Полные имена маршрутов из URL_MODULES с именами их аргументов."""
+    for pattern in patterns:
+        converters = set(arguments) | set(pattern.pattern.converters)
+        if isinstance(pattern, URLResolver):
+            module = getattr(pattern.urlconf_module, '__name__', '')
+            prefix = namespace
+            if pattern.namespace:
+                prefix = f'{namespace}{pattern.namespace}:'
+            yield from iter_routes(
+                pattern.url_patterns, prefix,
+                inside or module in URL_MODULES, converters)
+        elif isinstance(pattern, URLPattern) and inside and pattern.name:
+            yield f'{namespace}{pattern.name}', converters
+
+
+ROUTES = dict(iter_routes(get_resolver().url_patterns))
+
+
+class Dataset:
+    """Данные, объем которых растет от масштаба к масштабу.
+
+    Страницы запрашиваются для одних и тех же объектов (первых созданных),
+    меняется только количество остальных постов, комментариев,
+    категорий и местоположений.
+    """
+
+    def __init__(self, mixer, user):
+        self.mixer = mixer
+        self.user = user
+        self.posts = []
+        self.comments = []
+        self.categories = []
+
+    def grow(self, size):
+        mixer = self.mixer
+        missing = size - len(self.posts)
+        categories = mixer.cycle(missing).blend(
+            'blog.Category', is_published=True)
+        locations = mixer.cycle(missing).blend(
+            'blog.Location', is_published=True)
+        posts = mixer.cycle(missing).blend(
+            'blog.Post',
+            author=self.user,
+            is_published=True,
+            category=mixer.sequence(*categories),
+            location=mixer.sequence(*locations),
+            image='',
+        )
+        self.categories += categories
+        self.posts += posts
+        for post in [self.posts[0]] + posts:
+            self.comments += mixer.cycle(missing).blend(
+                'comments.Comment', post=post, author=self.user)
+        for post in self.posts:
+            post.comment_count = post.comments.count()
+            post.save(update_fields=['comment_count'])
+
+    def kwargs(self, arguments):
+        post = self.posts[0]
+        comment = post.comments.order_by('pk').first()
+        values = {
+            'post_id': post.pk,
+            'comment_id': comment.pk,
+            'category_slug': self.categories[0].slug,
+            'username': self.user.username,
+            'uidb64': urlsafe_base64_encode(force_bytes(self.user.pk)),
+            'token': default_token_generator.make_token(self.user),
+        }
+        return {name: values[name] for name in arguments}
+
+
+def count_queries(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR, url
+    return len(queries)
+
+
+def test_routes_discovered():
+    assert 'posts:index' in ROUTES
+    assert 'posts:comments:edit_comment' in ROUTES
+    assert 'users:registration' in ROUTES
+    assert 'pages:about' in ROUTES
+
+
+@pytest.mark.parametrize('route', sorted(ROUTES))
+def test_query_count_does_not_grow(mixer, user, user_client, route):
+    dataset = Dataset(mixer, user)
+    counts = {}
+    for size in SCALES:
+        dataset.grow(size)
+        url = reverse(route, kwargs=dataset.kwargs(ROUTES[route]))
+        user_client.get(url)
+        counts[size] = count_queries(user_client, url)
+    assert len(set(counts.values())) == 1, (
+        f'Количество запросов на {route} растет вместе с данными: '
+        f'{counts}'
+    )
@@ -0,0 +1,151 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Category, Post
+from core.db_router import PIN_COOKIE, ReplicaRouter, primary, side_write
+from core.middleware import ReplicaRoutingMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+User = get_user_model()
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """Вторая база SQLite в файле, подключенная как реплика."""
+    connections.settings['replica'] = dict(
+        connections[DEFAULT_DB_ALIAS].settings_dict,
+        NAME=str(tmp_path / 'replica.sqlite3'),
+    )
+    call_command('migrate', database='replica', verbosity=0)
+    with override_settings(DATABASE_REPLICAS=['replica']):
+        yield 'replica'
+    connections['replica'].close()
+    del connections.settings['replica']
+    delattr(connections._connections, 'replica')
+
+
+@pytest.fixture
+def replicated(replica):
+    """Автор и категория, уже скопированные на реплику."""
+    rows = {}
+    for using in (DEFAULT_DB_ALIAS, replica):
+        author = User.objects.db_manager(using).create_user(
+            pk=1000, username='author', password='secret')
+        category = Category.objects.using(using).create(
+            pk=1000, title='Категория', description='-', slug='category')
+        rows[using] = (author, category)
+    return rows[DEFAULT_DB_ALIAS]
+
+
+def create_post(using, author, category, title):
+    return Post.objects.using(using).create(
+        title=title, text='Текст', pub_date=timezone.now(),
+        author=author, category=category)
+
+
+def test_read_views_use_replica(client, replicated):
+    author, category = replicated
+    create_post('replica', author, category, 'С реплики')
+    create_post(DEFAULT_DB_ALIAS, author, category, 'Из основной')
+    for url in (
+        reverse('blog:index'),
+        reverse('blog:category_posts', args=['category']),
+        reverse('blog:profile', args=['author']),
+    ):
+        content = client.get(url).content.decode()
+        assert 'С реплики' in content
+        assert 'Из основной' not in content
+
+
+def test_write_pins_user_to_primary(user_client, replicated):
+    author, category = replicated
+    post = create_post(DEFAULT_DB_ALIAS, author, category, 'Новый пост')
+    url = reverse('blog:post_detail', args=[post.pk])
+    assert user_client.get(url).status_code == 404
+
+    response = user_client.post(
+        reverse('blog:comments:add_comment', args=[post.pk]),
+        {'text': 'Комментарий'})
+    assert response.cookies[PIN_COOKIE]['max-age'] == 10
+    response = user_client.get(url)
+    assert response.status_code == 200
+    assert 'Комментарий' in response.content.decode()
+
+    del user_client.cookies[PIN_COOKIE]
+    assert user_client.get(url).status_code == 404
+
+
+def test_without_replicas_everything_reads_primary(client, user, mixer):
+    post = mixer.blend('blog.Post', category__is_published=True,
+                       pub_date=timezone.now())
+    response = client.get(reverse('blog:post_detail', args=[post.pk]))
+    assert response.status_code == 200
+    assert PIN_COOKIE not in response.cookies
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+def test_router_decisions(rf):
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    assert router.db_for_write(Post) is None
+    from_replica = Post()
+    from_replica._state.db = 'replica'
+    assert router.db_for_write(
+        Post, instance=from_replica) == DEFAULT_DB_ALIAS
+    assert router.allow_migrate('replica', 'blog') is False
+
+    decisions = {}
+
+    def view(request):
+        decisions['read'] = router.db_for_read(Post)
+        with primary():
+            decisions['primary'] = router.db_for_read(Post)
+        decisions['session'] = router.db_for_read(Session)
+        router.db_for_write(Post)
+        decisions['after_write'] = router.db_for_read(Post)
+        return response
+
+    class ReadView:
+        read_from_replica = True
+
+    view.view_class = ReadView
+    response = HttpResponse()
+    middleware = ReplicaRoutingMiddleware(
+        lambda request: middleware.process_view(request, view, (), {})
+        or view(request))
+    assert PIN_COOKIE in middleware(rf.get('/')).cookies
+    assert decisions == {
+        'read': 'replica', 'primary': None, 'session': None,
+        'after_write': None,
+    }
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+def test_side_write_does_not_pin(rf):
+    router = ReplicaRouter()
+    decisions = {}
+
+    def view(request):
+        with side_write():
+            decisions['side_write'] = router.db_for_read(Post)
+            router.db_for_write(Post)
+        decisions['after'] = router.db_for_read(Post)
+        return HttpResponse()
+
+    class ReadView:
+        read_from_replica = True
+
+    view.view_class = ReadView
+    middleware = ReplicaRoutingMiddleware(
+        lambda request: middleware.process_view(request, view, (), {})
+        or view(request))
+    assert PIN_COOKIE not in middleware(rf.get('/')).cookies
+    assert decisions == {'side_write': None, 'after': 'replica'}
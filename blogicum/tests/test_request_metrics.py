@@ -0,0 +1,71 @@
+import re
+import time
+
+import pytest
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from core import metrics
+from core.checks import check_metrics_cache
+
+pytestmark = [pytest.mark.django_db]
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), '
+    r'total;dur=[\d.]+')
+
+
+def test_server_timing_header(client, post_with_published_location):
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    match = SERVER_TIMING.fullmatch(response['Server-Timing'])
+    assert match, response['Server-Timing']
+    assert int(match.group(1)) > 0
+    assert float(match.group(2)) > 0
+
+
+@override_settings(METRICS_FLUSH_INTERVAL=0)
+def test_per_view_aggregates(client, capsys):
+    metrics.flush()
+    metrics.get_cache().clear()
+    client.get('/')
+    client.get('/')
+    client.get('/pages/about/')
+    totals = metrics.read()
+    assert totals['blog:index']['requests'] == 2
+    assert totals['pages:about']['requests'] == 1
+    assert totals['blog:index']['response_bytes'] > 0
+
+    call_command('view_metrics')
+    assert 'blog:index' in capsys.readouterr().out
+
+
+def test_flushes_add_up_in_shared_counters():
+    metrics.flush()
+    metrics.get_cache().clear()
+    for _ in range(3):
+        metrics.record('blog:index', total_ms=1.5, queries=2, db_ms=0.25,
+                       template_ms=0, response_bytes=100)
+        metrics.flush()
+    metrics.record('pages:about', total_ms=2, queries=0, db_ms=0,
+                   template_ms=0, response_bytes=10)
+    metrics.flush()
+    totals = metrics.read()
+    assert totals['blog:index'] == {
+        'requests': 3, 'total_ms': 4.5, 'queries': 6, 'db_ms': 0.75,
+        'template_ms': 0, 'response_bytes': 300,
+    }
+    assert totals['pages:about']['requests'] == 1
+    minute = int(time.time() // 60)
+    assert metrics.get_view_names(
+        metrics.get_cache(), range(minute - 1, minute + 1)
+    ) == {'blog:index', 'pages:about'}
+
+
+def test_metrics_cache_needs_atomic_incr(settings):
+    assert check_metrics_cache(None) == []
+    settings.METRICS_CACHE_ALIAS = 'default'
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/tmp/blogicum-metrics-check',
+    }}
+    assert [error.id for error in check_metrics_cache(None)] == ['core.E001']
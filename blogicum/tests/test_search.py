@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from conftest import N_PER_PAGE
+from search.backends import FTS5Backend, get_backend
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=['fts5', 'python'])
+def search_backend(request):
+    if request.param == 'fts5' and not FTS5Backend.is_available():
+        pytest.skip('SQLite собран без FTS5.')
+    with override_settings(SEARCH_BACKEND=request.param):
+        yield get_backend()
+
+
+@pytest.fixture
+def ranked_posts(search_backend, mixer, user, published_category):
+    in_text = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Заметка', text='Про редкое слово котлован.')
+    in_title = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Котлован', text='Котлован у дома.')
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        title='Котлован', text='Черновик', is_published=False)
+    return in_title, in_text, hidden
+
+
+def test_search_ranks_visible_posts(client, ranked_posts):
+    in_title, in_text, hidden = ranked_posts
+    response = client.get('/search/', {'q': 'котлован'})
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['page_obj']) == [in_title, in_text]
+
+
+def test_search_index_follows_edits(client, ranked_posts):
+    in_title, in_text, _ = ranked_posts
+    in_text.text = 'Теперь без того слова.'
+    in_text.save()
+    in_title.delete()
+    response = client.get('/search/', {'q': 'котлован'})
+    assert list(response.context['page_obj']) == []
+
+
+def test_search_keyset_pagination(
+        client, search_backend, mixer, user, published_category):
+    posts = mixer.cycle(N_PER_PAGE + 3).blend(
+        'blog.Post', author=user, category=published_category,
+        title='Котлован', text=mixer.sequence('Текст {0}'))
+    first = client.get('/search/', {'q': 'котлован'}).context['page_obj']
+    assert len(first) == N_PER_PAGE
+    second = client.get(
+        '/search/', {'q': 'котлован', 'cursor': first.next_cursor}
+    ).context['page_obj']
+    assert len(second) == 3
+    assert {post.pk for post in list(first) + list(second)} == {
+        post.pk for post in posts}
+    assert not second.has_next()
+
+
+def test_rebuild_search_index(search_backend, ranked_posts):
+    search_backend.clear()
+    assert search_backend.search('котлован', None, 10) == []
+    call_command('rebuild_search_index')
+    assert len(search_backend.search('котлован', None, 10)) == 3
+
+
+def test_search_requires_all_terms(search_backend, ranked_posts):
+    hits = search_backend.search('котлован черновик', None, 10)
+    assert [pk for _, pk in hits] == [ranked_posts[2].pk]
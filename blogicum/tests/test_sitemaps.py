@@ -0,0 +1,142 @@
+from datetime import timedelta
+from io import StringIO
+from xml.etree import ElementTree
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import sitemaps
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+BASE_URL = 'https://blogicum.example'
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(location=tmp_path, base_url='/sitemaps/')
+
+
+@pytest.fixture
+def segment_size(settings):
+    settings.SITEMAP_SEGMENT_SIZE = 3
+    return 3
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    visible = mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=past)
+    mixer.blend('blog.Post', author=user, category=published_category,
+                is_published=False, pub_date=past)
+    mixer.blend('blog.Post', author=user, category=published_category,
+                is_published=True, pub_date=timezone.now() + timedelta(1))
+    return visible
+
+
+def read(storage, name):
+    with storage.open(name) as file:
+        return ElementTree.fromstring(file.read())
+
+
+def locations(storage, prefix):
+    """Адреса из всех сегментов раздела."""
+    urls = []
+    for name in storage.listdir('')[1]:
+        if name.startswith(f'sitemap-{prefix}-'):
+            segment = read(storage, name)
+            assert len(segment) <= sitemaps.get_size()
+            urls += [url.findtext(f'{NS}loc') for url in segment]
+    return urls
+
+
+def test_build_writes_index_and_segments(storage, segment_size, posts,
+                                         user, published_category):
+    result = sitemaps.build(storage, BASE_URL)
+    assert result.written and not result.skipped and not result.removed
+
+    index = read(storage, sitemaps.INDEX_NAME)
+    segment_urls = {item.findtext(f'{NS}loc') for item in index}
+    assert segment_urls == {
+        f'{BASE_URL}/sitemaps/{name}' for name in result.written}
+
+    assert sorted(locations(storage, 'posts')) == sorted(
+        BASE_URL + reverse('blog:post_detail', args=[post.pk])
+        for post in posts)
+    assert locations(storage, 'categories') == [
+        BASE_URL + reverse('blog:category_posts',
+                           args=[published_category.slug])]
+    assert BASE_URL + reverse(
+        'blog:profile', args=[user.username]
+    ) in locations(storage, 'profiles')
+
+
+def test_unchanged_segments_are_skipped(storage, segment_size, posts):
+    first = sitemaps.build(storage, BASE_URL)
+    again = sitemaps.build(storage, BASE_URL)
+    assert again.written == [] and again.removed == []
+    assert again.skipped == len(first.written)
+
+    post = posts[0]
+    post.title = 'Новый заголовок'
+    post.save()
+    changed = sitemaps.build(storage, BASE_URL)
+    assert changed.written == [
+        f'sitemap-posts-{post.pk // segment_size}.xml']
+
+    assert sitemaps.build(storage, 'https://new.example').skipped == 0
+
+
+def test_rebuild_replaces_files_in_place(storage, segment_size, posts):
+    first = sitemaps.build(storage, BASE_URL)
+    sitemaps.build(storage, BASE_URL, force=True)
+    assert sorted(storage.listdir('')[1]) == sorted(
+        first.written + [sitemaps.INDEX_NAME, sitemaps.MANIFEST_NAME])
+
+
+def test_scheduled_post_and_rename_rewrite_segments(
+        storage, segment_size, posts, user):
+    sitemaps.build(storage, BASE_URL)
+    scheduled = Post.objects.get(pub_date__gt=timezone.now())
+    Post.objects.filter(pk=scheduled.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1))
+    user.username = 'renamed'
+    user.save()
+    result = sitemaps.build(storage, BASE_URL)
+    assert f'sitemap-posts-{scheduled.pk // segment_size}.xml' in (
+        result.written)
+    assert f'sitemap-profiles-{user.pk // segment_size}.xml' in (
+        result.written)
+    assert any(url.endswith('/profile/renamed/')
+               for url in locations(storage, 'profiles'))
+
+
+def test_empty_segments_are_removed(storage, segment_size, posts):
+    sitemaps.build(storage, BASE_URL)
+    last = posts[-1].pk // segment_size
+    Post.objects.filter(pk__gte=last * segment_size).delete()
+    result = sitemaps.build(storage, BASE_URL)
+    assert result.removed == [f'sitemap-posts-{last}.xml']
+    assert not storage.exists(f'sitemap-posts-{last}.xml')
+    index = read(storage, sitemaps.INDEX_NAME)
+    assert all(f'posts-{last}.xml' not in item.findtext(f'{NS}loc')
+               for item in index)
+
+
+def test_command_and_robots_txt(client, tmp_path, posts):
+    with override_settings(SITEMAP_ROOT=tmp_path,
+                           SITEMAP_BASE_URL=BASE_URL):
+        out = StringIO()
+        call_command('build_sitemaps', stdout=out)
+        robots = client.get('/robots.txt').content.decode()
+    assert (tmp_path / sitemaps.INDEX_NAME).exists()
+    assert f'{BASE_URL}/sitemaps/sitemap.xml' in out.getvalue()
+    assert f'Sitemap: {BASE_URL}/sitemaps/sitemap.xml' in robots
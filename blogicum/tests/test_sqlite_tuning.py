@@ -0,0 +1,74 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from comments.models import Comment
+from core import sqlite
+from core.benchmark import BackgroundWriter, comment_caller
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    """Отдельное соединение с файловой базой SQLite."""
+    default = connections[DEFAULT_DB_ALIAS]
+    settings_dict = dict(
+        default.settings_dict, NAME=str(tmp_path / 'db.sqlite3'))
+    wrapper = default.__class__(settings_dict, alias='tuning')
+    yield wrapper
+    wrapper.close()
+
+
+@override_settings(SQLITE_TUNING=True)
+def test_tuning_applies_pragmas_on_connect(file_connection):
+    file_connection.ensure_connection()
+    pragmas = sqlite.read_pragmas(file_connection)
+    assert pragmas['journal_mode'] == 'wal'
+    assert pragmas['synchronous'] == 1
+    assert pragmas['busy_timeout'] == sqlite.PRAGMAS['busy_timeout']
+    assert pragmas['mmap_size'] == sqlite.PRAGMAS['mmap_size']
+    assert pragmas['cache_size'] == sqlite.PRAGMAS['cache_size']
+
+
+@override_settings(
+    SQLITE_TUNING=True,
+    SQLITE_PRAGMAS={'mmap_size': None, 'busy_timeout': 100})
+def test_pragmas_can_be_overridden(file_connection):
+    file_connection.ensure_connection()
+    pragmas = sqlite.read_pragmas(file_connection)
+    assert pragmas['busy_timeout'] == 100
+    assert pragmas['mmap_size'] == 0
+
+
+@override_settings(SQLITE_TUNING=False)
+def test_tuning_is_opt_in(file_connection):
+    file_connection.ensure_connection()
+    assert sqlite.read_pragmas(file_connection)['journal_mode'] == 'delete'
+
+
+def test_background_writer_counts_writes_and_errors():
+    statuses = iter([302, 500, 302] * 1000)
+    writer = BackgroundWriter(
+        '/write/', lambda: lambda url: next(statuses), interval=0.001)
+    with writer:
+        while writer.writes < 3:
+            pass
+    assert writer.writes >= 3
+    assert writer.errors >= 1
+    assert writer.throughput > 0
+
+
+def test_comment_caller_creates_comments(user, mixer):
+    post = mixer.blend('blog.Post', category__is_published=True)
+    url = reverse('blog:comments:add_comment', kwargs={'post_id': post.pk})
+    client = Client()
+    client.force_login(user)
+    call = comment_caller(
+        {key: morsel.value for key, morsel in client.cookies.items()})
+    assert call(url) == 302
+    assert call(url) == 302
+    assert Comment.objects.filter(post=post, author=user).count() == 2
+    post.refresh_from_db()
+    assert post.comment_count == 2
@@ -0,0 +1,142 @@
+from datetime import timedelta
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import feed_cache
+from core.constants import FEED_ITEMS
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    user.username = 'author'
+    user.save()
+    published_category.slug = 'news'
+    published_category.save()
+    past = timezone.now() - timedelta(days=1)
+    visible = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=past, title=mixer.sequence('Пост {0}'))
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False, pub_date=past, title='Снятый')
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1),
+        title='Отложенный')
+    mixer.blend(
+        'blog.Post', category__is_published=True, is_published=True,
+        pub_date=past, title='Чужой')
+    return visible
+
+
+def rss_titles(response):
+    root = ElementTree.fromstring(response.content)
+    return {item.findtext('title') for item in root.iter('item')}
+
+
+def atom_titles(response):
+    root = ElementTree.fromstring(response.content)
+    return {entry.findtext(f'{ATOM}title')
+            for entry in root.iter(f'{ATOM}entry')}
+
+
+@pytest.mark.parametrize('url_name, kwargs, extra', [
+    ('blog:feed_rss', {}, {'Чужой'}),
+    ('blog:category_feed_rss', {'category_slug': 'news'}, set()),
+    ('blog:author_feed_rss', {'username': 'author'}, set()),
+])
+def test_rss_feeds_show_visible_posts(client, posts, url_name, kwargs, extra):
+    response = client.get(reverse(url_name, kwargs=kwargs))
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'].startswith('application/rss+xml')
+    assert rss_titles(response) == {post.title for post in posts} | extra
+
+
+@pytest.mark.parametrize('url_name, kwargs', [
+    ('blog:feed_atom', {}),
+    ('blog:category_feed_atom', {'category_slug': 'news'}),
+    ('blog:author_feed_atom', {'username': 'author'}),
+])
+def test_atom_feeds(client, posts, url_name, kwargs):
+    response = client.get(reverse(url_name, kwargs=kwargs))
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'].startswith('application/atom+xml')
+    assert {post.title for post in posts} <= atom_titles(response)
+
+
+@pytest.mark.parametrize('url_name, kwargs', [
+    ('blog:category_feed_rss', {'category_slug': 'missing'}),
+    ('blog:author_feed_atom', {'username': 'missing'}),
+])
+def test_unknown_feed_object_is_404(client, url_name, kwargs):
+    response = client.get(reverse(url_name, kwargs=kwargs))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_unpublished_category_feed_is_404(client, mixer):
+    category = mixer.blend('blog.Category', is_published=False)
+    response = client.get(reverse(
+        'blog:category_feed_rss', kwargs={'category_slug': category.slug}))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_feed_is_one_slim_query(client, mixer, user, published_category):
+    mixer.cycle(FEED_ITEMS + 5).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        text='Длинный текст. ' * 100)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('blog:feed_rss'))
+    post_queries = [query['sql'] for query in queries.captured_queries
+                    if 'FROM "blog_post"' in query['sql']]
+    assert len(post_queries) == 1
+    assert ', "blog_post"."text",' not in post_queries[0]
+    assert 'SUBSTR("blog_post"."text"' in post_queries[0]
+    root = ElementTree.fromstring(response.content)
+    items = list(root.iter('item'))
+    assert len(items) == FEED_ITEMS
+    assert len(items[0].findtext('description')) < 300
+
+
+def test_feed_conditional_get(client, posts):
+    url = reverse('blog:feed_rss')
+    response = client.get(url)
+    assert response['ETag']
+    assert 'Last-Modified' in response
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == HTTPStatus.NOT_MODIFIED
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+
+@override_settings(FEED_CACHE_ENABLED=True)
+def test_cached_feed_until_publish(client, mixer, user, posts,
+                                   published_category):
+    feed_cache.invalidate()
+    url = reverse('blog:feed_rss')
+    response = client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get(url)
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not queries.captured_queries
+    assert cached.content == response.content
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(), title='Свежий')
+    fresh = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert fresh.status_code == HTTPStatus.OK
+    assert 'Свежий' in rss_titles(fresh)
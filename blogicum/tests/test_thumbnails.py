@@ -0,0 +1,101 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
+from django.test.utils import override_settings
+
+from blog import thumbnails
+from blog.models import Post
+from blog.tasks import generate_post_thumbnails
+from blog.thumbnails import Thumbnail
+from core.constants import POST_IMAGE_SIZES
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def eager_jobs(tmp_path):
+    cache.clear()
+    with override_settings(MEDIA_ROOT=tmp_path, JOBS_ALWAYS_EAGER=True):
+        yield
+
+
+def make_upload(size=(2000, 1500)):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera maker'
+    Image.new('RGB', size, color=(10, 120, 200)).save(
+        buffer, format='JPEG', exif=exif)
+    return SimpleUploadedFile(
+        'photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+def test_thumbnails_created_on_upload(
+        tmp_path, user_client, published_category):
+    user_client.post('/posts/create/', data={
+        'title': 'Пост с фото',
+        'text': 'Текст',
+        'category': published_category.id,
+        'image': make_upload(),
+    })
+    post = Post.objects.get(title='Пост с фото')
+    for size_name, bounds in POST_IMAGE_SIZES.items():
+        thumbnail = Thumbnail(post.image, size_name)
+        for fmt in ('jpeg', 'webp'):
+            path = tmp_path / thumbnail.name(fmt)
+            assert path.exists()
+            with Image.open(path) as picture:
+                assert picture.width <= bounds[0]
+                assert picture.height <= bounds[1]
+                assert not picture.getexif()
+
+
+def test_feed_serves_thumbnail(client, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_upload())
+    content = client.get('/').content.decode()
+    assert post.feed_image.url in content
+    assert post.feed_image.webp_url in content
+    assert f'src="{post.image.url}"' not in content
+
+
+@override_settings(JOBS_ALWAYS_EAGER=False)
+def test_feed_serves_original_until_job_done(
+        client, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_upload())
+    content = client.get('/').content.decode()
+    assert f'src="{post.image.url}"' in content
+
+
+@override_settings(JOBS_ALWAYS_EAGER=False)
+def test_feed_survives_queue_failure(
+        client, mixer, user, published_category, monkeypatch):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_upload())
+
+    def broken_enqueue(*args, **kwargs):
+        raise DatabaseError('database is locked')
+
+    monkeypatch.setattr(thumbnails, 'enqueue', broken_enqueue)
+    response = client.get('/')
+    assert response.status_code == 200
+    assert f'src="{post.image.url}"' in response.content.decode()
+
+
+@override_settings(JOBS_ALWAYS_EAGER=False, POST_CARD_CACHE_TIMEOUT=60)
+def test_cached_card_switches_to_thumbnail(
+        client, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_upload())
+    assert f'src="{post.image.url}"' in client.get('/').content.decode()
+    generate_post_thumbnails(post.pk)
+    content = client.get('/').content.decode()
+    assert f'src="{post.feed_image.url}"' in content